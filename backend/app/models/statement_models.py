@@ -1,6 +1,24 @@
-from pydantic import BaseModel, field_validator
+from pydantic import BaseModel, field_validator, model_validator
 from .customer import Customer
 from typing import List, Optional
+from app.services.utils import parse_date
+
+
+def _check_statement_date(v: Optional[str]) -> Optional[str]:
+    # The date is printed as given; never fall back to the wall clock for a bad one
+    if v is not None and parse_date(v) is None:
+        raise ValueError(f'statement_date {v!r} is not a recognised date (e.g. "2024-01-31")')
+    return v
+
+
+def _check_deterministic_date(request):
+    # Deterministic output needs a date from the request; never invent one
+    if request.deterministic and request.statement_date is None and parse_date(request.billing_period_end) is None:
+        raise ValueError(
+            f'deterministic statements need a statement_date or a recognised billing_period_end '
+            f'(got {request.billing_period_end!r})'
+        )
+    return request
 
 class Loan(BaseModel):
     loan_id: str
@@ -22,6 +40,10 @@ class StatementRequest(BaseModel):
     billing_period_start: str
     billing_period_end: str
     statement_format: str
+    # Optional fixed statement date; defaults to today (or the cycle date in deterministic mode)
+    statement_date: Optional[str] = None
+    # Byte-reproducible output: no wall-clock dates, fixed document metadata
+    deterministic: bool = False
 
     # Validator to ensure at least one customer is provided
     @field_validator('customers', mode='before')
@@ -32,6 +54,15 @@ class StatementRequest(BaseModel):
             raise ValueError('Either customer or customers must be provided')
         return v
 
+    @field_validator('statement_date')
+    @classmethod
+    def validate_statement_date(cls, v):
+        return _check_statement_date(v)
+
+    @model_validator(mode='after')
+    def validate_deterministic_date(self):
+        return _check_deterministic_date(self)
+
 # OPTION 2: support multiple customers (cleaner)
 class MultiCustomerStatementRequest(BaseModel):
     customers: List[Customer]
@@ -39,3 +70,18 @@ class MultiCustomerStatementRequest(BaseModel):
     billing_period_start: str
     billing_period_end: str
     statement_format: str
+    statement_date: Optional[str] = None
+    deterministic: bool = False
+
+    @field_validator('statement_date')
+    @classmethod
+    def validate_statement_date(cls, v):
+        return _check_statement_date(v)
+
+    @model_validator(mode='after')
+    def validate_deterministic_date(self):
+        return _check_deterministic_date(self)
+
+# Many statements rendered in one call (e.g. co-borrowers who each get a copy)
+class BatchStatementRequest(BaseModel):
+    statements: List[StatementRequest]
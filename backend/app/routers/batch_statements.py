@@ -0,0 +1,77 @@
+from fastapi import APIRouter, Response, HTTPException, Query
+from app.models.statement_models import BatchStatementRequest
+from app.routers.responses import sink_response
+from app.services.batch_processor import process_batch
+from app.services.output_sink import open_sink
+from app.services.portfolio_workbook import write_portfolio_workbook
+from app.services.record_writer import write_records
+
+router = APIRouter()
+
+@router.post("/statements/batch", response_class=Response)
+def create_statement_batch(request: BatchStatementRequest):
+
+    if not request.statements:
+        raise HTTPException(status_code=400, detail="No statements provided")
+
+    try:
+        result = process_batch(request.statements)
+    except ValueError as exc:
+        raise HTTPException(status_code=400, detail=str(exc))
+
+    # One zip: every recipient's statement plus the batch summary
+    sink = open_sink()
+    try:
+        result.write_zip(sink)
+    except Exception:
+        sink.close()
+        raise
+    finally:
+        result.close()
+
+    return sink_response(sink, "application/zip", "statement_batch.zip")
+
+
+@router.post("/statements/records", response_class=Response)
+def create_statement_records(request: BatchStatementRequest,
+                             record_format: str = Query("fixed", pattern="^(fixed|delimited)$")):
+
+    if not request.statements:
+        raise HTTPException(status_code=400, detail="No statements provided")
+
+    # One record file for the print vendor / ledger, written incrementally
+    sink = open_sink()
+    try:
+        write_records(request.statements, sink, record_format)
+    except ValueError as exc:
+        sink.close()
+        raise HTTPException(status_code=400, detail=str(exc))
+    except Exception:
+        sink.close()
+        raise
+
+    return sink_response(sink, "text/plain", f"statement_records_{record_format}.txt")
+
+
+@router.post("/statements/workbook", response_class=Response)
+def create_statement_workbook(request: BatchStatementRequest):
+
+    if not request.statements:
+        raise HTTPException(status_code=400, detail="No statements provided")
+
+    # One workbook for the cycle: summary by loan type, customers, a sheet per loan type
+    sink = open_sink()
+    try:
+        write_portfolio_workbook(request.statements, sink)
+    except ValueError as exc:
+        sink.close()
+        raise HTTPException(status_code=400, detail=str(exc))
+    except Exception:
+        sink.close()
+        raise
+
+    return sink_response(
+        sink,
+        "application/vnd.openxmlformats-officedocument.spreadsheetml.sheet",
+        "portfolio_statements.xlsx",
+    )
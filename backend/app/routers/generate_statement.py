@@ -1,14 +1,16 @@
-from fastapi import APIRouter, Response, HTTPException
+from fastapi import APIRouter, Header, Response, HTTPException
+from typing import Optional
 from app.models.statement_models import StatementRequest
-from app.services.pdf_generator import generate_pdf
-from app.services.excel_generator import generate_excel
-from app.services.text_generator import generate_text
+from app.routers.responses import sink_response
+from app.services.output_sink import open_sink
+from app.services.profiling import profile_render
+from app.services.statement_renderer import render_statement
 
 router = APIRouter()
 
 ### NEW ROUTE FOR MULTI-CUSTOMER STATEMENTS i.e. 2 or more customers per statement ###
 @router.post("/generate-statement", response_class=Response)
-async def create_multi_cust_statement(request: StatementRequest):
+def create_multi_cust_statement(request: StatementRequest, x_profile_token: Optional[str] = Header(None)):
 
     # Multiple customers - use first customer for ID
     if not request.customers:
@@ -17,32 +19,17 @@ async def create_multi_cust_statement(request: StatementRequest):
     primary_customer = request.customers[0]
     customer_id = primary_customer.customer_id
 
-    if request.statement_format == "pdf":
-        pdf_bytes = generate_pdf(request)
-        return Response(
-            content=pdf_bytes,
-            media_type="application/pdf",
-            headers={
-                "Content-Disposition": f"attachment; filename=joint_statement_{customer_id}.pdf"
-            }
-        )
+    sink = open_sink()
+    try:
+        with profile_render(request, x_profile_token, "generate-statement"):
+            extension, media_type = render_statement(request, sink)
+    except ValueError as exc:
+        sink.close()
+        raise HTTPException(status_code=400, detail=str(exc))
+    except Exception:
+        sink.close()
+        raise
 
-    if request.statement_format == "xlsx":
-        excel_bytes = generate_excel(request)
-        return Response(
-            content=excel_bytes,
-            media_type="application/vnd.openxmlformats-officedocument.spreadsheetml.sheet",
-            headers={
-                "Content-Disposition": f"attachment; filename=statement_{customer_id}.xlsx"
-            }
-        )
-
-    if request.statement_format == "txt":
-        text_data = generate_text(request)
-        return Response(
-            content=text_data,
-            media_type="text/plain",
-            headers={
-                "Content-Disposition": f"attachment; filename=statement_{customer_id}.txt"
-            }
-        )
\ No newline at end of file
+    # Joint PDFs keep their distinct download name
+    prefix = "joint_statement" if extension == "pdf" else "statement"
+    return sink_response(sink, media_type, f"{prefix}_{customer_id}.{extension}")
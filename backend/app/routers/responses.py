@@ -0,0 +1,19 @@
+from fastapi.responses import StreamingResponse
+from app.services.output_sink import iter_sink, sink_size
+
+
+def sink_response(sink, media_type: str, filename: str) -> StreamingResponse:
+    """
+    Stream a rendered sink to the client as a file download.
+
+    The sink is read back in chunks and closed when the response finishes,
+    so the document is never copied into a single bytes object.
+    """
+    return StreamingResponse(
+        iter_sink(sink),
+        media_type=media_type,
+        headers={
+            "Content-Disposition": f"attachment; filename={filename}",
+            "Content-Length": str(sink_size(sink)),
+        }
+    )
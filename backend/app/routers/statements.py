@@ -1,42 +1,45 @@
-from fastapi import APIRouter, Response
+from fastapi import APIRouter, Header, Response, HTTPException
+from fastapi.responses import HTMLResponse
+from typing import Optional
 from app.models.statement_models import StatementRequest
-from app.services.pdf_generator import generate_pdf
-from app.services.excel_generator import generate_excel
-from app.services.text_generator import generate_text
+from app.routers.responses import sink_response
+from app.services.output_sink import open_sink
+from app.services.profiling import profile_render
+from app.services.statement_renderer import render_statement
+from app.services.svg_preview import get_preview_html
 
 router = APIRouter()
 
 @router.post("/statements", response_class=Response)
-async def create_statement(request: StatementRequest):
+def create_statement(request: StatementRequest, x_profile_token: Optional[str] = Header(None)):
 
     customer_id = request.customer.customer_id
 
-    if request.statement_format == "pdf":
-        pdf_bytes = generate_pdf(request)
-        return Response(
-            content=pdf_bytes,
-            media_type="application/pdf",
-            headers={
-                "Content-Disposition": f"attachment; filename=statement_{customer_id}.pdf"
-            }
-        )
-
-    if request.statement_format == "xlsx":
-        excel_bytes = generate_excel(request)
-        return Response(
-            content=excel_bytes,
-            media_type="application/vnd.openxmlformats-officedocument.spreadsheetml.sheet",
-            headers={
-                "Content-Disposition": f"attachment; filename=statement_{customer_id}.xlsx"
-            }
-        )
-
-    if request.statement_format == "txt":
-        text_data = generate_text(request)
-        return Response(
-            content=text_data,
-            media_type="text/plain",
-            headers={
-                "Content-Disposition": f"attachment; filename=statement_{customer_id}.txt"
-            }
-        )
\ No newline at end of file
+    sink = open_sink()
+    try:
+        with profile_render(request, x_profile_token, "statements"):
+            extension, media_type = render_statement(request, sink)
+    except ValueError as exc:
+        sink.close()
+        raise HTTPException(status_code=400, detail=str(exc))
+    except Exception:
+        sink.close()
+        raise
+
+    return sink_response(sink, media_type, f"statement_{customer_id}.{extension}")
+
+
+@router.post("/statements/preview", response_class=HTMLResponse)
+async def preview_statement(request: StatementRequest, if_none_match: Optional[str] = Header(None)):
+    """Cheap HTML/SVG rendering of the PDF layout, for live previews in the form."""
+
+    try:
+        html, cache_key = get_preview_html(request)
+    except ValueError as exc:
+        raise HTTPException(status_code=400, detail=str(exc))
+
+    etag = f'"{cache_key}"'
+    if if_none_match == etag:
+        return Response(status_code=304, headers={"ETag": etag})
+
+    return HTMLResponse(content=html, headers={"ETag": etag, "Cache-Control": "no-cache"})
@@ -0,0 +1,201 @@
+# app/services/batch_processor.py
+import json
+import shutil
+from dataclasses import dataclass, field
+from io import BytesIO
+from typing import Any, Dict, List, Tuple
+from zipfile import ZipFile, ZIP_DEFLATED
+from app.models.statement_models import StatementRequest
+from .output_sink import open_sink, STREAM_CHUNK_SIZE
+from .pdf_generator import generate_pdf, schedule_page_count
+from .pdf_parallel import PdfReader, PdfWriter, render_schedule_fragments, stitch_schedule
+from .statement_builder import monthly_interest_amount
+from .statement_renderer import FORMAT_RENDERERS, render_statement
+from .utils import get_customers_from_statement, is_deterministic
+
+
+def loan_key(loan) -> tuple:
+    """Identity of a loan's data: two loans with equal keys produce equal figures."""
+    return tuple(loan.model_dump().values())
+
+
+def customer_key(customer) -> tuple:
+    """Identity of a customer's data."""
+    return tuple(customer.model_dump().values())
+
+
+def document_key(statement) -> tuple:
+    """
+    Identity of a rendered document.
+
+    Customer and loan order is kept, since it changes what is drawn (the
+    primary customer's address, the first loan's summary box). Copies that
+    differ only in customer order are separate documents, but still share
+    their loan schedule (see ``schedule_key``).
+    """
+    return (
+        statement.statement_format,
+        tuple(customer_key(cust) for cust in get_customers_from_statement(statement)),
+        tuple(loan_key(loan) for loan in statement.loans),
+        statement.billing_period_start,
+        statement.billing_period_end,
+        statement.statement_date,
+        statement.deterministic,
+    )
+
+
+def schedule_key(statement, summary_pages: int) -> tuple:
+    """
+    Identity of a rendered loan schedule: its loans, in order, and the page
+    it starts on (footers carry absolute page numbers). Customers do not
+    appear on schedule pages.
+    """
+    return (tuple(loan_key(loan) for loan in statement.loans), summary_pages)
+
+
+def shares_schedule(statement) -> bool:
+    """
+    Whether a statement's loan schedule can be rendered once and stitched
+    after each copy's summary page.
+
+    Deterministic statements are rendered whole: stitching adds
+    writer-generated IDs that would break byte reproducibility.
+    """
+    return (
+        statement.statement_format == "pdf"
+        and PdfWriter is not None
+        and not is_deterministic(statement)
+        and schedule_page_count(statement) > 0
+    )
+
+
+def _render_with_shared_schedule(statement, schedules: Dict[tuple, list], sink) -> None:
+    """
+    Render the summary page(s) into ``sink`` and stitch on the schedule,
+    rendering the schedule only if no earlier statement in the batch had
+    the same one (``schedules`` caches them by ``schedule_key``).
+    """
+    summary_reader = PdfReader(BytesIO(generate_pdf(statement, include_schedule=False)))
+    summary_pages = len(summary_reader.pages)
+    key = schedule_key(statement, summary_pages)
+    fragments = schedules.get(key)
+    if fragments is None:
+        fragments = schedules[key] = render_schedule_fragments(statement, summary_pages)
+    stitch_schedule(summary_reader, fragments, sink)
+
+
+@dataclass
+class BatchFile:
+    """One recipient's statement in the batch output."""
+    filename: str
+    source: Any  # rendered sink, shared by every recipient of the same document
+    media_type: str
+
+
+@dataclass
+class BatchResult:
+    files: List[BatchFile] = field(default_factory=list)
+    summary: dict = field(default_factory=dict)
+
+    def summary_json(self) -> str:
+        return json.dumps(self.summary, indent=2)
+
+    def write_zip(self, sink) -> None:
+        """Write every file plus batch_summary.json into a zip archive in ``sink``."""
+        with ZipFile(sink, "w", ZIP_DEFLATED) as archive:
+            for batch_file in self.files:
+                batch_file.source.seek(0)
+                with archive.open(batch_file.filename, "w") as entry:
+                    shutil.copyfileobj(batch_file.source, entry, STREAM_CHUNK_SIZE)
+            archive.writestr("batch_summary.json", self.summary_json())
+
+    def close(self) -> None:
+        """Release the rendered documents."""
+        for batch_file in self.files:
+            batch_file.source.close()
+
+
+def process_batch(statements: List[StatementRequest]) -> BatchResult:
+    """
+    Render a batch of statements, rendering shared parts once.
+
+    Statements whose customers, loans, period and format are identical are
+    rendered once and the document is fanned out to every recipient. PDF
+    statements with a loan schedule that are not identical (e.g.
+    co-borrowers who each receive a copy addressed to them) still share the
+    schedule pages: each distinct schedule is rendered once and stitched
+    after every copy's own summary page.
+
+    Args:
+        statements: Statement requests in batch order
+
+    Returns:
+        BatchResult: One file per request plus a summary with dedup ratios
+        (call ``close`` when done with it)
+    """
+    documents: Dict[tuple, Tuple[int, Any, str, str]] = {}
+    schedules: Dict[tuple, list] = {}
+    schedule_refs = 0
+    customer_keys = set()
+    loan_sets = set()
+    customer_refs = 0
+    result = BatchResult()
+    entries = []
+
+    try:
+        for index, statement in enumerate(statements):
+            customers = get_customers_from_statement(statement)
+            customer_refs += len(customers)
+            customer_keys.update(customer_key(cust) for cust in customers)
+            loan_sets.add(frozenset(loan_key(loan) for loan in statement.loans))
+
+            # Shared rendered documents, and within distinct PDFs shared schedules
+            doc_key = document_key(statement)
+            if doc_key not in documents:
+                sink = open_sink()
+                try:
+                    if shares_schedule(statement):
+                        _render_with_shared_schedule(statement, schedules, sink)
+                        schedule_refs += 1
+                        _, extension, media_type = FORMAT_RENDERERS["pdf"]
+                    else:
+                        extension, media_type = render_statement(statement, sink)
+                except Exception:
+                    sink.close()
+                    raise
+                documents[doc_key] = (len(documents), sink, extension, media_type)
+            document_index, sink, extension, media_type = documents[doc_key]
+
+            recipient_id = customers[0].customer_id
+            filename = f"{index + 1:04d}_statement_{recipient_id}.{extension}"
+            result.files.append(BatchFile(filename, sink, media_type))
+            entries.append({
+                "filename": filename,
+                "customer_ids": [cust.customer_id for cust in customers],
+                "loan_ids": [loan.loan_id for loan in statement.loans],
+                "document": document_index,
+                "total_balance": round(sum(loan.current_balance for loan in statement.loans), 2),
+                "total_interest": round(sum(monthly_interest_amount(loan) for loan in statement.loans), 2),
+            })
+    except Exception:
+        for _, sink, _, _ in documents.values():
+            sink.close()
+        raise
+
+    def ratio(total: int, unique: int) -> float:
+        return round(total / unique, 3) if unique else 0.0
+
+    result.summary = {
+        "statements": len(statements),
+        "documents_rendered": len(documents),
+        "document_dedup_ratio": ratio(len(statements), len(documents)),
+        "schedule_references": schedule_refs,
+        "schedules_rendered": len(schedules),
+        "schedule_dedup_ratio": ratio(schedule_refs, len(schedules)),
+        "unique_loan_sets": len(loan_sets),
+        "customer_references": customer_refs,
+        "unique_customers": len(customer_keys),
+        "customer_dedup_ratio": ratio(customer_refs, len(customer_keys)),
+        "entries": entries,
+    }
+    return result
@@ -1,9 +1,65 @@
 from openpyxl import Workbook
 from openpyxl.worksheet.worksheet import Worksheet
+from openpyxl.writer.excel import ExcelWriter
 from openpyxl.styles import Font
 from io import BytesIO
+import shutil
+from zipfile import ZipFile, ZipInfo, ZIP_DEFLATED
+from .utils import get_customers_from_statement, get_statement_datetime, is_deterministic
+
+# Zip entry timestamp used for deterministic output (earliest date zip supports)
+FIXED_ZIP_DATE_TIME = (1980, 1, 1, 0, 0, 0)
+
+
+class _FixedTimeZipFile(ZipFile):
+    """ZipFile that stamps every entry with a fixed timestamp instead of now()."""
+
+    def writestr(self, zinfo_or_arcname, data, compress_type=None, compresslevel=None):
+        if not isinstance(zinfo_or_arcname, ZipInfo):
+            zinfo_or_arcname = ZipInfo(zinfo_or_arcname, date_time=FIXED_ZIP_DATE_TIME)
+            zinfo_or_arcname.compress_type = self.compression
+            zinfo_or_arcname.external_attr = 0o600 << 16
+        super().writestr(zinfo_or_arcname, data, compress_type, compresslevel)
+
+    def write(self, filename, arcname=None, compress_type=None, compresslevel=None):
+        # openpyxl streams worksheets from temp files, whose mtime would leak in
+        zinfo = ZipInfo.from_file(filename, arcname)
+        zinfo.date_time = FIXED_ZIP_DATE_TIME
+        zinfo.external_attr = 0o600 << 16
+        zinfo.compress_type = compress_type if compress_type is not None else self.compression
+        with open(filename, "rb") as src, self.open(zinfo, 'w') as dest:
+            shutil.copyfileobj(src, dest, 1024 * 64)
+
+
+def _save_deterministic(wb: Workbook, statement, buffer) -> None:
+    """
+    Save a workbook with no wall-clock data in it.
+
+    ``openpyxl.save_workbook`` stamps ``modified`` with now() and zip entries
+    with the current time; here both come from the statement date instead.
+    """
+    statement_dt = get_statement_datetime(statement)
+    wb.properties.created = statement_dt
+    wb.properties.modified = statement_dt
+
+    archive = _FixedTimeZipFile(buffer, 'w', ZIP_DEFLATED, allowZip64=True)
+    ExcelWriter(wb, archive).save()
+
+
+def generate_excel(statement, sink=None):
+    """
+    Generate an Excel statement.
+
+    Args:
+        statement: Statement request object
+        sink: Optional writable binary file-like object to save into
+
+    Returns:
+        bytes: XLSX file content, or None when written to ``sink``
+    """
+    customers = get_customers_from_statement(statement)
+    primary_customer = customers[0]
 
-def generate_excel(statement):
     wb = Workbook()
     ws: Worksheet = wb.active  # type: ignore # tell Pylance this is a Worksheet
     ws.title = "Statement"
@@ -11,8 +67,8 @@ def generate_excel(statement):
 
     ws.append(["Loan Statement"])
     ws.append([])
-    ws.append(["Customer Name", statement.customer_name])
-    ws.append(["Customer ID", statement.customer_id])
+    ws.append(["Customer Name", ", ".join(cust.name for cust in customers)])
+    ws.append(["Customer ID", primary_customer.customer_id])
     ws.append(["Billing Period", f"{statement.billing_period_start} - {statement.billing_period_end}"])
     ws.append([])
 
@@ -27,6 +83,9 @@ def generate_excel(statement):
             loan.payment_due_date
         ])
 
-    buffer = BytesIO()
-    wb.save(buffer)
-    return buffer.getvalue()
\ No newline at end of file
+    buffer = sink if sink is not None else BytesIO()
+    if is_deterministic(statement):
+        _save_deterministic(wb, statement, buffer)
+    else:
+        wb.save(buffer)
+    return None if sink is not None else buffer.getvalue()
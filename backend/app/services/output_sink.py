@@ -0,0 +1,52 @@
+# app/services/output_sink.py
+import io
+from tempfile import SpooledTemporaryFile
+from typing import Iterator
+
+# Documents up to this size stay in memory; larger ones roll over to a temp file
+SPOOL_MAX_SIZE = 8 * 1024 * 1024
+# Chunk size used when streaming a sink to a client or another file
+STREAM_CHUNK_SIZE = 64 * 1024
+
+
+def open_sink(max_size: int = SPOOL_MAX_SIZE) -> SpooledTemporaryFile:
+    """
+    Open a writable sink for a generator to render into.
+
+    Returns:
+        SpooledTemporaryFile: Binary, seekable sink (caller closes it)
+    """
+    return SpooledTemporaryFile(max_size=max_size, mode="w+b")
+
+
+def iter_sink(sink, chunk_size: int = STREAM_CHUNK_SIZE, close: bool = True) -> Iterator[bytes]:
+    """
+    Stream a rendered sink from the start in fixed-size chunks.
+
+    Args:
+        sink: Seekable binary file-like object a generator has written to
+        chunk_size: Bytes per chunk
+        close: Close the sink once it has been fully read
+
+    Yields:
+        bytes: Consecutive chunks of the sink's content
+    """
+    try:
+        sink.seek(0)
+        while True:
+            chunk = sink.read(chunk_size)
+            if not chunk:
+                break
+            yield chunk
+    finally:
+        if close:
+            sink.close()
+
+
+def sink_size(sink) -> int:
+    """Number of bytes written to a seekable sink (its end position)."""
+    position = sink.tell()
+    size = sink.seek(0, io.SEEK_END)
+    sink.seek(position)
+    return size
+
@@ -2,8 +2,9 @@
 from reportlab.pdfgen import canvas
 from reportlab.lib.pagesizes import letter
 from reportlab.lib import colors
+from functools import lru_cache
 from io import BytesIO
-from typing import Optional
+from typing import List, Optional, Tuple
 from .utils import (
     format_payment_due_date,
     get_customer_terminology,
@@ -11,362 +12,490 @@ from .utils import (
     get_customers_from_statement,
     get_statement_type_config,
     get_statement_title,
-    truncate_text,
     format_currency,
-    get_current_date
+    format_date,
+    get_statement_date,
+    is_deterministic
 )
+from .pdf_layout import (
+    Box,
+    ClearSide,
+    Columns,
+    Flow,
+    Footer,
+    Gap,
+    KeepTogether,
+    Layout,
+    LayoutProfile,
+    Row,
+    Rule,
+    Section,
+    SideBlock,
+    Text,
+    When,
+    render_layout,
+)
+from .text_metrics import fit_text
+
+PAGE_WIDTH, PAGE_HEIGHT = letter
+
+# Lowest y position body text may use before flowing onto a new page
+CONTENT_BOTTOM = 70
+
+# Loan schedule pages: fixed rows per page so page ranges can be rendered independently
+SCHEDULE_ROWS_PER_PAGE = 36
+SCHEDULE_ROW_HEIGHT = 16
+SCHEDULE_COLUMNS = [
+    ("Loan ID", 80),
+    ("Type", 80),
+    ("Principal", 75),
+    ("APR", 45),
+    ("Balance", 80),
+    ("Monthly Payment", 80),
+    ("Due Date", 72),
+]
+
+
+def _draw_footer(c, width: float, margin: float, is_rent_statement: bool, page_offset: int = 0) -> None:
+    """Draw the footer message and page number on the current page."""
+    footer_y = 40
+
+    c.setFont("Helvetica", 8)
+    c.setFillColor(colors.gray)
+
+    # Customize footer message based on statement type
+    if is_rent_statement:
+        c.drawString(margin, footer_y, "For questions about your rent or lease, please contact your property manager.")
+    else:
+        c.drawString(margin, footer_y, "For questions or support, please reach out via email.")
+
+    # Page number
+    page_num = c.getPageNumber() + page_offset
+    c.drawRightString(width - margin, footer_y, f"Page {page_num}")
+    c.setFillColor(colors.black)
+
+
+def _new_canvas(buffer, statement) -> canvas.Canvas:
+    """Create the letter-size canvas every statement layout draws on."""
+    return canvas.Canvas(buffer, pagesize=letter, invariant=1 if is_deterministic(statement) else None)
+
+
+def schedule_page_count(statement) -> int:
+    """Number of loan schedule pages a statement needs (none for single-loan statements)."""
+    if len(statement.loans) < 2:
+        return 0
+    return -(-len(statement.loans) // SCHEDULE_ROWS_PER_PAGE)
 
 
-def generate_pdf(statement) -> bytes:
+def schedule_totals(statement) -> dict:
+    """Totals printed at the end of the loan schedule, computed over every loan."""
+    return {
+        "loan_count": len(statement.loans),
+        "principal": sum(float(loan.principal) for loan in statement.loans),
+        "current_balance": sum(float(loan.current_balance) for loan in statement.loans),
+        "monthly_payment": sum(float(loan.monthly_payment) for loan in statement.loans),
+    }
+
+
+def generate_pdf(statement, include_schedule: bool = True, sink=None) -> Optional[bytes]:
     """
     Generate a PDF loan statement with proper layout and spacing.
     
+    Statements with more than one loan get loan schedule pages after the
+    summary page, with an outline entry per loan.
+    
     Args:
         statement: Object containing customer, loan, and billing information
+        include_schedule: Set False to render only the summary page(s)
+        sink: Optional writable binary file-like object to render into
         
     Returns:
-        bytes: PDF file content as bytes
+        bytes: PDF file content as bytes, or None when written to ``sink``
     """
-    buffer = BytesIO()
-    c = canvas.Canvas(buffer, pagesize=letter)
+    buffer = sink if sink is not None else BytesIO()
+    c = _new_canvas(buffer, statement)
     
-    # Page settings
-    width, height = letter
-    margin = 50
-    y = height - margin
+    schedule_pages = schedule_page_count(statement) if include_schedule else 0
+    if schedule_pages:
+        c.bookmarkPage("summary")
+        c.addOutlineEntry("Summary", "summary", level=0)
     
-# -------------------------------
-# 1. DATA VALIDATION & SANITIZATION
-# -------------------------------
+    _draw_summary(c, statement)
+    
+    if schedule_pages:
+        c.showPage()
+        _draw_loan_schedule(c, statement, 0, schedule_pages, schedule_totals(statement))
+    
+    c.save()
+    if sink is not None:
+        return None
+    pdf = buffer.getvalue()
+    buffer.close()
+    
+    return pdf
+
+
+SUMMARY_MARGIN = 50
+SUMMARY_COLUMN_WIDTHS = (136, 106, 126, 66)
+
+
+def _summary_footer(c, profile: LayoutProfile) -> None:
+    _draw_footer(c, PAGE_WIDTH, SUMMARY_MARGIN, profile.is_rent)
+
+
+def _overview_row(label: str, value: str) -> Row:
+    return Row((Text(SUMMARY_MARGIN, label, "Helvetica", 10),
+                Text(SUMMARY_MARGIN + 180, value, "Helvetica", 10)), advance=14)
+
+
+def _summary_table(headers: Tuple[str, ...], apr: str) -> Section:
+    return Section("table", (
+        Row((Columns(SUMMARY_MARGIN, SUMMARY_COLUMN_WIDTHS, headers, "Helvetica-Bold", 10),), advance=14),
+        Row((Columns(SUMMARY_MARGIN, SUMMARY_COLUMN_WIDTHS,
+                     ("{billing_period}", "{monthly_payment}", "{current_balance}", apr),
+                     "Helvetica", 10, fit_columns=(0,)),), advance=5),
+    ))
+
+
+# Summary page(s): header, customer block, payment box, overview and summary
+# table for the first loan. Values come from _summary_values.
+SUMMARY_LAYOUT = Layout(
+    name="summary",
+    margin=SUMMARY_MARGIN,
+    content_bottom=CONTENT_BOTTOM,
+    footer=_summary_footer,
+    nodes=(
+        # -------------------------------
+        # 1. DYNAMIC TITLE & COMPANY HEADER
+        # -------------------------------
+        Section("title", (
+            Row((Text(SUMMARY_MARGIN, "Epimonos LLC", "Helvetica-Oblique", 20),), advance=36),
+            When("joint",
+                 then=(When("is_rent",
+                            then=(Row((Text(SUMMARY_MARGIN, "Joint Tenancy Statement", "Helvetica-Bold", 16),), advance=30),),
+                            otherwise=(Row((Text(SUMMARY_MARGIN, "Joint Account Statement", "Helvetica-Bold", 16),), advance=30),)),),
+                 otherwise=(Row((Text(SUMMARY_MARGIN, "{statement_title}", "Helvetica-Bold", 16),), advance=30),)),
+        )),
+        # -------------------------------
+        # 2. METADATA TABLE (Right)
+        # -------------------------------
+        # Placed before the customer block so it stays on the first page even
+        # when a long customer block flows onto the next one.
+        SideBlock(
+            x=PAGE_WIDTH - 200, top=PAGE_HEIGHT - SUMMARY_MARGIN - 10,
+            rows=(("Account Number:", "account_number", 1),
+                  ("Billing Period:", "billing_period", 2),
+                  ("Statement Date:", "statement_date", None)),
+            label_font="Helvetica-Bold", value_font="Helvetica", size=10, line_height=12, row_gap=3,
+        ),
+        # -------------------------------
+        # 3. CUSTOMER INFO SECTION - OPTIMIZED FOR JOINT TENANTS
+        # -------------------------------
+        Section("customer", (
+            Row((Text(SUMMARY_MARGIN, "{customer_header}", "Helvetica-Bold", 11),), advance=20),
+            Flow("customer_names", "Helvetica-Bold", 11, line_height=14, after=6),
+            Flow("address_lines", "Helvetica-Bold", 11, line_height=14, after=6),
+            Flow("contact_lines", "Helvetica-Bold", 11, line_height=14, after=4),
+            ClearSide(5),
+            # The payment box and summary need roughly 280pt
+            KeepTogether(280),
+        )),
+        # -------------------------------
+        # 4. HIGHLIGHT BOX (Payment Due)
+        # -------------------------------
+        Box(x=SUMMARY_MARGIN, width=PAGE_WIDTH - 2 * SUMMARY_MARGIN, height=80, radius=8, fill="theme_color", nodes=(
+            Gap(30),
+            When("rent_to_own",
+                 then=(Text(SUMMARY_MARGIN + 15, "Monthly Rent To Own Payment Due: {monthly_payment}", "Helvetica-Bold", 13),),
+                 otherwise=(When("is_rent",
+                                 then=(Text(SUMMARY_MARGIN + 15, "Monthly Rent Due: {monthly_payment}", "Helvetica-Bold", 13),),
+                                 otherwise=(Text(SUMMARY_MARGIN + 15, "Monthly {payment_prefix}Payment Due: {monthly_payment}",
+                                                 "Helvetica-Bold", 13),)),)),
+            Gap(18),
+            Row((Text(SUMMARY_MARGIN + 15, "Payment Due Date: {payment_due_date}", "Helvetica-Bold", 11),), advance=16),
+            Text(SUMMARY_MARGIN + 15, "*Please make your payment within the 10 day grace period as stated in the contract.",
+                 "Helvetica", 11),
+        )),
+        # -------------------------------
+        # 5. OVERVIEW SECTION
+        # -------------------------------
+        Section("overview", (
+            Gap(35),
+            Row((Text(SUMMARY_MARGIN, "Account Overview", "Helvetica-Bold", 12),), advance=20),
+            _overview_row("Previous Balance:", "{current_balance}"),
+            # Interest only applies to loans
+            When("is_rent", otherwise=(_overview_row("Interest Accrued:", "$0.00"),)),
+            _overview_row("Fees:", "$0.00"),
+            _overview_row("Current Balance:", "{current_balance}"),
+        )),
+        # -------------------------------
+        # 6. LOAN/RENT SUMMARY TABLE
+        # -------------------------------
+        Section("summary", (
+            Gap(25),
+            Row((Text(SUMMARY_MARGIN, "{summary_title}", "Helvetica-Bold", 13),), advance=18),
+            When("is_rent",
+                 then=(_summary_table(("Billing Period", "Monthly Rent", "Remaining Balance", "Rate"), "N/A"),),
+                 otherwise=(_summary_table(("Billing Period", "Monthly Payment", "Remaining Balance", "APR"),
+                                               "{interest_rate}%"),)),
+            Rule(SUMMARY_MARGIN, PAGE_WIDTH - SUMMARY_MARGIN),
+        )),
+        # -------------------------------
+        # 7. LOAN TYPE (Only for non-rent statements)
+        # -------------------------------
+        When("show_loan_type", then=(
+            Gap(20),
+            Text(SUMMARY_MARGIN, "Loan Type: {loan_type}", "Helvetica", 10),
+        )),
+        # -------------------------------
+        # 8. FOOTER
+        # -------------------------------
+        Footer(),
+    ),
+)
+
+
+@lru_cache(maxsize=256)
+def _loan_type_layout(raw_loan_type: Optional[str], joint: bool) -> Tuple[LayoutProfile, dict]:
+    """
+    Loan-type profile of a statement and the layout values that depend only
+    on the loan type, computed once per distinct loan type.
+    """
+    loan_type = raw_loan_type.strip().lower() if raw_loan_type else ""
+    statement_config = get_statement_type_config(loan_type)
+    terminology = get_customer_terminology(loan_type, 2 if joint else 1)
+    profile = LayoutProfile(
+        is_rent=statement_config["is_rent"],
+        rent_to_own=loan_type == "rent to own",
+        joint=joint,
+        show_loan_type=not statement_config["is_rent"] and bool(raw_loan_type),
+    )
+    values = {
+        "statement_title": get_statement_title(loan_type),
+        "customer_header": terminology["header_plural"] if joint else terminology["header_single"],
+        "address_label": terminology["address_label"],
+        "summary_title": statement_config["summary_title"],
+        "theme_color": get_theme_color(loan_type),
+        "payment_prefix": f"{loan_type.title()} " if loan_type and loan_type != "loan" else "",
+    }
+    return profile, values
+
+
+def _summary_values(statement) -> Tuple[LayoutProfile, dict]:
+    """Validate a statement and collect the values SUMMARY_LAYOUT draws."""
     customers = get_customers_from_statement(statement)
 
     if not statement.loans:
         raise ValueError("No loan data available for statement generation")
 
     loan = statement.loans[0]
-    loan_type = loan.loan_type.strip().lower() if hasattr(loan, 'loan_type') and loan.loan_type else ""
-    statement_config = get_statement_type_config(loan_type)
-    is_rent_statement = statement_config["is_rent"]
-
-    # Get primary customer for legacy fields (e.g., for account number fallback)
+    profile, type_values = _loan_type_layout(getattr(loan, 'loan_type', None), len(customers) > 1)
     primary_customer = customers[0]
-# -------------------------------
-# 2. DYNAMIC TITLE & COMPANY HEADER
-# -------------------------------
-    c.setFont("Helvetica-Oblique", 20)
-    c.drawString(margin, y, "Epimonos LLC")
-    y -= 36
-
-# Determine statement title
-    statement_title = get_statement_title(loan_type)
-    if len(customers) > 1:
-        statement_title = "Joint Tenancy Statement" if is_rent_statement else "Joint Account Statement"
-
-    c.setFont("Helvetica-Bold", 16)
-    c.drawString(margin, y, statement_title)
-    y -= 30
-
-# -------------------------------
-# 3. CUSTOMER INFO SECTION - OPTIMIZED FOR JOINT TENANTS
-# -------------------------------
-    c.setFont("Helvetica-Bold", 11)
-
-# Then use it in your PDF generator:
-    terminology = get_customer_terminology(loan_type, len(customers))
-
-# Draw header
-    header_text = terminology["header_plural"] if len(customers) > 1 else terminology["header_single"]
-    c.drawString(margin, y, header_text)
-    y -= 20
-
-# Draw names
-    customer_names = ", ".join([cust.name for cust in customers])
-    c.drawString(margin, y, customer_names)
-    y -= 20
-
-# Draw address with label
-    if primary_customer.address:
-        c.drawString(margin, y, f"{terminology['address_label']} {primary_customer.address}")
-        y -= 20
 
-# Display INDIVIDUAL contact details in a compact format
+    contact_lines = []
     for i, customer in enumerate(customers):
         contact_info = []
         if customer.phone:
             contact_info.append(f"Ph: {customer.phone}")
         if customer.email:
             contact_info.append(f"Email: {customer.email}")
-    
         if contact_info:
-            # For multiple customers, you might want to label them
-            if len(customers) > 1:
-                c.drawString(margin, y, f"Contact {i+1}: {', '.join(contact_info)}")
-            else:
-                c.drawString(margin, y, f"Contact: {', '.join(contact_info)}")
-            y -= 18
-
-# Store the bottom of customer info
-    customer_info_bottom = y + 5  # Small buffer
-    
-    # -------------------------------
-    # 4. METADATA TABLE (Right)
-    # -------------------------------
-    meta_x = width - 200
-    meta_y = height - margin - 10
-    
-    # Metadata labels
-    c.setFont("Helvetica-Bold", 10)
-    c.drawRightString(meta_x - 5, meta_y, "Account Number:")
-    c.drawRightString(meta_x - 5, meta_y - 15, "Billing Period:")
-    c.drawRightString(meta_x - 5, meta_y - 30, "Statement Date:")
-    
-    # Metadata values
-    c.setFont("Helvetica", 10)
-    
-    # Account number
-    account_number = loan.loan_id if hasattr(loan, 'loan_id') and loan.loan_id else customer.customer_id
-    c.drawString(meta_x, meta_y, truncate_text(str(account_number), 15))
-    
-    # Billing period
-    billing_period = f"{statement.billing_period_start} - {statement.billing_period_end}"
-    if len(billing_period) > 25:
-        c.drawString(meta_x, meta_y - 15, truncate_text(billing_period, 25, ""))
-        c.drawString(meta_x, meta_y - 25, truncate_text(billing_period[25:], 25))
-    else:
-        c.drawString(meta_x, meta_y - 15, billing_period)
-    
-    # Statement date
-    c.drawString(meta_x, meta_y - 30, get_current_date())
-    
-    # -------------------------------
-    # 5. HIGHLIGHT BOX (Payment Due)
-    # -------------------------------
-    box_y = customer_info_bottom - 80
-    box_height = 80
-    box_width = width - (2 * margin)
-    
-    # Get theme color based on loan type
-    theme_color = get_theme_color(loan_type)
-    c.setFillColorRGB(*theme_color)
-    c.roundRect(margin, box_y, box_width, box_height, 8, fill=1, stroke=0)
-    
-    # Draw text on colored box
-    c.setFillColor(colors.black)
-    c.setFont("Helvetica-Bold", 13)
-    
-    # Use appropriate payment text based on statement type
-    if loan_type == "rent to own":
-    # Special case for "Rent to own"
-        payment_title = f"Monthly Rent To Own Payment Due: {format_currency(float(loan.monthly_payment))}"
-    elif is_rent_statement:
-    # Regular rent/lease/rental
-        payment_title = f"Monthly Rent Due: {format_currency(float(loan.monthly_payment))}"
-    else:
-    # All other loan types (auto, personal, mortgage, etc.)
-        payment_prefix = f"{loan_type.title()} " if loan_type and loan_type != "loan" else ""
-        payment_title = f"Monthly {payment_prefix}Payment Due: {format_currency(float(loan.monthly_payment))}"
-    
-    c.drawString(margin + 15, box_y + 50, payment_title.strip())
-    
-    c.setFont("Helvetica-Bold", 11)
-    # ✅ FORMAT THE PAYMENT DUE DATE
-    formatted_due_date = format_payment_due_date(loan.payment_due_date)
-    c.drawString(margin + 15, box_y + 32, f"Payment Due Date: {formatted_due_date}")
-    c.setFont("Helvetica", 11)
-    c.drawString(margin + 15, box_y + 16, f"*Please make your payment within the 10 day grace period as stated in the contract.")
-    
-    # -------------------------------
-    # 6. OVERVIEW SECTION
-    # -------------------------------
-    y = box_y - 35
-    
-    c.setFont("Helvetica-Bold", 12)
-    c.drawString(margin, y, "Account Overview")
-    
-    y -= 20
-    c.setFont("Helvetica", 10)
-    
-    # Build overview items conditionally
-    overview_items = [
-        ("Previous Balance:", format_currency(float(loan.current_balance))),
-    ]
-    
-    # Only include "Interest Accrued" for non-rent statements
-    if not is_rent_statement:
-        overview_items.append(("Interest Accrued:", "$0.00"))
-    
-    overview_items.extend([
-        ("Fees:", "$0.00"),
-        ("Current Balance:", format_currency(float(loan.current_balance)))
-    ])
-    
-    for label, value in overview_items:
-        c.drawString(margin, y, label)
-        c.drawString(margin + 180, y, value)
-        y -= 14
-    
-    # -------------------------------
-    # 7. LOAN/RENT SUMMARY TABLE
-    # -------------------------------
-    y -= 25
-    
-    # Use appropriate summary title
-    c.setFont("Helvetica-Bold", 13)
-    c.drawString(margin, y, statement_config["summary_title"])
-    
-    y -= 18
-    
-    # Table headers
-    headers = ["Billing Period", "Monthly Payment", "Remaining Balance", "APR"]
-    col_widths = [136, 106, 126, 66]
-    
-    # For rent statements, adjust the header text
-    if is_rent_statement:
-        headers = ["Billing Period", "Monthly Rent", "Remaining Balance", "Rate"]
-    
-    c.setFont("Helvetica-Bold", 10)
-    x = margin
-    for i, header in enumerate(headers):
-        c.drawString(x, y, header)
-        x += col_widths[i]
-    
-    # Table data row
-    y -= 14
-    c.setFont("Helvetica", 10)
-    x = margin
-    
-    billing_period_cell = f"{statement.billing_period_start} - {statement.billing_period_end}"
-    billing_period_cell = truncate_text(billing_period_cell, 25)
-    
-    # For rent statements, show N/A for APR
-    apr_value = f"{loan.interest_rate}%" if not is_rent_statement else "N/A"
-    
-    table_data = [
-        billing_period_cell,
-        format_currency(float(loan.monthly_payment)),
-        format_currency(float(loan.current_balance)),
-        apr_value
-    ]
-    
-    for i, cell in enumerate(table_data):
-        c.drawString(x, y, cell)
-        x += col_widths[i]
-    
-    # Draw table border
-    y -= 5
-    c.setStrokeColor(colors.lightgrey)
-    c.setLineWidth(0.5)
-    c.line(margin, y, width - margin, y)
-    
-    # -------------------------------
-    # 8. ADD LOAN TYPE IN SUMMARY (Only for non-rent statements)
-    # -------------------------------
-    if not is_rent_statement and hasattr(loan, 'loan_type') and loan.loan_type:
-        y -= 20
-        c.setFont("Helvetica", 10)
-        c.drawString(margin, y, f"Loan Type: {loan.loan_type}")
-    
-    # -------------------------------
-    # 9. FOOTER
-    # -------------------------------
-    footer_y = 40
-    
-    c.setFont("Helvetica", 8)
-    c.setFillColor(colors.gray)
-    
-    # Customize footer message based on statement type
-    if is_rent_statement:
-        c.drawString(margin, footer_y, "For questions about your rent or lease, please contact your property manager.")
-    else:
-        c.drawString(margin, footer_y, "For questions or support, please reach out via email.")
+            # For multiple customers, label each contact line
+            label = f"Contact {i+1}" if len(customers) > 1 else "Contact"
+            contact_lines.append(f"{label}: {', '.join(contact_info)}")
+
+    address_lines = []
+    if primary_customer.address:
+        address_lines.append(f"{type_values['address_label']} {primary_customer.address}")
+
+    values = dict(
+        type_values,
+        account_number=str(loan.loan_id if hasattr(loan, 'loan_id') and loan.loan_id else primary_customer.customer_id),
+        billing_period=f"{statement.billing_period_start} - {statement.billing_period_end}",
+        statement_date=get_statement_date(statement),
+        customer_names=", ".join(cust.name for cust in customers),
+        address_lines=address_lines,
+        contact_lines=contact_lines,
+        monthly_payment=format_currency(float(loan.monthly_payment)),
+        payment_due_date=format_payment_due_date(loan.payment_due_date),
+        current_balance=format_currency(float(loan.current_balance)),
+        interest_rate=loan.interest_rate,
+        loan_type=loan.loan_type,
+    )
+    return profile, values
+
+
+def _draw_summary(c, statement) -> None:
+    """
+    Draw the summary page(s): header, customer block, payment box,
+    overview and summary table for the first loan.
+    """
+    profile, values = _summary_values(statement)
+    render_layout(c, SUMMARY_LAYOUT, profile, values)
+
+
+def _draw_loan_schedule(c, statement, first_page: int, end_page: int, totals: dict,
+                        page_offset: int = 0, outline: bool = True) -> List[Tuple[str, int, float]]:
+    """
+    Draw loan schedule pages ``first_page`` up to (not including) ``end_page``.
     
-    # Page number
-    page_num = c.getPageNumber()
-    c.drawRightString(width - margin, footer_y, f"Page {page_num}")
+    The canvas must already be on a fresh page. Pages hold a fixed number of
+    rows, so any page range can be drawn on its own (see pdf_parallel).
     
-    # -------------------------------
-    # 10. FINALIZE PDF
-    # -------------------------------
-    c.save()
-    pdf = buffer.getvalue()
-    buffer.close()
+    Args:
+        c: ReportLab canvas
+        statement: Statement request object
+        first_page: Index of the first schedule page to draw
+        end_page: Index after the last schedule page to draw
+        totals: Output of ``schedule_totals`` for the whole statement
+        page_offset: Added to the canvas page number in footers
+        outline: Add bookmarks and outline entries to this canvas
+        
+    Returns:
+        list: (loan_id, page index within this canvas, top y) per loan drawn
+    """
+    width, height = letter
+    margin = 50
+    loans = statement.loans
+    total_pages = schedule_page_count(statement)
+    first_loan_type = loans[0].loan_type.strip().lower() if loans[0].loan_type else ""
+    is_rent_statement = get_statement_type_config(first_loan_type)["is_rent"]
+    positions = []
+    
+    for page_index in range(first_page, end_page):
+        if page_index > first_page:
+            c.showPage()
+        
+        y = height - margin
+        c.setFont("Helvetica-Bold", 14)
+        title = "Loan Schedule" if page_index == 0 else "Loan Schedule (continued)"
+        c.drawString(margin, y, title)
+        c.setFont("Helvetica", 9)
+        c.drawRightString(width - margin, y, f"Sheet {page_index + 1} of {total_pages}")
+        
+        if outline and page_index == 0:
+            c.bookmarkPage("schedule")
+            c.addOutlineEntry("Loan Schedule", "schedule", level=0)
+        
+        # Column headers
+        y -= 30
+        c.setFont("Helvetica-Bold", 9)
+        x = margin
+        for header, col_width in SCHEDULE_COLUMNS:
+            c.drawString(x, y, header)
+            x += col_width
+        c.setStrokeColor(colors.lightgrey)
+        c.setLineWidth(0.5)
+        c.line(margin, y - 4, width - margin, y - 4)
+        
+        # Loan rows
+        c.setFont("Helvetica", 9)
+        start = page_index * SCHEDULE_ROWS_PER_PAGE
+        for loan_index, loan in enumerate(loans[start:start + SCHEDULE_ROWS_PER_PAGE], start):
+            y -= SCHEDULE_ROW_HEIGHT
+            loan_type = loan.loan_type.strip().lower() if loan.loan_type else ""
+            is_rent = get_statement_type_config(loan_type)["is_rent"]
+            cells = [
+                str(loan.loan_id),
+                loan.loan_type or "",
+                format_currency(float(loan.principal)),
+                "N/A" if is_rent else f"{loan.interest_rate}%",
+                format_currency(float(loan.current_balance)),
+                format_currency(float(loan.monthly_payment)),
+                format_date(loan.payment_due_date, "numeric"),
+            ]
+            x = margin
+            for cell, (_, col_width) in zip(cells, SCHEDULE_COLUMNS):
+                c.drawString(x, y, fit_text(cell, "Helvetica", 9, col_width - 6))
+                x += col_width
+            
+            top = y + SCHEDULE_ROW_HEIGHT - 4
+            positions.append((str(loan.loan_id), c.getPageNumber() - 1, top))
+            if outline:
+                key = f"loan-{loan_index}"
+                c.bookmarkHorizontal(key, 0, top)
+                c.addOutlineEntry(f"Loan {loan.loan_id}", key, level=1)
+        
+        # Totals close the last page of the schedule
+        if page_index == total_pages - 1:
+            y -= 8
+            c.line(margin, y, width - margin, y)
+            y -= 14
+            c.setFont("Helvetica-Bold", 9)
+            c.drawString(margin, y, f"Totals ({totals['loan_count']} loans)")
+            x = margin + sum(col_width for _, col_width in SCHEDULE_COLUMNS[:2])
+            total_cells = [format_currency(totals["principal"]), "", format_currency(totals["current_balance"]),
+                           format_currency(totals["monthly_payment"])]
+            for cell, (_, col_width) in zip(total_cells, SCHEDULE_COLUMNS[2:]):
+                c.drawString(x, y, fit_text(cell, "Helvetica-Bold", 9, col_width - 6))
+                x += col_width
+        
+        _draw_footer(c, width, margin, is_rent_statement, page_offset)
     
-    return pdf
+    return positions
 
 
-def generate_pdf_conservative(statement) -> bytes:
+CONSERVATIVE_MARGIN = 60
+
+# Conservative layout: guaranteed spacing and smaller fonts
+CONSERVATIVE_LAYOUT = Layout(
+    name="conservative",
+    margin=CONSERVATIVE_MARGIN,
+    content_bottom=CONTENT_BOTTOM,
+    nodes=(
+        # 1. TITLE
+        Row((Text(CONSERVATIVE_MARGIN, "LOAN STATEMENT", "Helvetica-Bold", 14),), advance=25),
+        # 2. CUSTOMER INFO - COMPACT
+        Flow("info_lines", "Helvetica", 10, line_height=12, wrap=False),
+        # 3. METADATA - VERY COMPACT
+        SideBlock(
+            x=PAGE_WIDTH - 145, top=PAGE_HEIGHT - CONSERVATIVE_MARGIN - 10,
+            rows=(("Acct #:", "customer_id", 1), ("Period:", "billing_period", 1), ("Date:", "statement_date", None)),
+            label_font="Helvetica-Bold", value_font="Helvetica", size=9, line_height=12, bottom_padding=4,
+        ),
+        # 4. HIGHLIGHT BOX
+        ClearSide(5),
+        Box(x=CONSERVATIVE_MARGIN, width=PAGE_WIDTH - 2 * CONSERVATIVE_MARGIN, height=45, radius=5,
+            fill="theme_color", nodes=(
+                Gap(20),
+                Row((Text(CONSERVATIVE_MARGIN + 10, "Payment Due: {monthly_payment}", "Helvetica-Bold", 11),), advance=15),
+                Text(CONSERVATIVE_MARGIN + 10, "Due: {payment_due_date}", "Helvetica", 10),
+            )),
+        # Continue with rest of content...
+        # You would add the rest of your conservative layout here
+    ),
+)
+
+
+def generate_pdf_conservative(statement, sink=None) -> Optional[bytes]:
     """
     More conservative version with guaranteed spacing and smaller fonts.
     Useful for statements with lots of content.
+    Renders into ``sink`` and returns None when one is given.
     """
-    from .utils import get_current_date
-    
-    buffer = BytesIO()
-    c = canvas.Canvas(buffer, pagesize=letter)
-    
-    width, height = letter
-    margin = 60  # Increased margin
-    y = height - margin
+    buffer = sink if sink is not None else BytesIO()
+    c = _new_canvas(buffer, statement)
     
     customers = get_customers_from_statement(statement)
     customer = customers[0]
     loan = statement.loans[0]
-    
-    # 1. TITLE
-    c.setFont("Helvetica-Bold", 14)
-    c.drawString(margin, y, "LOAN STATEMENT")
-    y -= 25
-    
-    # 2. CUSTOMER INFO - COMPACT
-    c.setFont("Helvetica", 10)
-    info_lines = [
-        customer.name,
-        customer.address or "",
-        f"Ph: {customer.phone or 'N/A'}",
-        f"Email: {customer.email or 'N/A'}"
-    ]
-    
-    for line in info_lines:
-        if line.strip():
-            c.drawString(margin, y, line)
-            y -= 12
-    
-    # 3. METADATA - VERY COMPACT
-    meta_y = height - margin - 10
-    c.setFont("Helvetica-Bold", 9)
-    c.drawRightString(width - 150, meta_y, "Acct #:")
-    c.drawRightString(width - 150, meta_y - 12, "Period:")
-    c.drawRightString(width - 150, meta_y - 24, "Date:")
-    
-    c.setFont("Helvetica", 9)
-    c.drawString(width - 145, meta_y, customer.customer_id[:10])
-    
-    # Billing period
-    period = f"{statement.billing_period_start} - {statement.billing_period_end}"
-    period = truncate_text(period, 20)
-    c.drawString(width - 145, meta_y - 12, period)
-    c.drawString(width - 145, meta_y - 24, get_current_date("%m/%d/%y"))
-    
-    # 4. HIGHLIGHT BOX
-    box_y = min(y, meta_y - 40) - 40
-    box_height = 45
-    box_width = width - (2 * margin)
-    
-    # Get theme color
-    loan_type = loan.loan_type.lower() if hasattr(loan, 'loan_type') and loan.loan_type else ""
-    theme_color = get_theme_color(loan_type)
-    c.setFillColorRGB(*theme_color)
-    c.roundRect(margin, box_y, box_width, box_height, 5, fill=1, stroke=0)
-    
-    c.setFillColor(colors.black)
-    c.setFont("Helvetica-Bold", 11)
-    c.drawString(margin + 10, box_y + 25, f"Payment Due: {format_currency(float(loan.monthly_payment))}")
-    
-    c.setFont("Helvetica", 10)
-    c.drawString(margin + 10, box_y + 10, f"Due: {loan.payment_due_date}")
-    
-    # Continue with rest of content...
-    # You would add the rest of your conservative layout here
+    profile, type_values = _loan_type_layout(getattr(loan, 'loan_type', None), len(customers) > 1)
+    
+    values = {
+        "info_lines": [
+            customer.name,
+            customer.address or "",
+            f"Ph: {customer.phone or 'N/A'}",
+            f"Email: {customer.email or 'N/A'}"
+        ],
+        "customer_id": customer.customer_id,
+        "billing_period": f"{statement.billing_period_start} - {statement.billing_period_end}",
+        "statement_date": get_statement_date(statement, "%m/%d/%y"),
+        "theme_color": type_values["theme_color"],
+        "monthly_payment": format_currency(float(loan.monthly_payment)),
+        "payment_due_date": loan.payment_due_date,
+    }
+    render_layout(c, CONSERVATIVE_LAYOUT, profile, values)
     
     c.save()
-    return buffer.getvalue()
\ No newline at end of file
+    return None if sink is not None else buffer.getvalue()
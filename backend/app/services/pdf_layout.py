@@ -0,0 +1,503 @@
+# app/services/pdf_layout.py
+"""
+Declarative page layouts, compiled once per variant and replayed per statement.
+
+A layout is a tree of nodes (sections, rows, columns, boxes and conditional
+blocks) placed relative to a vertical cursor. Conditional blocks are keyed on
+the statement's loan-type profile, which has only a handful of values, so
+each (layout, profile) pair is compiled once into a flat tuple of draw
+operations: conditions are resolved, fixed offsets are folded into each
+operation, constant text is pre-fitted, and redundant font and colour changes
+are dropped. Rendering a statement replays that tuple with the statement's
+values; only blocks whose height depends on the values (wrapped text, page
+breaks) move the cursor at replay time.
+
+Values are referenced with ``str.format`` templates, e.g. ``"Due: {due_date}"``.
+"""
+from dataclasses import dataclass
+from functools import lru_cache
+from string import Formatter
+from typing import Any, Callable, List, NamedTuple, Optional, Tuple
+from reportlab.lib import colors
+from reportlab.lib.pagesizes import letter
+from .text_metrics import fit_text, measure_many, wrap_text
+
+
+class LayoutProfile(NamedTuple):
+    """The loan-type facts a layout's conditional blocks may depend on."""
+    is_rent: bool
+    rent_to_own: bool
+    joint: bool
+    show_loan_type: bool
+
+
+# -------------------------------
+# LAYOUT NODES
+# -------------------------------
+@dataclass(frozen=True)
+class Text:
+    """Text on the cursor line; ``fit`` truncates it to that width."""
+    x: float
+    value: str
+    font: str
+    size: float
+    align: str = "left"
+    fit: Optional[float] = None
+
+
+@dataclass(frozen=True)
+class Columns:
+    """
+    One table row: cells drawn left to right starting at ``x``. Cells whose
+    index is in ``fit_columns`` are truncated to their column width less
+    ``fit_padding``.
+    """
+    x: float
+    widths: Tuple[float, ...]
+    cells: Tuple[str, ...]
+    font: str
+    size: float
+    fit_columns: Tuple[int, ...] = ()
+    fit_padding: float = 6
+
+
+@dataclass(frozen=True)
+class Rule:
+    """Horizontal line on the cursor line."""
+    x1: float
+    x2: float
+    color: Any = colors.lightgrey
+    line_width: float = 0.5
+
+
+@dataclass(frozen=True)
+class Row:
+    """Items drawn on the cursor line, after which the cursor moves down ``advance``."""
+    items: Tuple[Any, ...]
+    advance: float = 0
+
+
+@dataclass(frozen=True)
+class Gap:
+    height: float
+
+
+@dataclass(frozen=True)
+class Box:
+    """
+    Filled rounded box with its top on the cursor. ``nodes`` are placed from
+    the top of the box and must have fixed heights; the cursor ends at the
+    bottom of the box. ``fill`` names an RGB tuple in the values.
+    """
+    x: float
+    width: float
+    height: float
+    radius: float
+    fill: str
+    nodes: Tuple[Any, ...]
+
+
+@dataclass(frozen=True)
+class SideBlock:
+    """
+    Label/value rows at a fixed position, independent of the cursor.
+
+    Each row is (label, value name, max lines); values are wrapped to the
+    space right of ``x`` and the last line is truncated to fit. Values with
+    max lines None are drawn as they are. Flows drawn
+    next to the block wrap narrower until they pass its bottom.
+    """
+    x: float
+    top: float
+    rows: Tuple[Tuple[str, str, Optional[int]], ...]
+    label_font: str
+    value_font: str
+    size: float
+    line_height: float
+    row_gap: float = 0
+    label_gap: float = 5
+    bottom_padding: float = 0
+
+
+@dataclass(frozen=True)
+class Flow:
+    """
+    A value (string or list of strings) drawn one item after another, each
+    wrapped to the free width and continued on a new page when the page is
+    full. ``after`` is the gap below each item.
+    """
+    value: str
+    font: str
+    size: float
+    line_height: float
+    after: float = 0
+    wrap: bool = True
+    side_gutter: float = 15
+
+
+@dataclass(frozen=True)
+class ClearSide:
+    """Move the cursor to ``offset`` points above the lower of itself and the side block's bottom."""
+    offset: float = 0
+
+
+@dataclass(frozen=True)
+class KeepTogether:
+    """Start a new page unless ``height`` points fit above the content bottom."""
+    height: float
+
+
+@dataclass(frozen=True)
+class Footer:
+    """Draw the layout's footer on the current page."""
+
+
+@dataclass(frozen=True)
+class When:
+    """Conditional block on a LayoutProfile field, resolved at compile time."""
+    condition: str
+    then: Tuple[Any, ...] = ()
+    otherwise: Tuple[Any, ...] = ()
+
+
+@dataclass(frozen=True)
+class Section:
+    """Named group of nodes; only for readability of the spec."""
+    name: str
+    nodes: Tuple[Any, ...]
+
+
+@dataclass(frozen=True, eq=False)
+class Layout:
+    """
+    A complete page layout. ``footer(c, profile)`` is drawn by Footer nodes
+    and before every page break. Compared by identity, so compiled
+    layouts can be cached cheaply.
+    """
+    name: str
+    margin: float
+    content_bottom: float
+    nodes: Tuple[Any, ...]
+    footer: Optional[Callable[[Any, LayoutProfile], None]] = None
+    pagesize: Tuple[float, float] = letter
+
+
+# -------------------------------
+# REPLAY
+# -------------------------------
+class _Cursor:
+    """Mutable replay state."""
+    __slots__ = ("c", "values", "layout", "profile", "y", "side_bottom", "side_left", "beside")
+
+    def __init__(self, c, values: dict, layout: Layout, profile: LayoutProfile):
+        self.c = c
+        self.values = values
+        self.layout = layout
+        self.profile = profile
+        self.y = layout.pagesize[1] - layout.margin
+        self.side_bottom = float("inf")
+        self.side_left = layout.pagesize[0] - layout.margin
+        self.beside = False
+
+
+def _page_break(cur: _Cursor) -> None:
+    if cur.layout.footer is not None:
+        cur.layout.footer(cur.c, cur.profile)
+    cur.c.showPage()
+    cur.y = cur.layout.pagesize[1] - cur.layout.margin
+    cur.beside = False
+
+
+def _op_advance(cur, op):
+    cur.y -= op[1]
+
+
+def _op_font(cur, op):
+    cur.c.setFont(op[1], op[2])
+
+
+def _op_fill(cur, op):
+    cur.c.setFillColor(op[1])
+
+
+def _op_fill_value(cur, op):
+    cur.c.setFillColorRGB(*cur.values[op[1]])
+
+
+def _op_stroke(cur, op):
+    cur.c.setStrokeColor(op[1])
+    cur.c.setLineWidth(op[2])
+
+
+def _op_text(cur, op):
+    _, right, x, dy, text = op
+    if right:
+        cur.c.drawRightString(x, cur.y - dy, text)
+    else:
+        cur.c.drawString(x, cur.y - dy, text)
+
+
+def _op_texts(cur, op):
+    c = cur.c
+    y = cur.y
+    for right, x, dy, text in op[1]:
+        if right:
+            c.drawRightString(x, y - dy, text)
+        else:
+            c.drawString(x, y - dy, text)
+
+
+def _op_text_template(cur, op):
+    _, right, x, dy, template, key, font, size, fit = op
+    text = str(cur.values[key]) if key is not None else template.format_map(cur.values)
+    if fit is not None:
+        text = fit_text(text, font, size, fit)
+    if right:
+        cur.c.drawRightString(x, cur.y - dy, text)
+    else:
+        cur.c.drawString(x, cur.y - dy, text)
+
+
+def _op_line(cur, op):
+    _, x1, x2, dy = op
+    y = cur.y - dy
+    cur.c.line(x1, y, x2, y)
+
+
+def _op_rect(cur, op):
+    _, x, dy, width, height, radius = op
+    cur.c.roundRect(x, cur.y - dy, width, height, radius, fill=1, stroke=0)
+
+
+def _fit_lines(text: str, font: str, size: float, width: float, max_lines: Optional[int]) -> List[str]:
+    if max_lines is None:
+        return [text]
+    if max_lines == 1:
+        return [fit_text(text, font, size, width)]
+    lines = wrap_text(text, font, size, width)
+    if len(lines) > max_lines:
+        lines = lines[:max_lines - 1] + [fit_text(" ".join(lines[max_lines - 1:]), font, size, width)]
+    return lines
+
+
+def _op_side_block(cur, op):
+    _, x, top, rows, label_x, label_font, value_font, size, line_height, row_gap, value_width, padding, side_left = op
+    c = cur.c
+    values = cur.values
+    row_y = top
+    for label, key, max_lines in rows:
+        c.setFont(label_font, size)
+        c.drawRightString(label_x, row_y, label)
+        c.setFont(value_font, size)
+        for line in _fit_lines(str(values[key]), value_font, size, value_width, max_lines):
+            c.drawString(x, row_y, line)
+            row_y -= line_height
+        row_y -= row_gap
+    cur.side_bottom = row_y - padding
+    cur.side_left = side_left
+    cur.beside = True
+
+
+def _op_flow(cur, op):
+    flow = op[1]
+    c = cur.c
+    margin = cur.layout.margin
+    value = cur.values[flow.value]
+    c.setFont(flow.font, flow.size)
+    for item in ((value,) if isinstance(value, str) else value):
+        if not item.strip():
+            continue
+        cur.beside = cur.beside and cur.y > cur.side_bottom
+        if flow.wrap:
+            if cur.beside:
+                available = cur.side_left - flow.side_gutter - margin
+            else:
+                available = cur.layout.pagesize[0] - 2 * margin
+            lines = wrap_text(item, flow.font, flow.size, available)
+        else:
+            lines = (item,)
+        for line in lines:
+            if cur.y < cur.layout.content_bottom:
+                _page_break(cur)
+                c.setFont(flow.font, flow.size)
+            c.drawString(margin, cur.y, line)
+            cur.y -= flow.line_height
+        cur.y -= flow.after
+
+
+def _op_clear_side(cur, op):
+    cur.y = min(cur.y, cur.side_bottom) + op[1]
+
+
+def _op_keep_together(cur, op):
+    if cur.y - op[1] < cur.layout.content_bottom:
+        _page_break(cur)
+
+
+def _op_footer(cur, op):
+    cur.layout.footer(cur.c, cur.profile)
+
+
+# -------------------------------
+# COMPILER
+# -------------------------------
+class _Compiler:
+    """Flattens a layout tree for one profile into replayable operations."""
+
+    def __init__(self, layout: Layout, profile: LayoutProfile):
+        self.layout = layout
+        self.profile = profile
+        self.ops: List[tuple] = []
+        # Distance below the replay cursor that static nodes are placed at
+        self.offset = 0.0
+        self._forget_state()
+
+    def _forget_state(self) -> None:
+        """Graphics state is unknown after an operation that may change page or font."""
+        self.font = self.fill = self.stroke = None
+
+    def _flush_offset(self) -> None:
+        if self.offset:
+            self.ops.append((_op_advance, self.offset))
+            self.offset = 0.0
+
+    def _set_font(self, font: str, size: float) -> None:
+        if self.font != (font, size):
+            self.ops.append((_op_font, font, size))
+            self.font = (font, size)
+
+    def _set_fill(self, color) -> None:
+        if self.fill != color:
+            self.ops.append((_op_fill, color))
+            self.fill = color
+
+    def _dynamic(self, op: tuple) -> None:
+        self._flush_offset()
+        self.ops.append(op)
+        self._forget_state()
+
+    def compile(self, nodes) -> None:
+        for node in nodes:
+            if isinstance(node, Section):
+                self.compile(node.nodes)
+            elif isinstance(node, When):
+                self.compile(node.then if getattr(self.profile, node.condition) else node.otherwise)
+            elif isinstance(node, Row):
+                for item in node.items:
+                    self.compile((item,))
+                self.offset += node.advance
+            elif isinstance(node, Gap):
+                self.offset += node.height
+            elif isinstance(node, Text):
+                self._text(node)
+            elif isinstance(node, Columns):
+                x = node.x
+                for index, (cell, width) in enumerate(zip(node.cells, node.widths)):
+                    fit = width - node.fit_padding if index in node.fit_columns else None
+                    self._text(Text(x, cell, node.font, node.size, fit=fit))
+                    x += width
+            elif isinstance(node, Rule):
+                if self.stroke != (node.color, node.line_width):
+                    self.ops.append((_op_stroke, node.color, node.line_width))
+                    self.stroke = (node.color, node.line_width)
+                self.ops.append((_op_line, node.x1, node.x2, self.offset))
+            elif isinstance(node, Box):
+                top = self.offset
+                self.ops.append((_op_fill_value, node.fill))
+                self.fill = None
+                self.ops.append((_op_rect, node.x, top + node.height, node.width, node.height, node.radius))
+                self.compile(node.nodes)
+                self.offset = top + node.height
+            elif isinstance(node, SideBlock):
+                labels = [label for label, _, _ in node.rows]
+                label_x = node.x - node.label_gap
+                side_left = label_x - max(measure_many(labels, node.label_font, node.size))
+                value_width = self.layout.pagesize[0] - self.layout.margin - node.x
+                self._set_fill(colors.black)
+                self.ops.append((_op_side_block, node.x, node.top, node.rows, label_x, node.label_font,
+                                 node.value_font, node.size, node.line_height, node.row_gap, value_width,
+                                 node.bottom_padding, side_left))
+                self.font = None
+            elif isinstance(node, Flow):
+                self._set_fill(colors.black)
+                self._dynamic((_op_flow, node))
+                # Flows leave their own font set; a page break inside one
+                # resets the fill to the default black
+                self.font = (node.font, node.size)
+                self.fill = colors.black
+            elif isinstance(node, ClearSide):
+                self._flush_offset()
+                self.ops.append((_op_clear_side, node.offset))
+            elif isinstance(node, KeepTogether):
+                self._dynamic((_op_keep_together, node.height))
+            elif isinstance(node, Footer):
+                if self.layout.footer is not None:
+                    self.ops.append((_op_footer,))
+                    self._forget_state()
+            else:
+                raise TypeError(f"Unknown layout node: {node!r}")
+
+    def _text(self, node: Text) -> None:
+        self._set_font(node.font, node.size)
+        self._set_fill(colors.black)
+        right = node.align == "right"
+        fields = [field for _, field, _, _ in Formatter().parse(node.value) if field is not None]
+        if not fields:
+            # Constant text is measured and fitted once, here
+            text = node.value.replace("{{", "{").replace("}}", "}")
+            if node.fit is not None:
+                text = fit_text(text, node.font, node.size, node.fit)
+            self.ops.append((_op_text, right, node.x, self.offset, text))
+            return
+        key = fields[0] if len(fields) == 1 and node.value == "{" + fields[0] + "}" else None
+        self.ops.append((_op_text_template, right, node.x, self.offset, node.value, key,
+                         node.font, node.size, node.fit))
+
+
+@lru_cache(maxsize=None)
+def compile_layout(layout: Layout, profile: LayoutProfile) -> Tuple[tuple, ...]:
+    """
+    Compile a layout for one profile into a flat tuple of draw operations.
+
+    Cached: each (layout, profile) pair is compiled once per process.
+    """
+    compiler = _Compiler(layout, profile)
+    compiler.compile(layout.nodes)
+    return _merge_constant_text(compiler.ops)
+
+
+def _merge_constant_text(ops: List[tuple]) -> Tuple[tuple, ...]:
+    """Replace runs of constant text operations with one operation per run."""
+    merged: List[tuple] = []
+    run: List[tuple] = []
+    for op in ops + [None]:
+        if op is not None and op[0] is _op_text:
+            run.append(op[1:])
+            continue
+        if len(run) == 1:
+            merged.append((_op_text,) + run[0])
+        elif run:
+            merged.append((_op_texts, tuple(run)))
+        run = []
+        if op is not None:
+            merged.append(op)
+    return tuple(merged)
+
+
+def render_layout(c, layout: Layout, profile: LayoutProfile, values: dict) -> float:
+    """
+    Draw a layout onto a canvas, starting at the top of the current page.
+
+    Args:
+        c: ReportLab canvas, or anything with the same drawing API (e.g. SvgCanvas)
+        layout: Layout to draw
+        profile: Loan-type profile selecting the conditional blocks
+        values: Statement values referenced by the layout's templates
+
+    Returns:
+        float: Final cursor position
+    """
+    cur = _Cursor(c, values, layout, profile)
+    for op in compile_layout(layout, profile):
+        op[0](cur, op)
+    return cur.y
@@ -0,0 +1,187 @@
+# app/services/pdf_parallel.py
+import multiprocessing
+import os
+import threading
+from concurrent.futures import ProcessPoolExecutor
+from io import BytesIO
+from typing import List, Optional, Tuple
+from .pdf_generator import (
+    generate_pdf,
+    schedule_page_count,
+    schedule_totals,
+    _draw_loan_schedule,
+    _new_canvas,
+)
+from .utils import is_deterministic
+
+# pypdf is only needed to stitch page ranges together; without it every
+# statement is rendered serially by generate_pdf.
+try:
+    from pypdf import PdfReader, PdfWriter
+    from pypdf.generic import Fit
+except ImportError:  # pragma: no cover - optional dependency
+    PdfReader = PdfWriter = Fit = None
+
+# Below this many schedule pages, process start-up and stitching cost more than they save
+PARALLEL_MIN_PAGES = 24
+# Smallest page range handed to one worker
+MIN_PAGES_PER_RANGE = 8
+
+_executor: Optional[ProcessPoolExecutor] = None
+_executor_lock = threading.Lock()
+
+
+def _available_cpus() -> int:
+    """CPUs this process may run on (respects affinity / container limits)."""
+    try:
+        return len(os.sched_getaffinity(0))
+    except AttributeError:  # not available on macOS / Windows
+        return os.cpu_count() or 1
+
+
+def _get_executor() -> ProcessPoolExecutor:
+    """
+    Return the shared worker pool, creating it on first use.
+
+    The pool is sized once, to the available CPUs, and never replaced:
+    concurrent requests may be submitting to it or waiting on its futures.
+    ``max_workers`` in the callers only sets how many page ranges a
+    schedule is split into.
+    """
+    global _executor
+    with _executor_lock:
+        if _executor is None:
+            # spawn: forking a threaded ASGI server is not safe
+            _executor = ProcessPoolExecutor(max_workers=_available_cpus(),
+                                            mp_context=multiprocessing.get_context("spawn"))
+        return _executor
+
+
+def split_page_ranges(total_pages: int, workers: int) -> List[Tuple[int, int]]:
+    """
+    Split ``total_pages`` into contiguous (start, end) ranges, one per worker,
+    each at least MIN_PAGES_PER_RANGE pages long.
+    """
+    range_count = max(1, min(workers, total_pages // MIN_PAGES_PER_RANGE))
+    base, extra = divmod(total_pages, range_count)
+    ranges = []
+    start = 0
+    for i in range(range_count):
+        end = start + base + (1 if i < extra else 0)
+        ranges.append((start, end))
+        start = end
+    return ranges
+
+
+def _render_schedule_range(statement, first_page: int, end_page: int, totals: dict,
+                           page_offset: int) -> Tuple[bytes, List[Tuple[str, int, float]]]:
+    """Worker entry point: render one range of loan schedule pages as a standalone PDF."""
+    buffer = BytesIO()
+    c = _new_canvas(buffer, statement)
+    positions = _draw_loan_schedule(c, statement, first_page, end_page, totals,
+                                    page_offset=page_offset, outline=False)
+    c.save()
+    return buffer.getvalue(), positions
+
+
+def render_schedule_fragments(statement, summary_pages: int, max_workers: Optional[int] = None,
+                              min_pages: int = PARALLEL_MIN_PAGES) -> List[Tuple[bytes, List[Tuple[str, int, float]]]]:
+    """
+    Render a statement's loan schedule as standalone PDF fragments.
+
+    Large schedules are split into page ranges rendered by worker processes;
+    smaller ones are rendered here as a single fragment.
+
+    Args:
+        statement: Statement request object with a loan schedule
+        summary_pages: Pages preceding the schedule (offsets page numbers in footers)
+        max_workers: Page ranges to render in parallel (defaults to the CPU count)
+        min_pages: Minimum schedule pages before rendering in parallel
+
+    Returns:
+        list: (PDF bytes, outline positions) per fragment, in page order
+    """
+    workers = max_workers or _available_cpus()
+    total_pages = schedule_page_count(statement)
+    totals = schedule_totals(statement)
+    if workers < 2 or total_pages < max(min_pages, 2 * MIN_PAGES_PER_RANGE):
+        return [_render_schedule_range(statement, 0, total_pages, totals, summary_pages)]
+
+    executor = _get_executor()
+    futures = [
+        executor.submit(_render_schedule_range, statement, start, end, totals, summary_pages + start)
+        for start, end in split_page_ranges(total_pages, workers)
+    ]
+    return [future.result() for future in futures]
+
+
+def stitch_schedule(summary_reader, fragments, sink=None) -> Optional[bytes]:
+    """
+    Append schedule fragments after the summary page(s) and rebuild the
+    outline (Summary, Loan Schedule, one entry per loan) on the result.
+
+    Args:
+        summary_reader: PdfReader over the summary-only PDF
+        fragments: Output of ``render_schedule_fragments``
+        sink: Optional writable binary file-like object to write into
+
+    Returns:
+        bytes: PDF file content as bytes, or None when written to ``sink``
+    """
+    summary_pages = len(summary_reader.pages)
+    writer = PdfWriter()
+    writer.append(summary_reader, import_outline=False)
+    outline_targets = []
+    for fragment, positions in fragments:
+        page_base = len(writer.pages)
+        writer.append(PdfReader(BytesIO(fragment)), import_outline=False)
+        outline_targets.extend((loan_id, page_base + page, top) for loan_id, page, top in positions)
+
+    writer.add_outline_item("Summary", 0)
+    schedule_item = writer.add_outline_item("Loan Schedule", summary_pages)
+    for loan_id, page, top in outline_targets:
+        writer.add_outline_item(f"Loan {loan_id}", page, parent=schedule_item, fit=Fit.xyz(left=0, top=top))
+
+    if sink is not None:
+        writer.write(sink)
+        return None
+    output = BytesIO()
+    writer.write(output)
+    return output.getvalue()
+
+
+def generate_pdf_parallel(statement, max_workers: Optional[int] = None,
+                          min_pages: int = PARALLEL_MIN_PAGES, sink=None) -> Optional[bytes]:
+    """
+    Generate a PDF statement, rendering large loan schedules in parallel.
+
+    The summary page(s) are rendered in this process. The loan schedule is
+    split into page ranges that worker processes render independently; the
+    fragments are stitched in order and the outline (Summary, Loan Schedule,
+    one entry per loan) is rebuilt on the merged document. Page numbers and
+    schedule totals are computed up front, so they match serial output.
+
+    Falls back to ``generate_pdf`` for small statements, a single worker,
+    deterministic mode, or when pypdf is not installed.
+
+    Args:
+        statement: Statement request object
+        max_workers: Page ranges to render in parallel (defaults to the CPU count)
+        min_pages: Minimum schedule pages before rendering in parallel
+        sink: Optional writable binary file-like object to render into
+
+    Returns:
+        bytes: PDF file content as bytes, or None when written to ``sink``
+    """
+    workers = max_workers or _available_cpus()
+    total_pages = schedule_page_count(statement)
+    if PdfWriter is None or workers < 2 or total_pages < max(min_pages, 2 * MIN_PAGES_PER_RANGE):
+        return generate_pdf(statement, sink=sink)
+    if is_deterministic(statement):
+        # Stitching adds writer-generated IDs; keep deterministic output byte-identical
+        return generate_pdf(statement, sink=sink)
+
+    # Summary first: its page count is the page-number offset for the schedule
+    summary_reader = PdfReader(BytesIO(generate_pdf(statement, include_schedule=False)))
+    fragments = render_schedule_fragments(statement, len(summary_reader.pages), workers, min_pages)
+    return stitch_schedule(summary_reader, fragments, sink)
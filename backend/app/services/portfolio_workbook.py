@@ -0,0 +1,554 @@
+# app/services/portfolio_workbook.py
+"""
+One Excel workbook covering every statement of a cycle.
+
+Sheets, in order:
+
+    Summary     totals by loan type (from the statement builder), with a total row
+    Customers   one row per customer on each statement
+    <loan type> one sheet per loan type group (Auto Loan, Mortgage, ...),
+                one row per loan
+
+Every sheet has a bold header row frozen in place; the customer and loan
+sheets also keep their statement and customer ID columns in view.
+
+The workbook is written as SpreadsheetML directly rather than through
+openpyxl, which keeps every cell in memory and, even in write-only mode,
+writes each string inline with no shared string table. Here:
+
+    * rows are streamed into one spooled sink per sheet as statements arrive,
+      so no sheet is ever held in memory whole;
+    * values that repeat across rows (loan types, customer IDs and names,
+      unparseable dates) go into the shared string table once and cells
+      refer to them by index; one-off text (addresses, e-mails) stays inline
+      so the table only grows with values that are actually shared;
+    * dates are written as date serials with one shared date style;
+    * the handful of cell styles is a fixed table, so a cell's style is just
+      its index.
+
+The zip is assembled on close, with fixed entry timestamps, and the
+document properties are dated from the statements rather than the clock. A
+portfolio whose statements all carry a statement_date (or are in
+deterministic mode) therefore always produces the same bytes; other
+statements show the day they were rendered in the Statement Date column, as
+their own documents do.
+"""
+import math
+import shutil
+from datetime import datetime
+from functools import lru_cache
+from typing import Dict, Iterable, List, Optional, Tuple
+from xml.sax.saxutils import escape, quoteattr
+from zipfile import ZipFile, ZipInfo, ZIP_DEFLATED
+from .excel_generator import FIXED_ZIP_DATE_TIME
+from .output_sink import open_sink, sink_size
+from .statement_builder import add_loan_to_summary, finish_loan_type_summary, monthly_interest_amount
+from .utils import get_customers_from_statement, get_statement_datetime, is_deterministic, parse_date
+
+# Rows buffered per sheet before each write to its sink
+FLUSH_ROWS = 2048
+# Bytes of each sheet kept in memory before it spills to a temp file; small,
+# since a workbook has a sheet per loan type
+SHEET_SPOOL_SIZE = 1024 * 1024
+# Excel's limit on sheet names
+MAX_SHEET_TITLE = 31
+
+SUMMARY_SHEET = "Summary"
+CUSTOMERS_SHEET = "Customers"
+
+_MAIN_NS = "http://schemas.openxmlformats.org/spreadsheetml/2006/main"
+_REL_NS = "http://schemas.openxmlformats.org/officeDocument/2006/relationships"
+_PACKAGE_REL_NS = "http://schemas.openxmlformats.org/package/2006/relationships"
+_XML_DECLARATION = '<?xml version="1.0" encoding="UTF-8" standalone="yes"?>\n'
+
+# Excel's day zero for the 1900 date system
+_EXCEL_EPOCH = datetime(1899, 12, 30)
+
+# ============================================================
+# CELL STYLES
+# ============================================================
+# Index into cellXfs in _STYLES_XML, per (column kind, bold)
+_STYLE_IDS = {
+    ("text", False): 0,
+    ("number", False): 0,
+    ("money", False): 2,
+    ("rate", False): 3,
+    ("date", False): 4,
+    ("int", False): 5,
+    ("text", True): 6,
+    ("number", True): 6,
+    ("money", True): 7,
+    ("rate", True): 8,
+    ("int", True): 9,
+    ("date", True): 4,
+}
+_HEADER_STYLE = 1
+
+_STYLES_XML = (
+    _XML_DECLARATION
+    + f'<styleSheet xmlns="{_MAIN_NS}">'
+    '<numFmts count="1"><numFmt numFmtId="164" formatCode="0.00#"/></numFmts>'
+    '<fonts count="2">'
+    '<font><sz val="11"/><name val="Calibri"/><family val="2"/></font>'
+    '<font><b/><sz val="11"/><name val="Calibri"/><family val="2"/></font>'
+    '</fonts>'
+    '<fills count="3">'
+    '<fill><patternFill patternType="none"/></fill>'
+    '<fill><patternFill patternType="gray125"/></fill>'
+    '<fill><patternFill patternType="solid"><fgColor rgb="FFD9E1F2"/><bgColor indexed="64"/></patternFill></fill>'
+    '</fills>'
+    '<borders count="1"><border><left/><right/><top/><bottom/><diagonal/></border></borders>'
+    '<cellStyleXfs count="1"><xf numFmtId="0" fontId="0" fillId="0" borderId="0"/></cellStyleXfs>'
+    '<cellXfs count="10">'
+    '<xf numFmtId="0" fontId="0" fillId="0" borderId="0" xfId="0"/>'
+    '<xf numFmtId="0" fontId="1" fillId="2" borderId="0" xfId="0" applyFont="1" applyFill="1"/>'
+    '<xf numFmtId="4" fontId="0" fillId="0" borderId="0" xfId="0" applyNumberFormat="1"/>'
+    '<xf numFmtId="164" fontId="0" fillId="0" borderId="0" xfId="0" applyNumberFormat="1"/>'
+    '<xf numFmtId="14" fontId="0" fillId="0" borderId="0" xfId="0" applyNumberFormat="1"/>'
+    '<xf numFmtId="3" fontId="0" fillId="0" borderId="0" xfId="0" applyNumberFormat="1"/>'
+    '<xf numFmtId="0" fontId="1" fillId="0" borderId="0" xfId="0" applyFont="1"/>'
+    '<xf numFmtId="4" fontId="1" fillId="0" borderId="0" xfId="0" applyNumberFormat="1" applyFont="1"/>'
+    '<xf numFmtId="164" fontId="1" fillId="0" borderId="0" xfId="0" applyNumberFormat="1" applyFont="1"/>'
+    '<xf numFmtId="3" fontId="1" fillId="0" borderId="0" xfId="0" applyNumberFormat="1" applyFont="1"/>'
+    '</cellXfs>'
+    '<cellStyles count="1"><cellStyle name="Normal" xfId="0" builtinId="0"/></cellStyles>'
+    '</styleSheet>'
+)
+
+# ============================================================
+# SHEET COLUMNS
+# ============================================================
+# (header, width, kind); kind is "shared" (shared string), "inline" (one-off
+# text), "number" (plain, e.g. sequence numbers), "int" (counts), "money",
+# "rate" or "date"
+SUMMARY_COLUMNS = (
+    ("Loan Type", 22, "shared"),
+    ("Loans", 10, "int"),
+    ("Principal", 18, "money"),
+    ("Current Balance", 18, "money"),
+    ("Monthly Payment", 18, "money"),
+    ("Monthly Interest", 18, "money"),
+    ("Avg Interest Rate (%)", 20, "rate"),
+)
+
+CUSTOMER_COLUMNS = (
+    ("Statement", 10, "number"),
+    ("Customer ID", 16, "shared"),
+    ("Name", 28, "shared"),
+    ("Address", 40, "inline"),
+    ("Phone", 16, "inline"),
+    ("Email", 30, "inline"),
+    ("Billing Period Start", 14, "date"),
+    ("Billing Period End", 14, "date"),
+    ("Statement Date", 14, "date"),
+    ("Loans", 8, "int"),
+    ("Current Balance", 16, "money"),
+    ("Monthly Payment", 16, "money"),
+)
+
+LOAN_COLUMNS = (
+    ("Statement", 10, "number"),
+    ("Customer ID", 16, "shared"),
+    ("Customer Name", 28, "shared"),
+    ("Loan ID", 16, "inline"),
+    ("Loan Type", 14, "shared"),
+    ("Principal", 16, "money"),
+    ("Interest Rate (%)", 12, "rate"),
+    ("Term (Months)", 10, "number"),
+    ("Current Balance", 16, "money"),
+    ("Monthly Payment", 16, "money"),
+    ("Monthly Interest", 16, "money"),
+    ("Payment Due Date", 14, "date"),
+)
+
+# Characters XML 1.0 cannot carry at all
+_XML_ILLEGAL = {code: " " for code in range(32) if code not in (9, 10, 13)}
+
+
+def _xml_text(value: str) -> str:
+    if not value.isprintable():
+        value = value.translate(_XML_ILLEGAL)
+    return escape(value)
+
+
+def _t_element(value: str) -> str:
+    """A ``<t>`` element, keeping leading/trailing spaces Excel would strip."""
+    text = _xml_text(value)
+    if text != text.strip():
+        return f'<t xml:space="preserve">{text}</t>'
+    return f"<t>{text}</t>"
+
+
+@lru_cache(maxsize=4096)
+def _date_serial(value) -> Optional[int]:
+    """Excel date serial of a date (or date string), or None if it cannot be parsed."""
+    parsed = value if isinstance(value, datetime) else parse_date(value) if value else None
+    return (parsed - _EXCEL_EPOCH).days if parsed is not None else None
+
+
+def sheet_title(name: str, taken: Iterable[str]) -> str:
+    """
+    Make a valid, unused sheet name from ``name``.
+
+    Excel forbids ``[]:*?/\\``, a leading or trailing apostrophe, names over
+    31 characters and names that differ from another sheet's only by case.
+    """
+    title = "".join(" " if char in '[]:*?/\\' else char for char in name)
+    title = " ".join(title.split()).strip("'") or "Loans"
+    title = title[:MAX_SHEET_TITLE].rstrip()
+    taken = {existing.lower() for existing in taken}
+    candidate, suffix = title, 2
+    while candidate.lower() in taken:
+        tag = f" ({suffix})"
+        candidate = title[:MAX_SHEET_TITLE - len(tag)] + tag
+        suffix += 1
+    return candidate
+
+
+class _SharedStrings:
+    """The workbook's shared string table: each distinct value stored once."""
+
+    def __init__(self):
+        self.index: Dict[str, int] = {}
+        self.references = 0
+
+    def cell(self, value: str, style_id: int = 0) -> str:
+        index = self.index.get(value)
+        if index is None:
+            index = self.index[value] = len(self.index)
+        self.references += 1
+        if style_id:
+            return f'<c s="{style_id}" t="s"><v>{index}</v></c>'
+        return f'<c t="s"><v>{index}</v></c>'
+
+    def xml(self) -> str:
+        items = "".join(f"<si>{_t_element(value)}</si>" for value in self.index)
+        return (f'{_XML_DECLARATION}<sst xmlns="{_MAIN_NS}" count="{self.references}" '
+                f'uniqueCount="{len(self.index)}">{items}</sst>')
+
+
+class _SheetStream:
+    """
+    One worksheet whose rows are streamed into its own spooled sink.
+
+    Cells carry no ``r`` reference (they are positional), and each column's
+    cell encoder is chosen once from its kind, so a row is one join.
+    """
+
+    def __init__(self, title: str, columns: Tuple[Tuple[str, int, str], ...], shared: _SharedStrings,
+                 frozen_columns: int = 0, flush_rows: int = FLUSH_ROWS):
+        self.title = title
+        self.shared = shared
+        self.sink = open_sink(SHEET_SPOOL_SIZE)
+        self.rows = 0
+        self._chunks: List[str] = []
+        self._flush_rows = flush_rows
+        self._encoders = tuple(self._encoder(kind, False) for _, _, kind in columns)
+        self._bold_encoders = tuple(self._encoder(kind, True) for _, _, kind in columns)
+
+        if frozen_columns:
+            top_left = f"{chr(ord('A') + frozen_columns)}2"
+            pane = (f'<pane xSplit="{frozen_columns}" ySplit="1" topLeftCell="{top_left}" '
+                    'activePane="bottomRight" state="frozen"/><selection pane="bottomRight"/>')
+        else:
+            pane = ('<pane ySplit="1" topLeftCell="A2" activePane="bottomLeft" state="frozen"/>'
+                    '<selection pane="bottomLeft"/>')
+        cols = "".join(
+            f'<col min="{n}" max="{n}" width="{width}" customWidth="1"/>'
+            for n, (_, width, _) in enumerate(columns, 1)
+        )
+        self._write(
+            f'{_XML_DECLARATION}<worksheet xmlns="{_MAIN_NS}" xmlns:r="{_REL_NS}">'
+            f'<sheetViews><sheetView workbookViewId="0">{pane}</sheetView></sheetViews>'
+            f'<sheetFormatPr defaultRowHeight="15"/><cols>{cols}</cols><sheetData>'
+        )
+        self.append([header for header, _, _ in columns], header=True)
+
+    def _encoder(self, kind: str, bold: bool):
+        shared = self.shared
+        if kind == "shared":
+            style_id = _STYLE_IDS[("text", bold)]
+            return lambda value: shared.cell(str(value), style_id) if value not in (None, "") else "<c/>"
+        if kind == "inline":
+            style = ' s="%d"' % _STYLE_IDS[("text", bold)] if bold else ""
+            return lambda value: (f'<c{style} t="inlineStr"><is>{_t_element(str(value))}</is></c>'
+                                  if value not in (None, "") else "<c/>")
+        if kind == "date":
+            prefix = '<c s="%d"><v>' % _STYLE_IDS[("date", bold)]
+
+            def encode_date(value):
+                serial = _date_serial(value)
+                if serial is not None:
+                    return f"{prefix}{serial}</v></c>"
+                return shared.cell(str(value)) if value else "<c/>"
+            return encode_date
+        prefix = '<c s="%d"><v>' % _STYLE_IDS[(kind, bold)]
+        # inf/nan have no SpreadsheetML representation; leave the cell empty
+        return lambda value: (f"{prefix}{value!r}</v></c>"
+                              if value is not None and math.isfinite(value) else "<c/>")
+
+    def _write(self, text: str) -> None:
+        self.sink.write(text.encode("utf-8"))
+
+    def append(self, values, bold: bool = False, header: bool = False) -> None:
+        """Append one row of values in column order."""
+        self.rows += 1
+        if header:
+            cells = "".join([self.shared.cell(str(value), _HEADER_STYLE) for value in values])
+        else:
+            encoders = self._bold_encoders if bold else self._encoders
+            cells = "".join([encode(value) for encode, value in zip(encoders, values)])
+        self._chunks.append(f'<row r="{self.rows}">{cells}</row>')
+        if len(self._chunks) >= self._flush_rows:
+            self.flush()
+
+    def flush(self) -> None:
+        if self._chunks:
+            self._write("".join(self._chunks))
+            self._chunks.clear()
+
+    def finish(self) -> None:
+        """Close ``sheetData`` and the worksheet; no rows can follow."""
+        self.flush()
+        self._write("</sheetData></worksheet>")
+
+
+class PortfolioWorkbookWriter:
+    """
+    Writes many statements into one portfolio workbook, incrementally.
+
+    Usage:
+        with PortfolioWorkbookWriter(sink) as writer:
+            for statement in statements:
+                writer.write_statement(statement)
+        summary = writer.summary
+
+    Customer and loan rows are streamed to per-sheet spooled sinks as they
+    are written; the summary sheet and the zip are produced by ``close`` (or
+    on leaving the ``with`` block). The sink itself is left open.
+    """
+
+    def __init__(self, sink, flush_rows: int = FLUSH_ROWS):
+        """
+        Args:
+            sink: Writable binary file-like object for the .xlsx
+            flush_rows: Rows buffered per sheet between writes to its sink
+        """
+        self.sink = sink
+        self._flush_rows = flush_rows
+        self._shared = _SharedStrings()
+        self._customers = _SheetStream(CUSTOMERS_SHEET, CUSTOMER_COLUMNS, self._shared,
+                                       frozen_columns=2, flush_rows=flush_rows)
+        self._loan_sheets: Dict[str, _SheetStream] = {}
+        self._loan_type_totals: Dict[str, dict] = {}
+        # Latest statement date fixed by the request (not today's date)
+        self._latest_fixed_date: Optional[datetime] = None
+        self.statement_count = 0
+        self.customer_count = 0
+        self.summary: Dict[str, dict] = {}
+        self._closed = False
+
+    def _loan_sheet(self, group: str) -> _SheetStream:
+        sheet = self._loan_sheets.get(group)
+        if sheet is None:
+            taken = [SUMMARY_SHEET, CUSTOMERS_SHEET] + [other.title for other in self._loan_sheets.values()]
+            sheet = self._loan_sheets[group] = _SheetStream(
+                sheet_title(group, taken), LOAN_COLUMNS, self._shared,
+                frozen_columns=2, flush_rows=self._flush_rows)
+        return sheet
+
+    def write_statement(self, statement) -> None:
+        """Append a statement's customer rows and its loans to their loan type sheets."""
+        customers = get_customers_from_statement(statement)
+        self.statement_count += 1
+        statement_seq = self.statement_count
+        statement_dt = get_statement_datetime(statement)
+        if statement.statement_date or is_deterministic(statement):
+            if self._latest_fixed_date is None or statement_dt > self._latest_fixed_date:
+                self._latest_fixed_date = statement_dt
+
+        loans = statement.loans
+        primary = customers[0]
+        customer_names = ", ".join(customer.name for customer in customers)
+        balance_total = payment_total = 0.0
+        for loan in loans:
+            group = add_loan_to_summary(self._loan_type_totals, loan)
+            self._loan_sheet(group).append((
+                statement_seq, primary.customer_id, customer_names, loan.loan_id, loan.loan_type,
+                loan.principal, loan.interest_rate, loan.term_months, loan.current_balance,
+                loan.monthly_payment, monthly_interest_amount(loan), loan.payment_due_date,
+            ))
+            balance_total += loan.current_balance
+            payment_total += loan.monthly_payment
+
+        for customer in customers:
+            self._customers.append((
+                statement_seq, customer.customer_id, customer.name, customer.address,
+                customer.phone, customer.email, statement.billing_period_start,
+                statement.billing_period_end, statement_dt, len(loans),
+                round(balance_total, 2), round(payment_total, 2),
+            ))
+        self.customer_count += len(customers)
+
+    def _summary_sheet(self) -> _SheetStream:
+        sheet = _SheetStream(SUMMARY_SHEET, SUMMARY_COLUMNS, self._shared)
+        for group, totals in self.summary.items():
+            sheet.append((group, totals["loan_count"], totals["principal"], totals["current_balance"],
+                          totals["monthly_payment"], totals["interest_amount"], totals["average_interest_rate"]))
+
+        raw = self._loan_type_totals.values()
+        balance = sum(totals["current_balance"] for totals in raw)
+        weighted_rate = sum(totals["balance_weighted_rate"] for totals in raw)
+        sheet.append((
+            "Total",
+            sum(totals["loan_count"] for totals in raw),
+            round(sum(totals["principal"] for totals in raw), 2),
+            round(balance, 2),
+            round(sum(totals["monthly_payment"] for totals in raw), 2),
+            round(sum(totals["interest_amount"] for totals in raw), 2),
+            round(weighted_rate / balance, 3) if balance else 0.0,
+        ), bold=True)
+        sheet.append(())
+        sheet.append(("Statements", self.statement_count))
+        sheet.append(("Customers", self.customer_count))
+        sheet.finish()
+        return sheet
+
+    def close(self) -> Dict[str, dict]:
+        """
+        Write the summary sheet and assemble the workbook into the sink.
+
+        Returns:
+            dict: Totals by loan type, as shown on the summary sheet
+        """
+        if self._closed:
+            return self.summary
+        self.summary = finish_loan_type_summary(self._loan_type_totals)
+        self._customers.finish()
+        for sheet in self._loan_sheets.values():
+            sheet.finish()
+        sheets = [self._summary_sheet(), self._customers] + [
+            self._loan_sheets[group] for group in sorted(self._loan_sheets)
+        ]
+        try:
+            self._write_package(sheets)
+        finally:
+            self._release(sheets)
+        return self.summary
+
+    def _write_package(self, sheets: List[_SheetStream]) -> None:
+        count = len(sheets)
+        content_types = "".join(
+            f'<Override PartName="/xl/worksheets/sheet{n}.xml" '
+            'ContentType="application/vnd.openxmlformats-officedocument.spreadsheetml.worksheet+xml"/>'
+            for n in range(1, count + 1)
+        )
+        sheet_entries = "".join(
+            f'<sheet name={quoteattr(sheet.title)} sheetId="{n}" r:id="rId{n}"/>'
+            for n, sheet in enumerate(sheets, 1)
+        )
+        sheet_rels = "".join(
+            f'<Relationship Id="rId{n}" Type="{_REL_NS}/worksheet" Target="worksheets/sheet{n}.xml"/>'
+            for n in range(1, count + 1)
+        )
+        parts = [
+            ("[Content_Types].xml",
+             f'{_XML_DECLARATION}<Types xmlns="http://schemas.openxmlformats.org/package/2006/content-types">'
+             '<Default Extension="rels" ContentType="application/vnd.openxmlformats-package.relationships+xml"/>'
+             '<Default Extension="xml" ContentType="application/xml"/>'
+             '<Override PartName="/xl/workbook.xml" '
+             'ContentType="application/vnd.openxmlformats-officedocument.spreadsheetml.sheet.main+xml"/>'
+             '<Override PartName="/xl/styles.xml" '
+             'ContentType="application/vnd.openxmlformats-officedocument.spreadsheetml.styles+xml"/>'
+             '<Override PartName="/xl/sharedStrings.xml" '
+             'ContentType="application/vnd.openxmlformats-officedocument.spreadsheetml.sharedStrings+xml"/>'
+             '<Override PartName="/docProps/core.xml" '
+             'ContentType="application/vnd.openxmlformats-package.core-properties+xml"/>'
+             f'{content_types}</Types>'),
+            ("_rels/.rels",
+             f'{_XML_DECLARATION}<Relationships xmlns="{_PACKAGE_REL_NS}">'
+             f'<Relationship Id="rId1" Type="{_REL_NS}/officeDocument" Target="xl/workbook.xml"/>'
+             '<Relationship Id="rId2" '
+             'Type="http://schemas.openxmlformats.org/package/2006/relationships/metadata/core-properties" '
+             'Target="docProps/core.xml"/></Relationships>'),
+            ("docProps/core.xml", self._core_properties()),
+            ("xl/workbook.xml",
+             f'{_XML_DECLARATION}<workbook xmlns="{_MAIN_NS}" xmlns:r="{_REL_NS}">'
+             f'<bookViews><workbookView activeTab="0"/></bookViews><sheets>{sheet_entries}</sheets></workbook>'),
+            ("xl/_rels/workbook.xml.rels",
+             f'{_XML_DECLARATION}<Relationships xmlns="{_PACKAGE_REL_NS}">{sheet_rels}'
+             f'<Relationship Id="rId{count + 1}" Type="{_REL_NS}/styles" Target="styles.xml"/>'
+             f'<Relationship Id="rId{count + 2}" Type="{_REL_NS}/sharedStrings" Target="sharedStrings.xml"/>'
+             '</Relationships>'),
+            ("xl/styles.xml", _STYLES_XML),
+        ]
+
+        with ZipFile(self.sink, "w", ZIP_DEFLATED, allowZip64=True) as archive:
+            for name, xml in parts:
+                archive.writestr(self._zip_info(name), xml.encode("utf-8"))
+            for n, sheet in enumerate(sheets, 1):
+                info = self._zip_info(f"xl/worksheets/sheet{n}.xml")
+                # Declared up front so zip64 is used for sheets over 2 GiB
+                info.file_size = sink_size(sheet.sink)
+                sheet.sink.seek(0)
+                with archive.open(info, "w") as dest:
+                    shutil.copyfileobj(sheet.sink, dest, 1024 * 64)
+            # Last: only now does the table hold every string the sheets refer to
+            archive.writestr(self._zip_info("xl/sharedStrings.xml"), self._shared.xml().encode("utf-8"))
+
+    def _core_properties(self) -> str:
+        # Dated from the statements, never now(); undated if no statement fixes a date
+        dates = ""
+        if self._latest_fixed_date is not None:
+            stamp = self._latest_fixed_date.strftime("%Y-%m-%dT%H:%M:%SZ")
+            dates = (f'<dcterms:created xsi:type="dcterms:W3CDTF">{stamp}</dcterms:created>'
+                     f'<dcterms:modified xsi:type="dcterms:W3CDTF">{stamp}</dcterms:modified>')
+        return (
+            f'{_XML_DECLARATION}<cp:coreProperties '
+            'xmlns:cp="http://schemas.openxmlformats.org/package/2006/metadata/core-properties" '
+            'xmlns:dcterms="http://purl.org/dc/terms/" '
+            'xmlns:xsi="http://www.w3.org/2001/XMLSchema-instance">'
+            '<dc:title xmlns:dc="http://purl.org/dc/elements/1.1/">Portfolio Statements</dc:title>'
+            f'{dates}</cp:coreProperties>'
+        )
+
+    @staticmethod
+    def _zip_info(name: str) -> ZipInfo:
+        info = ZipInfo(name, date_time=FIXED_ZIP_DATE_TIME)
+        info.compress_type = ZIP_DEFLATED
+        info.external_attr = 0o600 << 16
+        return info
+
+    def _release(self, sheets: List[_SheetStream]) -> None:
+        for sheet in sheets:
+            sheet.sink.close()
+        self._closed = True
+
+    def __enter__(self) -> "PortfolioWorkbookWriter":
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        if exc_type is None:
+            self.close()
+        else:
+            # Nothing is written to the sink for a failed run
+            self._release([self._customers, *self._loan_sheets.values()])
+        return False
+
+
+def write_portfolio_workbook(statements: Iterable, sink, **options) -> Dict[str, dict]:
+    """
+    Write one workbook covering many statements.
+
+    Args:
+        statements: Statement request objects, consumed one at a time
+        sink: Writable binary file-like object
+        **options: Passed to PortfolioWorkbookWriter (flush_rows)
+
+    Returns:
+        dict: Totals by loan type, as shown on the summary sheet
+    """
+    with PortfolioWorkbookWriter(sink, **options) as writer:
+        for statement in statements:
+            writer.write_statement(statement)
+    return writer.summary
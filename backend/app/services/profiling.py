@@ -0,0 +1,206 @@
+# app/services/profiling.py
+"""
+Opt-in profiling of individual statement renders.
+
+Disabled unless STATEMENT_PROFILE_TOKEN or STATEMENT_PROFILE_SAMPLE_RATE is
+set, in which case ``profile_render`` returns a shared no-op context manager
+and nothing else runs.
+
+Environment:
+    STATEMENT_PROFILE_TOKEN: Admin token; requests sending it in the
+        X-Profile-Token header are always profiled
+    STATEMENT_PROFILE_SAMPLE_RATE: Fraction of requests to profile (0-1)
+    STATEMENT_PROFILE_MODE: "deterministic" (cProfile + stack samples, default)
+        or "sampling" (stack samples only, lower overhead)
+    STATEMENT_PROFILE_DIR: Where captures are written (default: ./profiles)
+
+Each capture is written to <dir>/<request fingerprint>/<timestamp>/ with:
+    request.json   the request, to reproduce it offline (admin token
+                   captures only; see below)
+    meta.json      wall time, tracemalloc peak, mode, request shape
+    stacks.folded  collapsed stacks for flamegraph.pl / speedscope
+    profile.pstats cProfile output (deterministic mode)
+
+Requests carry customer names, addresses, phones and e-mails, and captures
+have no retention limit, so randomly sampled captures keep only the
+fingerprint and the request's shape (format, customer and loan counts, loan
+types) in meta.json. The full request is saved only when an admin asked for
+the capture with the token, i.e. when someone deliberately profiles a
+request they need to reproduce.
+"""
+import cProfile
+import hashlib
+import hmac
+import json
+import logging
+import os
+import random
+import sys
+import threading
+import time
+import tracemalloc
+from collections import Counter
+from contextlib import nullcontext
+from datetime import datetime, timezone
+from typing import Optional
+from .utils import get_customers_from_statement
+
+logger = logging.getLogger(__name__)
+
+PROFILE_TOKEN = os.environ.get("STATEMENT_PROFILE_TOKEN") or None
+PROFILE_SAMPLE_RATE = float(os.environ.get("STATEMENT_PROFILE_SAMPLE_RATE", "0") or 0)
+PROFILE_MODE = os.environ.get("STATEMENT_PROFILE_MODE", "deterministic")
+PROFILE_DIR = os.environ.get("STATEMENT_PROFILE_DIR", "profiles")
+SAMPLE_INTERVAL_S = 0.001
+
+PROFILING_ENABLED = PROFILE_TOKEN is not None or PROFILE_SAMPLE_RATE > 0
+
+_DISABLED = nullcontext()
+
+
+def request_fingerprint(statement) -> str:
+    """Stable short hash of a request's content."""
+    payload = statement.model_dump_json().encode("utf-8")
+    return hashlib.sha256(payload).hexdigest()[:16]
+
+
+def capture_trigger(token: Optional[str]) -> Optional[str]:
+    """
+    Decide whether this request is captured, and why.
+
+    Returns:
+        str or None: "token" (admin token sent), "sample" (picked by the
+        sample rate) or None (not captured)
+    """
+    if token and PROFILE_TOKEN and hmac.compare_digest(token, PROFILE_TOKEN):
+        return "token"
+    if PROFILE_SAMPLE_RATE > 0 and random.random() < PROFILE_SAMPLE_RATE:
+        return "sample"
+    return None
+
+
+def profile_render(statement, token: Optional[str] = None, label: str = "render"):
+    """
+    Context manager wrapping a render pipeline with an optional profile capture.
+
+    Args:
+        statement: Request being rendered (fingerprinted; saved with token captures)
+        token: Value of the X-Profile-Token header, if any
+        label: Name of the endpoint or pipeline, stored in meta.json
+
+    Returns:
+        A context manager; a shared no-op one unless this request is profiled
+    """
+    if not PROFILING_ENABLED:
+        return _DISABLED
+    trigger = capture_trigger(token)
+    if trigger is None:
+        return _DISABLED
+    return ProfileCapture(statement, label, PROFILE_MODE, PROFILE_DIR, save_request=trigger == "token")
+
+
+class StackSampler:
+    """Samples one thread's Python stack at a fixed interval into collapsed-stack counts."""
+
+    def __init__(self, thread_id: int, interval: float = SAMPLE_INTERVAL_S):
+        self.thread_id = thread_id
+        self.interval = interval
+        self.counts: Counter = Counter()
+        self._stop = threading.Event()
+        self._thread = threading.Thread(target=self._run, name="stack-sampler", daemon=True)
+
+    def start(self) -> None:
+        self._thread.start()
+
+    def stop(self) -> None:
+        self._stop.set()
+        self._thread.join()
+
+    def _run(self) -> None:
+        while not self._stop.wait(self.interval):
+            frame = sys._current_frames().get(self.thread_id)
+            stack = []
+            while frame is not None:
+                code = frame.f_code
+                stack.append(f"{os.path.basename(code.co_filename)}:{code.co_name}")
+                frame = frame.f_back
+            if stack:
+                self.counts[";".join(reversed(stack))] += 1
+
+    def folded(self) -> str:
+        return "".join(f"{stack} {count}\n" for stack, count in self.counts.most_common())
+
+
+class ProfileCapture:
+    """
+    Runs the profilers around a block and writes the capture on exit.
+
+    ``save_request`` also writes the full request (with customer personal
+    data) as request.json; otherwise only its fingerprint and shape are kept.
+    """
+
+    def __init__(self, statement, label: str, mode: str, base_dir: str, save_request: bool = False):
+        self.statement = statement
+        self.save_request = save_request
+        self.label = label
+        self.mode = mode
+        self.base_dir = base_dir
+        self.profiler = cProfile.Profile() if mode == "deterministic" else None
+        self.sampler = StackSampler(threading.get_ident())
+        self.output_dir: Optional[str] = None
+
+    def __enter__(self):
+        self._owns_tracemalloc = not tracemalloc.is_tracing()
+        if self._owns_tracemalloc:
+            tracemalloc.start()
+        tracemalloc.reset_peak()
+        self._start_memory = tracemalloc.get_traced_memory()[0]
+        self.sampler.start()
+        self._start = time.perf_counter()
+        if self.profiler is not None:
+            self.profiler.enable()
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        if self.profiler is not None:
+            self.profiler.disable()
+        wall_ms = (time.perf_counter() - self._start) * 1000
+        self.sampler.stop()
+        _, peak = tracemalloc.get_traced_memory()
+        if self._owns_tracemalloc:
+            tracemalloc.stop()
+
+        try:
+            fingerprint = request_fingerprint(self.statement)
+            stamp = datetime.now(timezone.utc).strftime("%Y%m%dT%H%M%S%fZ")
+            self.output_dir = os.path.join(self.base_dir, fingerprint, stamp)
+            os.makedirs(self.output_dir, exist_ok=True)
+
+            meta = {
+                "fingerprint": fingerprint,
+                "label": self.label,
+                "mode": self.mode,
+                "captured_at": stamp,
+                "request_saved": self.save_request,
+                "statement_format": getattr(self.statement, "statement_format", None),
+                "customer_count": len(get_customers_from_statement(self.statement)),
+                "loan_count": len(self.statement.loans),
+                "loan_types": sorted({loan.loan_type for loan in self.statement.loans}),
+                "wall_ms": round(wall_ms, 3),
+                "tracemalloc_peak_bytes": peak - self._start_memory,
+                "stack_samples": sum(self.sampler.counts.values()),
+                "error": repr(exc) if exc is not None else None,
+            }
+            with open(os.path.join(self.output_dir, "meta.json"), "w") as f:
+                json.dump(meta, f, indent=2)
+            if self.save_request:
+                with open(os.path.join(self.output_dir, "request.json"), "w") as f:
+                    f.write(self.statement.model_dump_json(indent=2))
+            with open(os.path.join(self.output_dir, "stacks.folded"), "w") as f:
+                f.write(self.sampler.folded())
+            if self.profiler is not None:
+                self.profiler.dump_stats(os.path.join(self.output_dir, "profile.pstats"))
+        except OSError:
+            # A failed capture must never fail the request it was profiling
+            logger.exception("Could not write profile capture for %s", self.label)
+        return False
@@ -0,0 +1,335 @@
+# app/services/record_writer.py
+"""
+Bulk record files for the print vendor and the downstream ledger.
+
+Many statements are streamed into one file of typed records:
+
+    H  header   one per file
+    C  customer one per customer on a statement (joint statements have several)
+    L  loan     one per loan on a statement
+    T  trailer  one per file, with record counts and control totals
+
+Records are either fixed-width (every line RECORD_LENGTH characters, text
+left-aligned and space-padded, numbers right-aligned and zero-padded) or
+delimited ("|" by default, fields in the same order, quoted only when needed).
+In fixed-width records descriptive text (names, addresses, phone numbers,
+e-mails, loan types, the requested format) is truncated to fit; identifiers,
+dates and numbers that do not fit are rejected, since a shortened ID would
+silently break joins downstream.
+Amounts are integer cents, interest rates thousandths of a percent and dates
+YYYYMMDD. The record layouts are compiled once into format templates;
+records are buffered and written to the sink in batches.
+"""
+import csv
+import io
+from dataclasses import dataclass
+from datetime import datetime
+from functools import lru_cache
+from typing import Dict, Iterable, List, Optional, Tuple
+from .statement_builder import monthly_interest_amount
+from .utils import get_customers_from_statement, get_statement_date, parse_date
+
+RECORD_LAYOUT_VERSION = "0001"
+RECORD_LENGTH = 300
+# Records buffered before each write to the sink
+FLUSH_RECORDS = 4096
+
+
+@dataclass(frozen=True)
+class RecordLayout:
+    """
+    Field layout of one record type. Fields are (name, width, kind) with
+    kind "A" (text that must fit, e.g. identifiers), "D" (descriptive text,
+    truncated to fit) or "N" (integer); the record type code comes first.
+    """
+    record_type: str
+    fields: Tuple[Tuple[str, int, str], ...]
+
+    @property
+    def width(self) -> int:
+        return len(self.record_type) + sum(width for _, width, _ in self.fields)
+
+
+HEADER_RECORD = RecordLayout("H", (
+    ("file_id", 20, "A"),
+    ("created", 8, "A"),
+    ("layout_version", 4, "A"),
+))
+
+CUSTOMER_RECORD = RecordLayout("C", (
+    ("statement_seq", 9, "N"),
+    ("party_seq", 2, "N"),
+    ("customer_id", 20, "A"),
+    ("name", 40, "D"),
+    ("address", 80, "D"),
+    ("phone", 20, "D"),
+    ("email", 60, "D"),
+    ("billing_period_start", 8, "A"),
+    ("billing_period_end", 8, "A"),
+    ("statement_date", 8, "A"),
+    ("loan_count", 5, "N"),
+    ("statement_format", 4, "D"),
+))
+
+LOAN_RECORD = RecordLayout("L", (
+    ("statement_seq", 9, "N"),
+    ("loan_seq", 5, "N"),
+    ("loan_id", 20, "A"),
+    ("loan_type", 20, "D"),
+    ("principal", 13, "N"),
+    ("interest_rate", 7, "N"),
+    ("term_months", 4, "N"),
+    ("current_balance", 13, "N"),
+    ("monthly_payment", 11, "N"),
+    ("interest_amount", 11, "N"),
+    ("payment_due_date", 8, "A"),
+))
+
+TRAILER_RECORD = RecordLayout("T", (
+    ("record_count", 12, "N"),
+    ("statement_count", 9, "N"),
+    ("customer_count", 9, "N"),
+    ("loan_count", 9, "N"),
+    ("total_principal", 15, "N"),
+    ("total_current_balance", 15, "N"),
+    ("total_monthly_payment", 15, "N"),
+))
+
+RECORD_LAYOUTS = (HEADER_RECORD, CUSTOMER_RECORD, LOAN_RECORD, TRAILER_RECORD)
+RECORD_FORMATS = ("fixed", "delimited")
+
+# Control characters would break a record across lines
+_CONTROL_TO_SPACE = {code: " " for code in range(32)}
+
+
+def compile_fixed_layout(layout: RecordLayout, record_length: int = RECORD_LENGTH) -> str:
+    """
+    Compile a record layout into a ``%`` template producing one padded line
+    from a tuple of (record type, field values...).
+
+    Descriptive ("D") text is truncated to its width; other text and numbers
+    that overflow theirs make the line longer, which the writer rejects.
+    """
+    if layout.width > record_length:
+        raise ValueError(f"{layout.record_type} record is {layout.width} characters, over {record_length}")
+    parts = [f"%-{len(layout.record_type)}s"]
+    for _, width, kind in layout.fields:
+        if kind == "D":
+            parts.append(f"%-{width}.{width}s")
+        elif kind == "A":
+            parts.append(f"%-{width}s")
+        else:
+            parts.append(f"%0{width}d")
+    return "".join(parts) + " " * (record_length - layout.width) + "\n"
+
+
+def overflowing_fields(layout: RecordLayout, row: tuple) -> List[str]:
+    """Names of the fields of ``row`` (record type first) too wide for ``layout``."""
+    return [
+        name for (name, width, kind), value in zip(layout.fields, row[1:])
+        if kind != "D" and len(value if kind == "A" else str(value)) > width
+    ]
+
+
+def _text(value) -> str:
+    if not value:
+        return ""
+    value = str(value)
+    return value if value.isprintable() else value.translate(_CONTROL_TO_SPACE)
+
+
+@lru_cache(maxsize=4096)
+def _record_date(value) -> str:
+    """YYYYMMDD for a date string, or blanks if it cannot be parsed."""
+    parsed = parse_date(value) if value else None
+    return parsed.strftime("%Y%m%d") if parsed is not None else ""
+
+
+def _statement_record_date(statement) -> str:
+    """Statement date as YYYYMMDD, parsing each distinct request date once."""
+    requested = _record_date(getattr(statement, "statement_date", None))
+    return requested or get_statement_date(statement, "%Y%m%d")
+
+
+class RecordWriter:
+    """
+    Writes statements as records into a binary sink, incrementally.
+
+    Usage:
+        with RecordWriter(sink, "fixed", file_id="CYCLE202401") as writer:
+            for statement in statements:
+                writer.write_statement(statement)
+        totals = writer.totals
+
+    The trailer is written by ``close`` (or on leaving the ``with`` block);
+    the sink itself is left open.
+    """
+
+    def __init__(self, sink, record_format: str = "fixed", file_id: str = "",
+                 created: Optional[str] = None, delimiter: str = "|", encoding: str = "ascii",
+                 flush_records: int = FLUSH_RECORDS):
+        """
+        Args:
+            sink: Writable binary file-like object
+            record_format: "fixed" or "delimited"
+            file_id: Identifier written into the header
+            created: Creation date (YYYYMMDD) for the header; defaults to today
+            delimiter: Field separator for delimited records
+            encoding: Output encoding; characters it cannot represent become "?",
+                so ASCII keeps fixed-width byte positions stable
+            flush_records: Records buffered between writes to the sink
+        """
+        if record_format not in RECORD_FORMATS:
+            raise ValueError(f"Unsupported record format: {record_format}")
+        self.record_format = record_format
+        self._fixed = record_format == "fixed"
+        self._out = io.TextIOWrapper(sink, encoding=encoding, errors="replace", newline="", write_through=True)
+        self._flush_records = flush_records
+        self._pending = 0
+        self._closed = False
+
+        if self._fixed:
+            self._chunks: List[str] = []
+            self._layouts = {layout.record_type: layout for layout in RECORD_LAYOUTS}
+            self._templates = {layout.record_type: compile_fixed_layout(layout) for layout in RECORD_LAYOUTS}
+            self._line_length = RECORD_LENGTH + 1
+        else:
+            self._buffer = io.StringIO()
+            self._csv = csv.writer(self._buffer, delimiter=delimiter, lineterminator="\n")
+
+        self.totals: Dict[str, int] = {
+            "record_count": 0,
+            "statement_count": 0,
+            "customer_count": 0,
+            "loan_count": 0,
+            "total_principal": 0,
+            "total_current_balance": 0,
+            "total_monthly_payment": 0,
+        }
+        created = created or datetime.now().strftime("%Y%m%d")
+        self._write_rows([("H", _text(file_id), created, RECORD_LAYOUT_VERSION)])
+
+    def _write_rows(self, rows: List[tuple]) -> None:
+        """Buffer records; each row is (record type, field values...)."""
+        if self._fixed:
+            templates = self._templates
+            chunk = "".join([templates[row[0]] % row for row in rows])
+            if len(chunk) != self._line_length * len(rows):
+                row = next(row for row in rows if len(templates[row[0]] % row) != self._line_length)
+                fields = ", ".join(overflowing_fields(self._layouts[row[0]], row))
+                raise ValueError(f"Value too wide for {row[0]} record field(s) {fields}: {row}")
+            self._chunks.append(chunk)
+        else:
+            self._csv.writerows(rows)
+        self.totals["record_count"] += len(rows)
+        self._pending += len(rows)
+        if self._pending >= self._flush_records:
+            self.flush()
+
+    def flush(self) -> None:
+        """Write buffered records to the sink."""
+        if self._fixed:
+            self._out.write("".join(self._chunks))
+            self._chunks.clear()
+        else:
+            self._out.write(self._buffer.getvalue())
+            self._buffer.seek(0)
+            self._buffer.truncate()
+        self._pending = 0
+
+    def write_statement(self, statement) -> None:
+        """Append the customer and loan records of one statement."""
+        customers = get_customers_from_statement(statement)
+        totals = self.totals
+        statement_seq = totals["statement_count"] + 1
+
+        billing_start = _record_date(statement.billing_period_start)
+        billing_end = _record_date(statement.billing_period_end)
+        statement_date = _statement_record_date(statement)
+        loans = statement.loans
+        loan_count = len(loans)
+        statement_format = getattr(statement, "statement_format", "") or ""
+
+        rows = [
+            ("C", statement_seq, party_seq, _text(customer.customer_id), _text(customer.name),
+             _text(customer.address), _text(customer.phone), _text(customer.email),
+             billing_start, billing_end, statement_date, loan_count, statement_format)
+            for party_seq, customer in enumerate(customers, 1)
+        ]
+
+        principal_total = balance_total = payment_total = 0
+        for loan_seq, loan in enumerate(loans, 1):
+            principal = round(loan.principal * 100)
+            current_balance = round(loan.current_balance * 100)
+            monthly_payment = round(loan.monthly_payment * 100)
+            rows.append((
+                "L", statement_seq, loan_seq, _text(loan.loan_id), _text(loan.loan_type),
+                principal, round(loan.interest_rate * 1000), loan.term_months,
+                current_balance, monthly_payment, round(monthly_interest_amount(loan) * 100),
+                _record_date(loan.payment_due_date),
+            ))
+            principal_total += principal
+            balance_total += current_balance
+            payment_total += monthly_payment
+        self._write_rows(rows)
+
+        # Counted only once written, so a rejected statement leaves the totals alone
+        totals["statement_count"] = statement_seq
+        totals["customer_count"] += len(customers)
+        totals["loan_count"] += loan_count
+        totals["total_principal"] += principal_total
+        totals["total_current_balance"] += balance_total
+        totals["total_monthly_payment"] += payment_total
+
+    def close(self) -> Dict[str, int]:
+        """
+        Write the trailer, flush, and release the sink (without closing it).
+
+        Returns:
+            dict: Control totals, as written in the trailer
+        """
+        if self._closed:
+            return self.totals
+        totals = self.totals
+        # The trailer counts every record in the file, itself included
+        self._write_rows([(
+            "T", totals["record_count"] + 1, totals["statement_count"], totals["customer_count"],
+            totals["loan_count"], totals["total_principal"], totals["total_current_balance"],
+            totals["total_monthly_payment"],
+        )])
+        self.flush()
+        self._out.detach()
+        self._closed = True
+        return totals
+
+    def __enter__(self) -> "RecordWriter":
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        if exc_type is None:
+            self.close()
+        else:
+            # Leave no trailer on a partial file, so it fails control checks
+            self.flush()
+            self._out.detach()
+            self._closed = True
+        return False
+
+
+def write_records(statements: Iterable, sink, record_format: str = "fixed", **options) -> Dict[str, int]:
+    """
+    Write header, customer, loan and trailer records for many statements.
+
+    Args:
+        statements: Statement request objects, consumed one at a time
+        sink: Writable binary file-like object
+        record_format: "fixed" or "delimited"
+        **options: Passed to RecordWriter (file_id, created, delimiter, ...)
+
+    Returns:
+        dict: Control totals written in the trailer
+    """
+    with RecordWriter(sink, record_format, **options) as writer:
+        for statement in statements:
+            writer.write_statement(statement)
+    return writer.totals
@@ -1,4 +1,32 @@
-from app.models.statement_models import StatementRequest
+from typing import Dict, Iterable
+from app.models.statement_models import Loan, StatementRequest
+from app.services.utils import get_statement_type_config
+
+
+def monthly_interest_amount(loan: Loan) -> float:
+    """
+    Interest accrued on the current balance over one month, rounded to cents.
+    """
+    monthly_interest = (loan.interest_rate / 100) / 12
+    return round(loan.current_balance * monthly_interest, 2)
+
+
+def enrich_loan(loan: Loan) -> dict:
+    """
+    Compute the derived figures for a single loan.
+    """
+    return {
+        "loan_id": loan.loan_id,
+        "loan_type": loan.loan_type,
+        "principal": loan.principal,
+        "interest_rate": loan.interest_rate,
+        "term_months": loan.term_months,
+        "current_balance": loan.current_balance,
+        "payment_due_date": loan.payment_due_date,
+        "monthly_payment": loan.monthly_payment,
+        "interest_amount": monthly_interest_amount(loan)
+    }
+
 
 def build_statement_data(request: StatementRequest):
     """
@@ -6,21 +34,7 @@ def build_statement_data(request: StatementRequest):
     to the PDF/Excel/TXT generators.
     """
 
-    enriched_loans = []
-    for loan in request.loans:
-        monthly_interest = (loan.interest_rate / 100) / 12
-        interest_amount = loan.current_balance * monthly_interest
-
-        enriched_loans.append({
-            "loan_id": loan.loan_id,
-            "loan_type": loan.loan_type,
-            "principal": loan.principal,
-            "interest_rate": loan.interest_rate,
-            "term_months": loan.term_months,
-            "current_balance": loan.current_balance,
-            "payment_due_date": loan.payment_due_date,
-            "interest_amount": round(interest_amount, 2)
-        })
+    enriched_loans = [enrich_loan(loan) for loan in request.loans]
 
     return {
         "customer": {
@@ -33,4 +47,78 @@ def build_statement_data(request: StatementRequest):
         "billing_period_start": request.billing_period_start,
         "billing_period_end": request.billing_period_end,
         "loans": enriched_loans
-    }
\ No newline at end of file
+    }
+
+def loan_type_group(loan_type: str) -> str:
+    """
+    Reporting group of a loan type: its display name, so synonyms such as
+    "car" and "auto" are totalled together.
+    """
+    return get_statement_type_config(loan_type)["display_name"]
+
+
+def add_loan_to_summary(summary: Dict[str, dict], loan: Loan) -> str:
+    """
+    Add one loan to running per-loan-type totals.
+
+    Args:
+        summary: Totals keyed by loan type group, updated in place
+        loan: Loan to add
+
+    Returns:
+        str: The loan type group the loan was counted under
+    """
+    group = loan_type_group(loan.loan_type)
+    totals = summary.get(group)
+    if totals is None:
+        totals = summary[group] = {
+            "loan_count": 0,
+            "principal": 0.0,
+            "current_balance": 0.0,
+            "monthly_payment": 0.0,
+            "interest_amount": 0.0,
+            "balance_weighted_rate": 0.0,
+        }
+    totals["loan_count"] += 1
+    totals["principal"] += loan.principal
+    totals["current_balance"] += loan.current_balance
+    totals["monthly_payment"] += loan.monthly_payment
+    totals["interest_amount"] += monthly_interest_amount(loan)
+    totals["balance_weighted_rate"] += loan.current_balance * loan.interest_rate
+    return group
+
+
+def finish_loan_type_summary(summary: Dict[str, dict]) -> Dict[str, dict]:
+    """
+    Round running totals to cents and derive the balance-weighted average
+    interest rate of each loan type. Groups come back sorted by name.
+    """
+    finished = {}
+    for group in sorted(summary):
+        totals = summary[group]
+        balance = totals["current_balance"]
+        finished[group] = {
+            "loan_count": totals["loan_count"],
+            "principal": round(totals["principal"], 2),
+            "current_balance": round(balance, 2),
+            "monthly_payment": round(totals["monthly_payment"], 2),
+            "interest_amount": round(totals["interest_amount"], 2),
+            "average_interest_rate": round(totals["balance_weighted_rate"] / balance, 3) if balance else 0.0,
+        }
+    return finished
+
+
+def summarize_by_loan_type(statements: Iterable) -> Dict[str, dict]:
+    """
+    Portfolio totals by loan type across many statements.
+
+    Returns:
+        dict: Per loan type group, the loan count, principal, current balance,
+        monthly payment and monthly interest totals and the balance-weighted
+        average interest rate
+    """
+    summary: Dict[str, dict] = {}
+    for statement in statements:
+        for loan in statement.loans:
+            add_loan_to_summary(summary, loan)
+    return finish_loan_type_summary(summary)
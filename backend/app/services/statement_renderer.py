@@ -0,0 +1,35 @@
+# app/services/statement_renderer.py
+from typing import Tuple
+from .excel_generator import generate_excel
+from .pdf_parallel import generate_pdf_parallel
+from .text_generator import generate_text
+
+# statement_format -> (renderer, file extension, media type)
+FORMAT_RENDERERS = {
+    "pdf": (generate_pdf_parallel, "pdf", "application/pdf"),
+    "xlsx": (generate_excel, "xlsx", "application/vnd.openxmlformats-officedocument.spreadsheetml.sheet"),
+    "txt": (generate_text, "txt", "text/plain"),
+}
+
+
+def render_statement(statement, sink) -> Tuple[str, str]:
+    """
+    Render a statement in its requested format into a writable sink.
+
+    Args:
+        statement: Statement request object
+        sink: Writable binary file-like object (see output_sink.open_sink)
+
+    Returns:
+        tuple: (file extension, media type)
+
+    Raises:
+        ValueError: If the statement format is not supported
+    """
+    try:
+        renderer, extension, media_type = FORMAT_RENDERERS[statement.statement_format]
+    except KeyError:
+        raise ValueError(f"Unsupported statement format: {statement.statement_format}")
+
+    renderer(statement, sink=sink)
+    return extension, media_type
@@ -0,0 +1,194 @@
+# app/services/svg_preview.py
+import hashlib
+from collections import OrderedDict
+from html import escape
+from threading import Lock
+from typing import List, Tuple
+from reportlab.lib.pagesizes import letter
+from .pdf_generator import _draw_loan_schedule, _draw_summary, schedule_page_count, schedule_totals
+from .utils import get_statement_date
+
+# Loan schedule pages included in a preview; the full document may have hundreds
+PREVIEW_MAX_SCHEDULE_PAGES = 2
+# Number of rendered previews kept in memory
+PREVIEW_CACHE_SIZE = 256
+
+_FONT_FAMILY = "Helvetica, Arial, sans-serif"
+
+
+def _rgb_css(rgb: Tuple[float, float, float]) -> str:
+    r, g, b = (round(channel * 255) for channel in rgb)
+    return f"rgb({r},{g},{b})"
+
+
+class SvgCanvas:
+    """
+    Minimal stand-in for ``reportlab.pdfgen.canvas.Canvas`` that records
+    drawing calls as SVG, one ``<svg>`` element per page.
+
+    Supports the subset of the canvas API used by the statement layouts in
+    pdf_generator, so a preview is drawn by exactly the same layout code as
+    the PDF. Coordinates use PDF points with the origin at the bottom left.
+    """
+
+    def __init__(self, pagesize=letter):
+        self.width, self.height = pagesize
+        self.pages: List[List[str]] = [[]]
+        self._font = ("Helvetica", 12)
+        self._fill = (0.0, 0.0, 0.0)
+        self._stroke = (0.0, 0.0, 0.0)
+        self._line_width = 1.0
+
+    # -- state ---------------------------------------------------------
+    def setFont(self, name: str, size: float) -> None:
+        self._font = (name, size)
+
+    def setFillColorRGB(self, r: float, g: float, b: float) -> None:
+        self._fill = (r, g, b)
+
+    def setFillColor(self, color) -> None:
+        self._fill = tuple(color.rgb())
+
+    def setStrokeColor(self, color) -> None:
+        self._stroke = tuple(color.rgb())
+
+    def setLineWidth(self, width: float) -> None:
+        self._line_width = width
+
+    # -- pages ---------------------------------------------------------
+    def showPage(self) -> None:
+        self.pages.append([])
+        # A new PDF page starts with default graphics state
+        self._fill = self._stroke = (0.0, 0.0, 0.0)
+        self._line_width = 1.0
+
+    def getPageNumber(self) -> int:
+        return len(self.pages)
+
+    def bookmarkPage(self, key: str) -> None:
+        pass
+
+    def bookmarkHorizontal(self, key: str, x: float, y: float) -> None:
+        pass
+
+    def addOutlineEntry(self, title: str, key: str, level: int = 0, closed=None) -> None:
+        pass
+
+    # -- drawing -------------------------------------------------------
+    def _text(self, x: float, y: float, text: str, anchor: str) -> None:
+        name, size = self._font
+        weight = ' font-weight="bold"' if "Bold" in name else ""
+        style = ' font-style="italic"' if "Oblique" in name else ""
+        self.pages[-1].append(
+            f'<text x="{x:.2f}" y="{self.height - y:.2f}" font-family="{_FONT_FAMILY}" '
+            f'font-size="{size}"{weight}{style} fill="{_rgb_css(self._fill)}" '
+            f'text-anchor="{anchor}" xml:space="preserve">{escape(text)}</text>'
+        )
+
+    def drawString(self, x: float, y: float, text: str) -> None:
+        self._text(x, y, text, "start")
+
+    def drawRightString(self, x: float, y: float, text: str) -> None:
+        self._text(x, y, text, "end")
+
+    def line(self, x1: float, y1: float, x2: float, y2: float) -> None:
+        self.pages[-1].append(
+            f'<line x1="{x1:.2f}" y1="{self.height - y1:.2f}" x2="{x2:.2f}" y2="{self.height - y2:.2f}" '
+            f'stroke="{_rgb_css(self._stroke)}" stroke-width="{self._line_width}"/>'
+        )
+
+    def roundRect(self, x: float, y: float, width: float, height: float, radius: float,
+                  stroke: int = 1, fill: int = 0) -> None:
+        fill_css = _rgb_css(self._fill) if fill else "none"
+        stroke_css = _rgb_css(self._stroke) if stroke else "none"
+        self.pages[-1].append(
+            f'<rect x="{x:.2f}" y="{self.height - y - height:.2f}" width="{width:.2f}" height="{height:.2f}" '
+            f'rx="{radius}" fill="{fill_css}" stroke="{stroke_css}"/>'
+        )
+
+    # -- output --------------------------------------------------------
+    def to_svg_pages(self) -> List[str]:
+        return [
+            f'<svg xmlns="http://www.w3.org/2000/svg" viewBox="0 0 {self.width:g} {self.height:g}" '
+            f'width="{self.width:g}" height="{self.height:g}" class="statement-page">'
+            f'<rect width="100%" height="100%" fill="white"/>{"".join(elements)}</svg>'
+            for elements in self.pages
+        ]
+
+
+def render_preview_html(statement) -> str:
+    """
+    Render an HTML preview of the PDF statement layout.
+
+    Draws the summary page(s) and the first loan schedule pages with the
+    same layout functions ``generate_pdf`` uses, as inline SVG.
+
+    Args:
+        statement: Statement request object
+
+    Returns:
+        str: Self-contained HTML document
+    """
+    if not statement.loans:
+        raise ValueError("No loan data available for statement generation")
+
+    c = SvgCanvas()
+    _draw_summary(c, statement)
+
+    schedule_pages = schedule_page_count(statement)
+    shown_pages = min(schedule_pages, PREVIEW_MAX_SCHEDULE_PAGES)
+    if shown_pages:
+        c.showPage()
+        _draw_loan_schedule(c, statement, 0, shown_pages, schedule_totals(statement), outline=False)
+
+    note = ""
+    if shown_pages < schedule_pages:
+        note = (f'<p class="preview-note">Preview shows {shown_pages} of {schedule_pages} '
+                f'loan schedule pages.</p>')
+
+    return (
+        '<!DOCTYPE html><html><head><meta charset="utf-8"><title>Statement preview</title>'
+        '<style>body{margin:0;padding:16px;background:#e9ecef;font-family:sans-serif}'
+        '.statement-page{display:block;margin:0 auto 16px;max-width:100%;height:auto;'
+        'box-shadow:0 2px 8px rgba(0,0,0,.15)}.preview-note{text-align:center;color:#6c757d}</style>'
+        f'</head><body>{"".join(c.to_svg_pages())}{note}</body></html>'
+    )
+
+
+def preview_cache_key(statement) -> str:
+    """
+    Hash of everything that affects the preview.
+
+    The output format is excluded: the preview always shows the PDF layout.
+    The resolved statement date is included, so a preview dated "today"
+    is not served after midnight.
+    """
+    payload = statement.model_dump_json(exclude={"statement_format"}) + get_statement_date(statement)
+    return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+
+_cache: "OrderedDict[str, str]" = OrderedDict()
+_cache_lock = Lock()
+
+
+def get_preview_html(statement) -> Tuple[str, str]:
+    """
+    Return the preview HTML for a statement, from cache when possible.
+
+    Returns:
+        tuple: (HTML document, cache key usable as an ETag)
+    """
+    key = preview_cache_key(statement)
+    with _cache_lock:
+        html = _cache.get(key)
+        if html is not None:
+            _cache.move_to_end(key)
+            return html, key
+
+    html = render_preview_html(statement)
+    with _cache_lock:
+        _cache[key] = html
+        _cache.move_to_end(key)
+        while len(_cache) > PREVIEW_CACHE_SIZE:
+            _cache.popitem(last=False)
+    return html, key
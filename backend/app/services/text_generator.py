@@ -1,21 +1,42 @@
-def generate_text(statement):
-    lines = [
-        "LOAN STATEMENT",
-        "",
-        f"Customer: {statement.customer_name}",
-        f"Customer ID: {statement.customer_id}",
-        f"Billing Period: {statement.billing_period_start} - {statement.billing_period_end}",
-        ""
-    ]
+from .utils import get_customers_from_statement, get_statement_date
+
+
+def _statement_lines(statement):
+    customers = get_customers_from_statement(statement)
+    primary_customer = customers[0]
+
+    yield "LOAN STATEMENT"
+    yield ""
+    yield f"Customer: {', '.join(cust.name for cust in customers)}"
+    yield f"Customer ID: {primary_customer.customer_id}"
+    yield f"Billing Period: {statement.billing_period_start} - {statement.billing_period_end}"
+    yield f"Statement Date: {get_statement_date(statement)}"
+    yield ""
 
     for loan in statement.loans:
-        lines += [
-            f"Loan Type: {loan.loan_type}",
-            f"  Principal: {loan.principal}",
-            f"  Interest Rate: {loan.interest_rate}%",
-            f"  Current Balance: {loan.current_balance}",
-            f"  Payment Due: {loan.payment_due_date}",
-            ""
-        ]
-
-    return "\n".join(lines)
\ No newline at end of file
+        yield f"Loan Type: {loan.loan_type}"
+        yield f"  Principal: {loan.principal}"
+        yield f"  Interest Rate: {loan.interest_rate}%"
+        yield f"  Current Balance: {loan.current_balance}"
+        yield f"  Payment Due: {loan.payment_due_date}"
+        yield ""
+
+
+def generate_text(statement, sink=None):
+    """
+    Generate a plain-text statement.
+
+    With a ``sink`` (writable binary file-like object) lines are encoded and
+    written one at a time and None is returned; otherwise the text is
+    returned as a string.
+    """
+    if sink is None:
+        return "\n".join(_statement_lines(statement))
+
+    first = True
+    for line in _statement_lines(statement):
+        if not first:
+            sink.write(b"\n")
+        sink.write(line.encode("utf-8"))
+        first = False
+    return None
@@ -0,0 +1,193 @@
+# app/services/text_metrics.py
+from functools import lru_cache
+from typing import Dict, Iterable, List
+from reportlab.pdfbase import pdfmetrics
+
+# Glyph widths are stored in 1/1000 em units, the same units ReportLab's
+# AFM tables use, so a measurement is sum(widths) * font_size / 1000.
+_UNITS_PER_EM = 1000.0
+
+# Characters measured up front for every font table (Latin-1 printable range).
+_PRELOADED_CHARS = "".join(chr(code) for code in range(32, 256) if code not in range(127, 160))
+
+
+@lru_cache(maxsize=None)
+def get_glyph_widths(font_name: str) -> Dict[str, float]:
+    """
+    Return the cached glyph-width table for a font.
+
+    The table is built once per font and extended lazily when a character
+    outside the preloaded range is measured.
+
+    Args:
+        font_name: Registered ReportLab font name (e.g. "Helvetica-Bold")
+
+    Returns:
+        dict: Mapping of character -> width in 1/1000 em units
+    """
+    return {
+        char: pdfmetrics.stringWidth(char, font_name, _UNITS_PER_EM)
+        for char in _PRELOADED_CHARS
+    }
+
+
+def _glyph_width(table: Dict[str, float], char: str, font_name: str) -> float:
+    """Look up a glyph width, measuring and caching it on a miss."""
+    width = table.get(char)
+    if width is None:
+        width = pdfmetrics.stringWidth(char, font_name, _UNITS_PER_EM)
+        table[char] = width
+    return width
+
+
+def measure_text(text: str, font_name: str, font_size: float) -> float:
+    """
+    Measure the rendered width of a string using the cached glyph table.
+
+    Args:
+        text: Text to measure
+        font_name: Registered ReportLab font name
+        font_size: Font size in points
+
+    Returns:
+        float: Width in points
+    """
+    table = get_glyph_widths(font_name)
+    total = 0.0
+    for char in text:
+        width = table.get(char)
+        if width is None:
+            width = _glyph_width(table, char, font_name)
+        total += width
+    return total * font_size / _UNITS_PER_EM
+
+
+def measure_many(texts: Iterable[str], font_name: str, font_size: float) -> List[float]:
+    """
+    Measure many strings at once with a single table lookup.
+
+    Repeated strings in the batch are only measured once.
+
+    Args:
+        texts: Strings to measure
+        font_name: Registered ReportLab font name
+        font_size: Font size in points
+
+    Returns:
+        list: Widths in points, in the same order as ``texts``
+    """
+    table = get_glyph_widths(font_name)
+    scale = font_size / _UNITS_PER_EM
+    seen: Dict[str, float] = {}
+    widths = []
+    for text in texts:
+        width = seen.get(text)
+        if width is None:
+            width = sum(
+                table[char] if char in table else _glyph_width(table, char, font_name)
+                for char in text
+            ) * scale
+            seen[text] = width
+        widths.append(width)
+    return widths
+
+
+def fit_text(text: str, font_name: str, font_size: float, max_width: float, suffix: str = "...") -> str:
+    """
+    Truncate text so that it fits within a rendered width.
+
+    Width-aware counterpart of ``truncate_text``.
+
+    Args:
+        text: Text to fit
+        font_name: Registered ReportLab font name
+        font_size: Font size in points
+        max_width: Available width in points
+        suffix: Suffix to add when truncated
+
+    Returns:
+        str: Original text if it fits, otherwise the longest prefix plus suffix that fits
+    """
+    if measure_text(text, font_name, font_size) <= max_width:
+        return text
+
+    table = get_glyph_widths(font_name)
+    scale = font_size / _UNITS_PER_EM
+    available = max_width - measure_text(suffix, font_name, font_size)
+    used = 0.0
+    end = 0
+    for char in text:
+        width = _glyph_width(table, char, font_name) * scale
+        if used + width > available:
+            break
+        used += width
+        end += 1
+    return text[:end].rstrip() + suffix
+
+
+def wrap_text(text: str, font_name: str, font_size: float, max_width: float) -> List[str]:
+    """
+    Break text into lines that fit within a rendered width.
+
+    Lines break on spaces; a single word wider than the line is split
+    at the character that would overflow.
+
+    Args:
+        text: Text to wrap
+        font_name: Registered ReportLab font name
+        font_size: Font size in points
+        max_width: Available width in points
+
+    Returns:
+        list: Wrapped lines (at least one, possibly empty)
+    """
+    words = text.split()
+    if not words:
+        return [""]
+
+    space_width = measure_text(" ", font_name, font_size)
+    word_widths = measure_many(words, font_name, font_size)
+
+    lines: List[str] = []
+    current: List[str] = []
+    current_width = 0.0
+    for word, word_width in zip(words, word_widths):
+        if word_width > max_width:
+            # Flush what we have, then hard-split the long word
+            if current:
+                lines.append(" ".join(current))
+                current, current_width = [], 0.0
+            pieces = _split_word(word, font_name, font_size, max_width)
+            lines.extend(pieces[:-1])
+            current = [pieces[-1]]
+            current_width = measure_text(pieces[-1], font_name, font_size)
+            continue
+
+        needed = word_width if not current else current_width + space_width + word_width
+        if needed <= max_width:
+            current.append(word)
+            current_width = needed
+        else:
+            lines.append(" ".join(current))
+            current, current_width = [word], word_width
+
+    if current:
+        lines.append(" ".join(current))
+    return lines
+
+
+def _split_word(word: str, font_name: str, font_size: float, max_width: float) -> List[str]:
+    """Split a single word into chunks no wider than max_width."""
+    table = get_glyph_widths(font_name)
+    scale = font_size / _UNITS_PER_EM
+    pieces = []
+    start = 0
+    used = 0.0
+    for index, char in enumerate(word):
+        width = _glyph_width(table, char, font_name) * scale
+        if used + width > max_width and index > start:
+            pieces.append(word[start:index])
+            start, used = index, 0.0
+        used += width
+    pieces.append(word[start:])
+    return pieces
@@ -1,5 +1,5 @@
 # app/services/utils.py
-from typing import Tuple, Dict, Any
+from typing import Tuple, Dict, Any, Optional
 from datetime import datetime
 
 
@@ -56,27 +56,40 @@ def format_date(date_string: str, format_style: str = "long") -> str:
     if not date_string:
         return "Not specified"
     
+    date_obj = parse_date(date_string)
+    if date_obj is None:
+        return str(date_string)  # Fallback to original if parsing fails
+    
+    if format_style == "long":
+        return date_obj.strftime("%B %d, %Y")  # January 15, 2024
+    elif format_style == "short":
+        return date_obj.strftime("%b %d, %Y")   # Jan 15, 2024
+    elif format_style == "numeric":
+        return date_obj.strftime("%m/%d/%Y")    # 01/15/2024
+    elif format_style == "month_year":
+        return date_obj.strftime("%B %Y")       # January 2024
+    else:
+        return date_obj.strftime("%B %d, %Y")   # Default to long
+
+def parse_date(date_string: str) -> Optional[datetime]:
+    """
+    Parse a date string in any of the common formats accepted by the API.
+    
+    Args:
+        date_string: Date string such as "2024-01-15" or "01/15/2024"
+        
+    Returns:
+        datetime or None: Parsed date, or None if no format matched
+    """
     date_formats_to_try = ["%Y-%m-%d", "%m/%d/%Y", "%d/%m/%Y", "%Y/%m/%d", "%B %d, %Y", "%b %d, %Y"]
     
     for date_format in date_formats_to_try:
         try:
-            date_obj = datetime.strptime(str(date_string).strip(), date_format)
-            
-            if format_style == "long":
-                return date_obj.strftime("%B %d, %Y")  # January 15, 2024
-            elif format_style == "short":
-                return date_obj.strftime("%b %d, %Y")   # Jan 15, 2024
-            elif format_style == "numeric":
-                return date_obj.strftime("%m/%d/%Y")    # 01/15/2024
-            elif format_style == "month_year":
-                return date_obj.strftime("%B %Y")       # January 2024
-            else:
-                return date_obj.strftime("%B %d, %Y")   # Default to long
-                
+            return datetime.strptime(str(date_string).strip(), date_format)
         except ValueError:
             continue
     
-    return str(date_string)  # Fallback to original if parsing fails
+    return None
 
 # For backward compatibility
 def format_payment_due_date(date_string: str) -> str:
@@ -269,6 +282,55 @@ def get_current_date(format_str: str = "%m/%d/%Y") -> str:
     return datetime.now().strftime(format_str)
 
 
+def is_deterministic(statement) -> bool:
+    """Whether the statement asks for byte-reproducible output."""
+    return bool(getattr(statement, "deterministic", False))
+
+
+def get_statement_datetime(statement) -> datetime:
+    """
+    Resolve the date a statement is issued on.
+    
+    Uses the request's ``statement_date`` when given. In deterministic mode
+    without one, falls back to the cycle date (``billing_period_end``) so no
+    wall-clock time leaks into the output. Otherwise uses today.
+    
+    Args:
+        statement: Statement request object
+        
+    Returns:
+        datetime: Statement date (midnight for request-supplied dates)
+    """
+    candidates = [getattr(statement, "statement_date", None)]
+    if is_deterministic(statement):
+        candidates.append(getattr(statement, "billing_period_end", None))
+    
+    for candidate in candidates:
+        if candidate:
+            parsed = parse_date(candidate)
+            if parsed is not None:
+                return parsed
+    
+    if is_deterministic(statement):
+        # Unparseable cycle date: a fixed epoch still keeps output reproducible
+        return datetime(2000, 1, 1)
+    return datetime.now()
+
+
+def get_statement_date(statement, format_str: str = "%m/%d/%Y") -> str:
+    """
+    Get the statement date formatted as string.
+    
+    Args:
+        statement: Statement request object
+        format_str: Date format string
+        
+    Returns:
+        str: Formatted statement date
+    """
+    return get_statement_datetime(statement).strftime(format_str)
+
+
 def debug_draw_bounds(canvas_obj, x: float, y: float, width: float, height: float, color: Tuple[float, float, float] = (1, 0, 0)):
     """
     Draw a colored rectangle for debugging layout boundaries.
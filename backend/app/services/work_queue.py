@@ -0,0 +1,470 @@
+# app/services/work_queue.py
+"""
+Shared-filesystem work queue for distributed cycle runs.
+
+A coordinator splits a portfolio of statements into shards and publishes
+them into a queue directory that every node can see (local disk or NFS).
+Workers on any node claim shards through lease files, keep the lease alive
+with heartbeats, render the shard with the regular generators and publish
+the results atomically. Leases whose heartbeat stops (dead worker) expire
+and are reclaimed by other workers. No broker is involved: every state
+change is a create-exclusive, rename or mtime update, all of which are
+atomic on POSIX filesystems and NFSv3+.
+
+Layout of a queue directory:
+    manifest.json                 run description written by the coordinator
+    shards/shard-000001.json      statements in the shard (immutable)
+    leases/shard-000001.lease     present while a worker owns the shard
+    results/shard-000001/         rendered files + manifest.json, once done
+    tmp/                          staging area for atomic publishes
+"""
+import json
+import os
+import shutil
+import socket
+import threading
+import time
+import uuid
+from dataclasses import dataclass
+from typing import Callable, Dict, Iterable, List, Optional
+from app.models.statement_models import StatementRequest
+from .statement_renderer import render_statement
+from .utils import get_customers_from_statement
+
+DEFAULT_LEASE_TTL = 60.0
+DEFAULT_POLL_INTERVAL = 2.0
+
+
+def _atomic_write(path: str, data: str, tmp_dir: str) -> None:
+    """Write a file so readers see either nothing or the complete content."""
+    tmp_path = os.path.join(tmp_dir, f"{os.path.basename(path)}.{uuid.uuid4().hex}")
+    with open(tmp_path, "w") as f:
+        f.write(data)
+        f.flush()
+        os.fsync(f.fileno())
+    os.rename(tmp_path, path)
+
+
+def default_worker_id() -> str:
+    return f"{socket.gethostname()}-{os.getpid()}"
+
+
+@dataclass
+class ShardStatus:
+    shard_id: str
+    state: str  # "pending", "leased", "expired" or "done"
+    owner: Optional[str] = None
+
+
+def _lease_owner(path: str) -> Optional[str]:
+    """worker_id recorded in a lease file, or None if it is missing or unreadable."""
+    try:
+        with open(path) as f:
+            return json.load(f).get("worker_id")
+    except (FileNotFoundError, ValueError):
+        return None
+
+
+class Lease:
+    """
+    Ownership of one shard, kept alive by a heartbeat thread that touches
+    the lease file. ``lost`` is set if another worker reclaimed it.
+    """
+
+    def __init__(self, queue: "WorkQueue", shard_id: str, worker_id: str):
+        self.queue = queue
+        self.shard_id = shard_id
+        self.worker_id = worker_id
+        self.path = queue.lease_path(shard_id)
+        self.lost = threading.Event()
+        self._stop = threading.Event()
+        self._thread = threading.Thread(target=self._heartbeat, name=f"lease-{shard_id}", daemon=True)
+
+    def start(self) -> None:
+        self._thread.start()
+
+    def _heartbeat(self) -> None:
+        interval = max(self.queue.lease_ttl / 3, 0.05)
+        while not self._stop.wait(interval):
+            if not self._still_ours():
+                self.lost.set()
+                return
+            try:
+                os.utime(self.path)
+            except FileNotFoundError:
+                self.lost.set()
+                return
+
+    def _still_ours(self) -> bool:
+        return _lease_owner(self.path) == self.worker_id
+
+    def release(self) -> None:
+        """
+        Stop heartbeating and remove the lease if this worker still owns it.
+
+        The lease is moved aside before its owner is checked, so a lease
+        another worker created in the meantime is never deleted; it is put
+        back instead.
+        """
+        self._stop.set()
+        self._thread.join()
+        detached = self.queue.detach_lease(self.path)
+        if detached is None:
+            return
+        if _lease_owner(detached) == self.worker_id:
+            os.unlink(detached)
+        else:
+            self.queue.restore_lease(detached, self.path)
+
+
+class WorkQueue:
+    """A queue directory shared by a coordinator and any number of workers."""
+
+    def __init__(self, root: str, lease_ttl: float = DEFAULT_LEASE_TTL):
+        self.root = root
+        self.lease_ttl = lease_ttl
+        self.shards_dir = os.path.join(root, "shards")
+        self.leases_dir = os.path.join(root, "leases")
+        self.results_dir = os.path.join(root, "results")
+        self.tmp_dir = os.path.join(root, "tmp")
+
+    def ensure_dirs(self) -> None:
+        for path in (self.shards_dir, self.leases_dir, self.results_dir, self.tmp_dir):
+            os.makedirs(path, exist_ok=True)
+
+    # -- paths ---------------------------------------------------------
+    def shard_path(self, shard_id: str) -> str:
+        return os.path.join(self.shards_dir, f"{shard_id}.json")
+
+    def lease_path(self, shard_id: str) -> str:
+        return os.path.join(self.leases_dir, f"{shard_id}.lease")
+
+    def result_path(self, shard_id: str) -> str:
+        return os.path.join(self.results_dir, shard_id)
+
+    # -- coordinator ---------------------------------------------------
+    def publish(self, statements: List[dict], shard_size: int, run_id: Optional[str] = None) -> List[str]:
+        """
+        Split statements into shards and publish them.
+
+        Args:
+            statements: Statement payloads (StatementRequest-shaped dicts)
+            shard_size: Statements per shard
+            run_id: Identifier stored in the manifest
+
+        Returns:
+            list: Published shard ids
+        """
+        if shard_size < 1:
+            raise ValueError("shard_size must be at least 1")
+        self.ensure_dirs()
+
+        shard_ids = []
+        for number, start in enumerate(range(0, len(statements), shard_size), 1):
+            shard_id = f"shard-{number:06d}"
+            shard = {"shard_id": shard_id, "first_index": start,
+                     "statements": statements[start:start + shard_size]}
+            _atomic_write(self.shard_path(shard_id), json.dumps(shard), self.tmp_dir)
+            shard_ids.append(shard_id)
+
+        manifest = {
+            "run_id": run_id or uuid.uuid4().hex,
+            "created_at": time.time(),
+            "statements": len(statements),
+            "shard_size": shard_size,
+            "shards": shard_ids,
+        }
+        _atomic_write(os.path.join(self.root, "manifest.json"), json.dumps(manifest, indent=2), self.tmp_dir)
+        return shard_ids
+
+    def shard_ids(self) -> List[str]:
+        return sorted(name[:-5] for name in os.listdir(self.shards_dir) if name.endswith(".json"))
+
+    def status(self) -> List[ShardStatus]:
+        """State of every shard in the queue."""
+        now = self._fs_now()
+        statuses = []
+        for shard_id in self.shard_ids():
+            if os.path.isdir(self.result_path(shard_id)):
+                statuses.append(ShardStatus(shard_id, "done"))
+                continue
+            try:
+                age = now - os.stat(self.lease_path(shard_id)).st_mtime
+                with open(self.lease_path(shard_id)) as f:
+                    owner = json.load(f).get("worker_id")
+            except (FileNotFoundError, ValueError):
+                statuses.append(ShardStatus(shard_id, "pending"))
+                continue
+            state = "expired" if age > self.lease_ttl else "leased"
+            statuses.append(ShardStatus(shard_id, state, owner))
+        return statuses
+
+    def is_complete(self) -> bool:
+        return all(status.state == "done" for status in self.status())
+
+    # -- workers -------------------------------------------------------
+    def _fs_now(self) -> float:
+        """
+        Current time as seen by the filesystem holding the queue.
+
+        Lease ages are compared against file mtimes, which NFS servers set
+        with their own clock; probing the filesystem avoids client clock skew.
+        """
+        probe = os.path.join(self.tmp_dir, f"clock.{uuid.uuid4().hex}")
+        with open(probe, "w"):
+            pass
+        try:
+            return os.stat(probe).st_mtime
+        finally:
+            os.unlink(probe)
+
+    def claim(self, worker_id: str) -> Optional[Lease]:
+        """
+        Claim the next unfinished shard, reclaiming expired leases.
+
+        Returns:
+            Lease or None: The claimed shard's lease, or None if nothing is claimable
+        """
+        now = None
+        for shard_id in self.shard_ids():
+            if os.path.isdir(self.result_path(shard_id)):
+                continue
+
+            lease_path = self.lease_path(shard_id)
+            if os.path.exists(lease_path):
+                now = now if now is not None else self._fs_now()
+                if not self._reclaim_if_expired(lease_path, now):
+                    continue
+
+            lease = self._create_lease(shard_id, worker_id)
+            if lease is None:
+                continue
+            # A worker may have published between our check and the claim
+            if os.path.isdir(self.result_path(shard_id)):
+                lease.release()
+                continue
+            return lease
+        return None
+
+    def _create_lease(self, shard_id: str, worker_id: str) -> Optional[Lease]:
+        try:
+            fd = os.open(self.lease_path(shard_id), os.O_CREAT | os.O_EXCL | os.O_WRONLY, 0o644)
+        except FileExistsError:
+            return None
+        with os.fdopen(fd, "w") as f:
+            json.dump({"worker_id": worker_id, "claimed_at": time.time()}, f)
+            f.flush()
+            os.fsync(f.fileno())
+        lease = Lease(self, shard_id, worker_id)
+        lease.start()
+        return lease
+
+    def detach_lease(self, lease_path: str) -> Optional[str]:
+        """
+        Atomically move a lease file out of leases/, so no other worker can
+        act on it while it is inspected.
+
+        Returns:
+            str or None: Where the lease now is, or None if it was already gone
+        """
+        detached = os.path.join(self.tmp_dir, f"{os.path.basename(lease_path)}.detached.{uuid.uuid4().hex}")
+        try:
+            os.rename(lease_path, detached)
+        except FileNotFoundError:
+            return None
+        return detached
+
+    def restore_lease(self, detached: str, lease_path: str) -> None:
+        """Put back a lease detached by mistake (it belongs to a live worker)."""
+        try:
+            os.link(detached, lease_path)
+        except FileExistsError:
+            # Yet another lease was created meanwhile; the detached one's owner
+            # sees a different worker_id at its next heartbeat and stops
+            pass
+        os.unlink(detached)
+
+    def _reclaim_if_expired(self, lease_path: str, now: float) -> bool:
+        """
+        Break an expired lease.
+
+        The age check and the rename are separate steps, so between them
+        another worker may have broken the same lease and claimed the shard
+        afresh. The lease is therefore judged again after it has been moved
+        aside (rename keeps its mtime): only an expired one is deleted, and a
+        fresh one is put back.
+        """
+        try:
+            if now - os.stat(lease_path).st_mtime <= self.lease_ttl:
+                return False
+        except FileNotFoundError:
+            # Released or reclaimed by someone else in the meantime
+            return not os.path.exists(lease_path)
+
+        detached = self.detach_lease(lease_path)
+        if detached is None:
+            return not os.path.exists(lease_path)
+        if now - os.stat(detached).st_mtime <= self.lease_ttl:
+            self.restore_lease(detached, lease_path)
+            return False
+        os.unlink(detached)
+        return True
+
+    def load_shard(self, shard_id: str) -> dict:
+        with open(self.shard_path(shard_id)) as f:
+            return json.load(f)
+
+    def staging_dir(self, shard_id: str, worker_id: str) -> str:
+        path = os.path.join(self.tmp_dir, f"{shard_id}.{worker_id}.{uuid.uuid4().hex}")
+        os.makedirs(path)
+        return path
+
+    def publish_result(self, shard_id: str, staging_dir: str) -> bool:
+        """
+        Atomically move a finished staging directory into results.
+
+        Returns:
+            bool: False if another worker already published this shard
+        """
+        try:
+            os.rename(staging_dir, self.result_path(shard_id))
+            return True
+        except OSError:
+            if os.path.isdir(self.result_path(shard_id)):
+                shutil.rmtree(staging_dir, ignore_errors=True)
+                return False
+            raise
+
+    def clean_staging(self) -> int:
+        """
+        Remove staging directories left by dead workers for finished shards.
+
+        Returns:
+            int: Number of directories removed
+        """
+        removed = 0
+        for name in os.listdir(self.tmp_dir):
+            shard_id = name.split(".", 1)[0]
+            path = os.path.join(self.tmp_dir, name)
+            if os.path.isdir(path) and os.path.isdir(self.result_path(shard_id)):
+                shutil.rmtree(path, ignore_errors=True)
+                removed += 1
+        return removed
+
+
+def render_shard(shard: dict, output_dir: str, should_stop: Callable[[], bool] = lambda: False) -> dict:
+    """
+    Render every statement in a shard into ``output_dir``.
+
+    Statements that fail validation or rendering are recorded in the shard
+    manifest instead of failing the whole shard.
+
+    Returns:
+        dict: Shard manifest (also written to output_dir/manifest.json)
+    """
+    entries = []
+    errors = []
+    for offset, payload in enumerate(shard["statements"]):
+        if should_stop():
+            raise RuntimeError(f"Lease on {shard['shard_id']} was lost")
+        index = shard["first_index"] + offset
+        partial_path = None
+        try:
+            statement = StatementRequest(**payload)
+            customer_id = get_customers_from_statement(statement)[0].customer_id
+            stem = os.path.join(output_dir, f"{index:06d}_statement_{customer_id}")
+            partial_path = stem + ".partial"
+            with open(partial_path, "wb") as sink:
+                extension, _ = render_statement(statement, sink)
+            os.rename(partial_path, f"{stem}.{extension}")
+            entries.append({"index": index, "file": os.path.basename(f"{stem}.{extension}")})
+        except Exception as exc:  # one bad statement must not sink the shard
+            errors.append({"index": index, "error": f"{type(exc).__name__}: {exc}"})
+            # A half-written document must not be published with the shard
+            if partial_path is not None and os.path.exists(partial_path):
+                os.unlink(partial_path)
+
+    manifest = {"shard_id": shard["shard_id"], "rendered": len(entries),
+                "failed": len(errors), "files": entries, "errors": errors}
+    with open(os.path.join(output_dir, "manifest.json"), "w") as f:
+        json.dump(manifest, f, indent=2)
+        f.flush()
+        os.fsync(f.fileno())
+    return manifest
+
+
+def run_worker(queue: WorkQueue, worker_id: Optional[str] = None,
+               poll_interval: float = DEFAULT_POLL_INTERVAL, wait_for_completion: bool = True,
+               log: Callable[[str], None] = lambda message: None) -> Dict[str, int]:
+    """
+    Claim and render shards until the queue is finished.
+
+    Args:
+        queue: Queue to work on
+        worker_id: Identity written into leases (defaults to host-pid)
+        poll_interval: Seconds to wait when every open shard is leased
+        wait_for_completion: Keep polling while other workers hold leases, so
+            their shards can be reclaimed if they die; otherwise exit when
+            nothing is claimable
+        log: Progress callback
+
+    Returns:
+        dict: Counts of shards completed, lost and skipped by this worker
+    """
+    worker_id = worker_id or default_worker_id()
+    counts = {"completed": 0, "lost": 0, "duplicate": 0}
+
+    while True:
+        lease = queue.claim(worker_id)
+        if lease is None:
+            if not wait_for_completion or queue.is_complete():
+                queue.clean_staging()
+                return counts
+            time.sleep(poll_interval)
+            continue
+
+        log(f"{worker_id} claimed {lease.shard_id}")
+        staging = queue.staging_dir(lease.shard_id, worker_id)
+        try:
+            manifest = render_shard(queue.load_shard(lease.shard_id), staging, lease.lost.is_set)
+            if lease.lost.is_set():
+                raise RuntimeError(f"Lease on {lease.shard_id} was lost")
+            if queue.publish_result(lease.shard_id, staging):
+                counts["completed"] += 1
+                log(f"{worker_id} published {lease.shard_id} ({manifest['rendered']} ok, {manifest['failed']} failed)")
+            else:
+                counts["duplicate"] += 1
+        except (RuntimeError, FileNotFoundError) as exc:
+            # FileNotFoundError: the staging directory was cleaned up because
+            # another worker finished this shard after our lease expired
+            counts["lost"] += 1
+            log(f"{worker_id}: {exc}")
+            shutil.rmtree(staging, ignore_errors=True)
+        finally:
+            lease.release()
+
+
+def load_portfolio(path: str) -> List[dict]:
+    """
+    Read a portfolio file: a JSON list of statements, a BatchStatementRequest
+    object ({"statements": [...]}), or JSON Lines with one statement per line.
+    """
+    with open(path) as f:
+        text = f.read()
+    stripped = text.lstrip()
+    if stripped.startswith("["):
+        return json.loads(text)
+    try:
+        data = json.loads(text)
+    except ValueError:
+        return [json.loads(line) for line in text.splitlines() if line.strip()]
+    return data["statements"] if isinstance(data, dict) and "statements" in data else [data]
+
+
+def collect_results(queue: WorkQueue) -> Iterable[dict]:
+    """Yield each finished shard's manifest, in shard order."""
+    for shard_id in queue.shard_ids():
+        path = os.path.join(queue.result_path(shard_id), "manifest.json")
+        if os.path.exists(path):
+            with open(path) as f:
+                yield json.load(f)
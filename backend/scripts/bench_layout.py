@@ -0,0 +1,157 @@
+# scripts/bench_layout.py
+"""
+Measure the cost of drawing the summary and conservative layouts.
+
+For each layout it times:
+    replay   cached compiled layout replayed with a statement's values
+    compile  compiling the layout spec and replaying it, i.e. with no cache
+    legacy   the hand-coded layout functions at a git revision (--against)
+
+Drawing goes to a canvas whose methods do nothing, so the numbers are layout
+cost only. Use --canvas reportlab to include ReportLab's content stream
+building.
+
+Examples:
+    python scripts/bench_layout.py --statements 2000
+    python scripts/bench_layout.py --against <commit before compiled layouts>
+"""
+import argparse
+import os
+import subprocess
+import sys
+import time
+import types
+from io import BytesIO
+
+BACKEND_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, BACKEND_DIR)
+
+from reportlab.pdfgen import canvas  # noqa: E402
+from app.models.statement_models import MultiCustomerStatementRequest, StatementRequest  # noqa: E402
+from app.services import pdf_generator  # noqa: E402
+from app.services.pdf_layout import compile_layout  # noqa: E402
+
+LOAN_TYPES = ["auto", "mortgage", "personal", "rent", "rent to own", "business"]
+
+
+class NullCanvas:
+    """Accepts every drawing call and does nothing."""
+
+    def __init__(self, *args, **kwargs):
+        self.page = 1
+
+    def getPageNumber(self) -> int:
+        return self.page
+
+    def showPage(self) -> None:
+        self.page += 1
+
+    def __getattr__(self, name):
+        return lambda *args, **kwargs: None
+
+
+def build_statements(count: int) -> list:
+    statements = []
+    for i in range(count):
+        customers = [{
+            "customer_id": f"CUST{i:05d}{n}",
+            "name": f"Customer {i} Household Member {n}",
+            "address": f"{i} Main Street, Unit {n}, Springfield, IL 62701",
+            "phone": "555-0100",
+            "email": f"customer{i}.{n}@example.com",
+        } for n in range(1 + i % 2)]
+        loan = {
+            "loan_id": f"LN{i:07d}",
+            "loan_type": LOAN_TYPES[i % len(LOAN_TYPES)],
+            "principal": 20000 + i,
+            "interest_rate": 5.5,
+            "term_months": 60,
+            "current_balance": 15000 + i,
+            "payment_due_date": "2024-02-15",
+            "monthly_payment": 380.0,
+        }
+        common = dict(loans=[loan], billing_period_start="2024-01-01", billing_period_end="2024-01-31",
+                      statement_date="2024-02-01", statement_format="pdf")
+        if len(customers) == 1:
+            statements.append(StatementRequest(customer=customers[0], **common))
+        else:
+            statements.append(MultiCustomerStatementRequest(customers=customers, **common))
+    return statements
+
+
+def load_legacy(revision: str) -> types.ModuleType:
+    """Import pdf_generator as it was at a git revision, next to the current one."""
+    source = subprocess.check_output(
+        ["git", "show", f"{revision}:backend/app/services/pdf_generator.py"], cwd=BACKEND_DIR)
+    module = types.ModuleType("app.services._legacy_pdf_generator")
+    module.__package__ = "app.services"
+    exec(compile(source, f"pdf_generator@{revision}", "exec"), module.__dict__)
+    return module
+
+
+def conservative_layout_call(module):
+    """Run generate_pdf_conservative from ``module`` with the benchmark canvas."""
+    def draw(c, statement):
+        module._new_canvas = lambda buffer, statement: c
+        c.save = lambda: None
+        module.generate_pdf_conservative(statement)
+    return draw
+
+
+def timed(draw, statements, make_canvas, repeat: int = 1) -> float:
+    """Best time per statement over ``repeat`` passes, in microseconds."""
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        for statement in statements:
+            draw(make_canvas(), statement)
+        best = min(best, time.perf_counter() - start)
+    return best / len(statements) * 1e6
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Layout replay cost per statement.")
+    parser.add_argument("--statements", type=int, default=1000)
+    parser.add_argument("--repeat", type=int, default=5, help="Passes per variant; the best is reported")
+    parser.add_argument("--canvas", choices=("null", "reportlab"), default="null")
+    parser.add_argument("--against", metavar="REV", help="Also time the layout code at this git revision")
+    args = parser.parse_args()
+
+    statements = build_statements(args.statements)
+    if args.canvas == "null":
+        make_canvas = NullCanvas
+    else:
+        def make_canvas():
+            return canvas.Canvas(BytesIO(), invariant=1)
+
+    def uncached(draw):
+        def run(c, statement):
+            compile_layout.cache_clear()
+            draw(c, statement)
+        return run
+
+    candidates = {
+        "summary": [("replay", pdf_generator._draw_summary),
+                    ("compile", uncached(pdf_generator._draw_summary))],
+        "conservative": [("replay", conservative_layout_call(pdf_generator)),
+                         ("compile", uncached(conservative_layout_call(pdf_generator)))],
+    }
+    if args.against:
+        legacy = load_legacy(args.against)
+        candidates["summary"].append(("legacy", legacy._draw_summary))
+        candidates["conservative"].append(("legacy", conservative_layout_call(legacy)))
+
+    # Warm up caches shared by every variant (fonts, glyph widths, compiled layouts)
+    for draws in candidates.values():
+        for _, draw in draws:
+            timed(draw, statements[:50], make_canvas)
+
+    print(f"{args.statements} statements, {args.canvas} canvas")
+    print(f"{'layout':13} {'variant':8} {'us/statement':>13}")
+    for layout, draws in candidates.items():
+        for name, draw in draws:
+            print(f"{layout:13} {name:8} {timed(draw, statements, make_canvas, args.repeat):13.1f}")
+
+
+if __name__ == "__main__":
+    main()
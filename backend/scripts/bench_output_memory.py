@@ -0,0 +1,96 @@
+# scripts/bench_output_memory.py
+"""
+Compare peak memory and allocations of the bytes-returning output path with
+the sink-based streaming path, per format.
+
+"bytes" renders to a BytesIO inside the generator, copies it out with
+getvalue() and wraps it in a Response, as the routers used to.
+"sink" renders into a spooled sink and reads it back in stream-sized chunks,
+as the routers now do.
+
+Example:
+    python scripts/bench_output_memory.py --loans 500
+"""
+import argparse
+import os
+import sys
+import tracemalloc
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from fastapi import Response  # noqa: E402
+from app.models.statement_models import StatementRequest  # noqa: E402
+from app.services.excel_generator import generate_excel  # noqa: E402
+from app.services.output_sink import iter_sink, open_sink  # noqa: E402
+from app.services.pdf_generator import generate_pdf  # noqa: E402
+from app.services.statement_renderer import render_statement  # noqa: E402
+from app.services.text_generator import generate_text  # noqa: E402
+
+BYTES_GENERATORS = {"pdf": generate_pdf, "xlsx": generate_excel, "txt": generate_text}
+
+
+def build_statement(statement_format: str, loan_count: int) -> StatementRequest:
+    customer = {
+        "customer_id": "CUST00001",
+        "name": "Jane Doe",
+        "address": "1 Main Street, Springfield, IL 62701",
+        "phone": "555-0100",
+        "email": "jane@example.com",
+    }
+    loans = [{
+        "loan_id": f"LN{i:07d}",
+        "loan_type": "auto",
+        "principal": 25000 + i,
+        "interest_rate": 5.5,
+        "term_months": 60,
+        "current_balance": 18000 + i,
+        "payment_due_date": "2024-02-15",
+        "monthly_payment": 450.0,
+    } for i in range(loan_count)]
+    return StatementRequest(
+        customer=customer,
+        loans=loans,
+        billing_period_start="2024-01-01",
+        billing_period_end="2024-01-31",
+        statement_format=statement_format,
+    )
+
+
+def bytes_path(statement) -> int:
+    content = BYTES_GENERATORS[statement.statement_format](statement)
+    response = Response(content=content)
+    return len(response.body)
+
+
+def sink_path(statement) -> int:
+    sink = open_sink()
+    render_statement(statement, sink)
+    return sum(len(chunk) for chunk in iter_sink(sink))
+
+
+def measure(func, statement) -> dict:
+    func(statement)  # warm caches (fonts, glyph tables, imports)
+    tracemalloc.start()
+    size = func(statement)
+    current, peak = tracemalloc.get_traced_memory()
+    blocks = sum(stat.count for stat in tracemalloc.take_snapshot().statistics("filename"))
+    tracemalloc.stop()
+    return {"size": size, "peak_kib": peak / 1024, "live_blocks": blocks}
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Peak memory per output path and format.")
+    parser.add_argument("--loans", type=int, default=500)
+    args = parser.parse_args()
+
+    print(f"{'format':6} {'path':5} {'size KiB':>9} {'peak KiB':>9} {'live blocks':>12}")
+    for statement_format in ("pdf", "xlsx", "txt"):
+        statement = build_statement(statement_format, args.loans)
+        for name, func in (("bytes", bytes_path), ("sink", sink_path)):
+            result = measure(func, statement)
+            print(f"{statement_format:6} {name:5} {result['size'] / 1024:9.1f} "
+                  f"{result['peak_kib']:9.1f} {result['live_blocks']:12d}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,76 @@
+# scripts/bench_parallel_pdf.py
+"""
+Compare serial and parallel rendering of a very large PDF statement.
+
+Example:
+    python scripts/bench_parallel_pdf.py --loans 10000 --workers 1 2 4 8
+"""
+import argparse
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from app.models.statement_models import StatementRequest  # noqa: E402
+from app.services.pdf_generator import generate_pdf, schedule_page_count  # noqa: E402
+from app.services.pdf_parallel import generate_pdf_parallel  # noqa: E402
+
+
+def build_statement(loan_count: int) -> StatementRequest:
+    customer = {
+        "customer_id": "CUST00001",
+        "name": "Large Commercial Customer LLC",
+        "address": "100 Industrial Parkway, Springfield, IL 62701",
+        "phone": "555-0100",
+        "email": "ap@example.com",
+    }
+    loans = [{
+        "loan_id": f"LN{i:07d}",
+        "loan_type": "business",
+        "principal": 250000 + i,
+        "interest_rate": 6.25,
+        "term_months": 120,
+        "current_balance": 180000 + i,
+        "payment_due_date": "2024-02-15",
+        "monthly_payment": 2800.0,
+    } for i in range(loan_count)]
+    return StatementRequest(
+        customer=customer,
+        loans=loans,
+        billing_period_start="2024-01-01",
+        billing_period_end="2024-01-31",
+        statement_format="pdf",
+    )
+
+
+def best_of(repeat: int, func) -> float:
+    timings = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func()
+        timings.append(time.perf_counter() - start)
+    return min(timings)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--loans", type=int, default=10000)
+    parser.add_argument("--workers", type=int, nargs="+", default=[2, 4])
+    parser.add_argument("--repeat", type=int, default=3)
+    args = parser.parse_args()
+
+    statement = build_statement(args.loans)
+    print(f"{args.loans} loans, {schedule_page_count(statement)} schedule pages")
+
+    serial = best_of(args.repeat, lambda: generate_pdf(statement))
+    print(f"serial      {serial:8.3f}s")
+
+    for workers in args.workers:
+        generate_pdf_parallel(statement, max_workers=workers)  # start the pool
+        elapsed = best_of(args.repeat, lambda: generate_pdf_parallel(statement, max_workers=workers))
+        print(f"{workers:2d} workers  {elapsed:8.3f}s  speedup {serial / elapsed:5.2f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,95 @@
+# scripts/bench_portfolio_workbook.py
+"""
+Time and peak memory of writing one portfolio workbook for many statements.
+
+    streamed   app/services/portfolio_workbook.py
+    openpyxl   the same sheets through openpyxl in write-only mode, for
+               comparison (--openpyxl)
+
+Statements are validated up front, so the timing covers workbook writing
+only. Peak memory is measured with tracemalloc, which slows both writers
+down; pass --no-memory for timings alone.
+
+Example:
+    python scripts/bench_portfolio_workbook.py --statements 20000 --loans 4 --openpyxl
+"""
+import argparse
+import os
+import sys
+import time
+import tracemalloc
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from openpyxl import Workbook  # noqa: E402
+from app.services.output_sink import open_sink, sink_size  # noqa: E402
+from app.services.portfolio_workbook import (  # noqa: E402
+    CUSTOMER_COLUMNS,
+    LOAN_COLUMNS,
+    write_portfolio_workbook,
+)
+from app.services.statement_builder import loan_type_group, monthly_interest_amount  # noqa: E402
+from bench_record_writer import build_statements  # noqa: E402
+
+
+def write_openpyxl(statements, sink) -> None:
+    """Customer and loan sheets via openpyxl write-only mode (no summary sheet)."""
+    wb = Workbook(write_only=True)
+    customers = wb.create_sheet("Customers")
+    customers.freeze_panes = "C2"
+    customers.append([header for header, _, _ in CUSTOMER_COLUMNS])
+    loan_sheets = {}
+    for seq, statement in enumerate(statements, 1):
+        customer = statement.customer
+        for loan in statement.loans:
+            group = loan_type_group(loan.loan_type)
+            sheet = loan_sheets.get(group)
+            if sheet is None:
+                sheet = loan_sheets[group] = wb.create_sheet(group)
+                sheet.freeze_panes = "C2"
+                sheet.append([header for header, _, _ in LOAN_COLUMNS])
+            sheet.append([seq, customer.customer_id, customer.name, loan.loan_id, loan.loan_type,
+                          loan.principal, loan.interest_rate, loan.term_months, loan.current_balance,
+                          loan.monthly_payment, monthly_interest_amount(loan), loan.payment_due_date])
+        customers.append([seq, customer.customer_id, customer.name, customer.address, customer.phone,
+                          customer.email, statement.billing_period_start, statement.billing_period_end,
+                          statement.statement_date, len(statement.loans),
+                          sum(loan.current_balance for loan in statement.loans),
+                          sum(loan.monthly_payment for loan in statement.loans)])
+    wb.save(sink)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Portfolio workbook writing cost.")
+    parser.add_argument("--statements", type=int, default=20000)
+    parser.add_argument("--loans", type=int, default=4, help="Loans per statement")
+    parser.add_argument("--openpyxl", action="store_true", help="Also time openpyxl write-only mode")
+    parser.add_argument("--no-memory", action="store_true", help="Skip peak memory measurement")
+    args = parser.parse_args()
+
+    statements = build_statements(args.statements, args.loans)
+    writers = [("streamed", write_portfolio_workbook)]
+    if args.openpyxl:
+        writers.append(("openpyxl", write_openpyxl))
+
+    print(f"{args.statements} statements x {args.loans} loans")
+    print(f"{'writer':10} {'MiB':>7} {'seconds':>8} {'rows/s':>10} {'peak MiB':>9}")
+    rows = args.statements * (args.loans + 1)
+    for name, write in writers:
+        sink = open_sink()
+        if not args.no_memory:
+            tracemalloc.start()
+        start = time.perf_counter()
+        write(statements, sink)
+        elapsed = time.perf_counter() - start
+        peak = ""
+        if not args.no_memory:
+            peak = f"{tracemalloc.get_traced_memory()[1] / 2**20:9.1f}"
+            tracemalloc.stop()
+        size = sink_size(sink)
+        sink.close()
+        print(f"{name:10} {size / 2**20:7.1f} {elapsed:8.3f} {rows / elapsed:10,.0f} {peak:>9}")
+
+
+if __name__ == "__main__":
+    main()
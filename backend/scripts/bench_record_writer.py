@@ -0,0 +1,76 @@
+# scripts/bench_record_writer.py
+"""
+Throughput of the bulk record writer, in records per second.
+
+Statements are validated up front, so the timing covers record formatting
+and writing only. Output goes to a spooled sink (in memory up to its spool
+size, then a temp file) or, with --output, to a file.
+
+Example:
+    python scripts/bench_record_writer.py --statements 20000 --loans 4
+"""
+import argparse
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from app.models.statement_models import StatementRequest  # noqa: E402
+from app.services.output_sink import open_sink, sink_size  # noqa: E402
+from app.services.record_writer import RECORD_FORMATS, write_records  # noqa: E402
+
+LOAN_TYPES = ["auto", "mortgage", "personal", "rent", "student"]
+
+
+def build_statements(count: int, loans_per_statement: int) -> list:
+    return [StatementRequest(
+        customer={
+            "customer_id": f"CUST{i:07d}",
+            "name": f"Customer Number {i}",
+            "address": f"{i} Main Street, Springfield, IL 62701",
+            "phone": "555-0100",
+            "email": f"customer{i}@example.com",
+        },
+        loans=[{
+            "loan_id": f"LN{i:07d}{n}",
+            "loan_type": LOAN_TYPES[(i + n) % len(LOAN_TYPES)],
+            "principal": 20000 + i + n,
+            "interest_rate": 5.25,
+            "term_months": 60,
+            "current_balance": 15000.55 + n,
+            "payment_due_date": "2024-02-15",
+            "monthly_payment": 380.25,
+        } for n in range(loans_per_statement)],
+        billing_period_start="2024-01-01",
+        billing_period_end="2024-01-31",
+        statement_date="2024-02-01",
+        statement_format="pdf",
+    ) for i in range(count)]
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Record writer throughput.")
+    parser.add_argument("--statements", type=int, default=20000)
+    parser.add_argument("--loans", type=int, default=4, help="Loans per statement")
+    parser.add_argument("--output", help="Write to this path (suffixed with the format) instead of a sink")
+    args = parser.parse_args()
+
+    statements = build_statements(args.statements, args.loans)
+    print(f"{args.statements} statements x {args.loans} loans")
+    print(f"{'format':10} {'records':>9} {'MiB':>7} {'seconds':>8} {'records/s':>11} {'MiB/s':>7}")
+    for record_format in RECORD_FORMATS:
+        sink = open(f"{args.output}.{record_format}", "wb") if args.output else open_sink()
+        start = time.perf_counter()
+        totals = write_records(statements, sink, record_format, file_id="BENCH", created="20240201")
+        sink.flush()
+        elapsed = time.perf_counter() - start
+        size = sink_size(sink)
+        sink.close()
+        records = totals["record_count"]
+        print(f"{record_format:10} {records:9d} {size / 2**20:7.1f} {elapsed:8.3f} "
+              f"{records / elapsed:11,.0f} {size / 2**20 / elapsed:7.1f}")
+
+
+if __name__ == "__main__":
+    main()
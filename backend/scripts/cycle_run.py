@@ -0,0 +1,183 @@
+# scripts/cycle_run.py
+"""
+Run a statement cycle across several processes or nodes through a work queue
+on a shared directory (see app/services/work_queue.py).
+
+Coordinator (publish the portfolio as shards):
+    python scripts/cycle_run.py publish --queue /mnt/shared/cycle-2024-01 \
+        --portfolio portfolio.jsonl --shard-size 50
+
+Worker (run on every node, as many per node as there are cores):
+    python scripts/cycle_run.py work --queue /mnt/shared/cycle-2024-01
+
+Progress:
+    python scripts/cycle_run.py status --queue /mnt/shared/cycle-2024-01
+
+Everything on one box, with N local worker processes:
+    python scripts/cycle_run.py run --queue /tmp/cycle --synthetic 500 --local-workers 4
+
+The portfolio is a JSON list of statement requests, a batch request object
+({"statements": [...]}) or JSON Lines with one statement request per line.
+"""
+import argparse
+import json
+import os
+import subprocess
+import sys
+import time
+from collections import Counter
+
+BACKEND_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, BACKEND_DIR)
+
+from app.services.work_queue import (  # noqa: E402
+    DEFAULT_LEASE_TTL,
+    DEFAULT_POLL_INTERVAL,
+    WorkQueue,
+    collect_results,
+    default_worker_id,
+    load_portfolio,
+    run_worker,
+)
+
+
+def synthetic_portfolio(count: int, statement_format: str) -> list:
+    """Generate ``count`` single-customer statements for trial runs."""
+    statements = []
+    for i in range(count):
+        statements.append({
+            "customer": {
+                "customer_id": f"CUST{i:05d}",
+                "name": f"Customer {i}",
+                "address": f"{i} Main Street, Springfield, IL 62701",
+                "phone": "555-0100",
+                "email": f"customer{i}@example.com",
+            },
+            "loans": [{
+                "loan_id": f"LN{i:05d}{n}",
+                "loan_type": ("auto", "personal", "mortgage")[n % 3],
+                "principal": 20000 + 1000 * n,
+                "interest_rate": 5.5,
+                "term_months": 60,
+                "current_balance": 15000 + 900 * n,
+                "payment_due_date": "2024-02-15",
+                "monthly_payment": 380.0 + 20 * n,
+            } for n in range(1 + i % 3)],
+            "billing_period_start": "2024-01-01",
+            "billing_period_end": "2024-01-31",
+            "statement_format": statement_format,
+        })
+    return statements
+
+
+def print_status(queue: WorkQueue) -> Counter:
+    statuses = queue.status()
+    counts = Counter(status.state for status in statuses)
+    print(f"{len(statuses)} shards: " + ", ".join(
+        f"{counts[state]} {state}" for state in ("done", "leased", "expired", "pending")))
+    for status in statuses:
+        if status.state in ("leased", "expired"):
+            print(f"  {status.shard_id} {status.state} by {status.owner}")
+    return counts
+
+
+def command_publish(args) -> None:
+    if args.synthetic:
+        statements = synthetic_portfolio(args.synthetic, args.format)
+    else:
+        statements = load_portfolio(args.portfolio)
+    queue = WorkQueue(args.queue, args.lease_ttl)
+    if os.path.exists(os.path.join(args.queue, "manifest.json")):
+        sys.exit(f"{args.queue} already holds a published run")
+    shard_ids = queue.publish(statements, args.shard_size)
+    print(f"Published {len(statements)} statements as {len(shard_ids)} shards to {args.queue}")
+
+
+def command_work(args) -> None:
+    queue = WorkQueue(args.queue, args.lease_ttl)
+    log = (lambda message: print(message, flush=True)) if args.verbose else (lambda message: None)
+    worker_id = args.worker_id or default_worker_id()
+    counts = run_worker(queue, worker_id, args.poll_interval,
+                        wait_for_completion=not args.exit_when_idle, log=log)
+    print(json.dumps({"worker_id": worker_id, **counts}), flush=True)
+
+
+def command_status(args) -> None:
+    queue = WorkQueue(args.queue, args.lease_ttl)
+    print_status(queue)
+    rendered = failed = 0
+    for manifest in collect_results(queue):
+        rendered += manifest["rendered"]
+        failed += manifest["failed"]
+        for error in manifest["errors"]:
+            print(f"  statement {error['index']}: {error['error']}")
+    print(f"{rendered} statements rendered, {failed} failed")
+
+
+def command_run(args) -> None:
+    command_publish(args)
+    started = time.perf_counter()
+    worker_args = [sys.executable, os.path.abspath(__file__), "work", "--queue", args.queue,
+                   "--lease-ttl", str(args.lease_ttl), "--poll-interval", str(args.poll_interval)]
+    if args.verbose:
+        worker_args.append("--verbose")
+    workers = [
+        subprocess.Popen(worker_args + ["--worker-id", f"local-{n}"], cwd=BACKEND_DIR)
+        for n in range(args.local_workers)
+    ]
+    exit_codes = [worker.wait() for worker in workers]
+    elapsed = time.perf_counter() - started
+
+    command_status(args)
+    print(f"{args.local_workers} workers finished in {elapsed:.2f}s")
+    if any(exit_codes) or not WorkQueue(args.queue, args.lease_ttl).is_complete():
+        sys.exit(1)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Distributed statement cycle run over a shared directory.")
+    subparsers = parser.add_subparsers(dest="command", required=True)
+
+    def add_common(subparser):
+        subparser.add_argument("--queue", required=True, help="Shared queue directory")
+        subparser.add_argument("--lease-ttl", type=float, default=DEFAULT_LEASE_TTL,
+                               help="Seconds without a heartbeat before a lease is reclaimed")
+        subparser.add_argument("--poll-interval", type=float, default=DEFAULT_POLL_INTERVAL)
+        subparser.add_argument("--verbose", action="store_true")
+
+    def add_portfolio(subparser):
+        source = subparser.add_mutually_exclusive_group(required=True)
+        source.add_argument("--portfolio", help="JSON or JSON Lines file of statement requests")
+        source.add_argument("--synthetic", type=int, help="Generate this many statements instead")
+        subparser.add_argument("--format", default="pdf", choices=("pdf", "xlsx", "txt"),
+                               help="Format of synthetic statements")
+        subparser.add_argument("--shard-size", type=int, default=50)
+
+    publish = subparsers.add_parser("publish", help="Split a portfolio into shards")
+    add_common(publish)
+    add_portfolio(publish)
+    publish.set_defaults(func=command_publish)
+
+    work = subparsers.add_parser("work", help="Claim and render shards until the run is done")
+    add_common(work)
+    work.add_argument("--worker-id", default=None)
+    work.add_argument("--exit-when-idle", action="store_true",
+                      help="Exit when nothing is claimable instead of waiting to reclaim leases")
+    work.set_defaults(func=command_work)
+
+    status = subparsers.add_parser("status", help="Show shard states and render errors")
+    add_common(status)
+    status.set_defaults(func=command_status)
+
+    run = subparsers.add_parser("run", help="Publish and process with local worker processes")
+    add_common(run)
+    add_portfolio(run)
+    run.add_argument("--local-workers", type=int, default=os.cpu_count() or 1)
+    run.set_defaults(func=command_run)
+
+    args = parser.parse_args()
+    args.func(args)
+
+
+if __name__ == "__main__":
+    main()
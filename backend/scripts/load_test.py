@@ -0,0 +1,331 @@
+# scripts/load_test.py
+"""
+Local load generator for the Statement Generator API.
+
+Replays the same request shapes the frontend sends from
+``generateSingleStatement`` (POST /api/statements) and
+``generateMultiCustomerStatement`` (POST /api/generate-statement), with a
+configurable mix of formats, loan types and customer counts, and reports
+throughput plus p50/p95/p99 latency and error rates per endpoint and per
+format as JSON.
+
+Examples:
+    # Against an already running server
+    python scripts/load_test.py --url http://localhost:8000 --requests 500 --concurrency 16
+
+    # Start a local uvicorn instance for the run and save the report
+    python scripts/load_test.py --spawn --duration 30 --output run.json
+"""
+import argparse
+import json
+import math
+import os
+import random
+import subprocess
+import sys
+import threading
+import time
+import urllib.error
+import urllib.request
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timezone
+from typing import Dict, List, Optional, Tuple
+
+BACKEND_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+SINGLE_ENDPOINT = "/api/statements"
+MULTI_ENDPOINT = "/api/generate-statement"
+
+DEFAULT_FORMATS = "pdf=0.7,xlsx=0.15,txt=0.15"
+DEFAULT_LOAN_TYPES = "auto=0.3,mortgage=0.25,rent=0.2,personal=0.15,rent to own=0.1"
+DEFAULT_CUSTOMERS = "1=0.75,2=0.2,3=0.05"
+
+
+def parse_mix(spec: str) -> List[Tuple[str, float]]:
+    """
+    Parse a weighted mix such as "pdf=0.7,xlsx=0.2,txt=0.1".
+
+    Weights do not need to add up to 1; a value without a weight counts as 1.
+    """
+    mix = []
+    for part in spec.split(","):
+        part = part.strip()
+        if not part:
+            continue
+        name, _, weight = part.partition("=")
+        mix.append((name.strip(), float(weight) if weight else 1.0))
+    if not mix:
+        raise ValueError(f"Empty mix: {spec!r}")
+    return mix
+
+
+def pick(rng: random.Random, mix: List[Tuple[str, float]]) -> str:
+    """Pick one value from a weighted mix."""
+    names = [name for name, _ in mix]
+    weights = [weight for _, weight in mix]
+    return rng.choices(names, weights=weights, k=1)[0]
+
+
+def build_payload(rng: random.Random, statement_format: str, loan_type: str, customer_count: int) -> Tuple[str, dict]:
+    """
+    Build a request body shaped like the frontend's.
+
+    Numeric loan fields are sent as strings, exactly as the form state in
+    ``types/statement.ts`` holds them.
+
+    Returns:
+        tuple: (endpoint path, JSON-serialisable payload)
+    """
+    customers = []
+    for i in range(customer_count):
+        customer_id = f"CUST{rng.randint(10000, 99999)}"
+        customers.append({
+            "name": f"Customer {customer_id} {i + 1}",
+            "customer_id": customer_id,
+            "address": f"{rng.randint(1, 9999)} Main Street, Springfield, IL 62701",
+            "phone": f"555-{rng.randint(1000, 9999)}",
+            "email": f"{customer_id.lower()}@example.com",
+        })
+
+    principal = rng.randint(1000, 500000)
+    balance = round(principal * rng.uniform(0.1, 1.0), 2)
+    loans = [{
+        "loan_id": f"LN{rng.randint(100000, 999999)}",
+        "loan_type": loan_type,
+        "principal": str(principal),
+        "interest_rate": f"{rng.uniform(0, 12):.2f}",
+        "term_months": str(rng.choice([12, 36, 60, 120, 360])),
+        "current_balance": str(balance),
+        "payment_due_date": f"2024-{rng.randint(1, 12):02d}-15",
+        "monthly_payment": f"{balance / 36:.2f}",
+    }]
+
+    base = {
+        "loans": loans,
+        "billing_period_start": "2024-01-01",
+        "billing_period_end": "2024-01-31",
+        "statement_format": statement_format,
+    }
+
+    # Mirrors generateStatement(): one customer goes to the single endpoint
+    if customer_count == 1:
+        return SINGLE_ENDPOINT, {"customer": customers[0], **base}
+    return MULTI_ENDPOINT, {"customers": customers, **base}
+
+
+def percentile(sorted_values: List[float], pct: float) -> Optional[float]:
+    """Nearest-rank percentile of an already sorted list."""
+    if not sorted_values:
+        return None
+    rank = max(0, min(len(sorted_values) - 1, math.ceil(pct / 100 * len(sorted_values)) - 1))
+    return sorted_values[rank]
+
+
+class Recorder:
+    """Thread-safe collection of per-request results."""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.results: List[dict] = []
+
+    def add(self, result: dict) -> None:
+        with self._lock:
+            self.results.append(result)
+
+
+def send(base_url: str, endpoint: str, payload: dict, timeout: float) -> Tuple[int, int, Optional[str]]:
+    """
+    POST one payload.
+
+    Returns:
+        tuple: (HTTP status or 0 on transport failure, response size, error text)
+    """
+    body = json.dumps(payload).encode("utf-8")
+    request = urllib.request.Request(
+        base_url + endpoint,
+        data=body,
+        headers={"Content-Type": "application/json"},
+        method="POST",
+    )
+    try:
+        with urllib.request.urlopen(request, timeout=timeout) as response:
+            data = response.read()
+            return response.status, len(data), None
+    except urllib.error.HTTPError as exc:
+        return exc.code, 0, exc.read().decode("utf-8", "replace")[:200]
+    except (urllib.error.URLError, OSError) as exc:
+        return 0, 0, str(exc)[:200]
+
+
+def summarize(results: List[dict], elapsed: float) -> dict:
+    """Aggregate latency, throughput and errors for one group of results."""
+    latencies = sorted(r["latency_ms"] for r in results)
+    errors = [r for r in results if not 200 <= r["status"] < 300]
+    status_counts: Dict[str, int] = {}
+    for r in results:
+        status_counts[str(r["status"])] = status_counts.get(str(r["status"]), 0) + 1
+
+    return {
+        "requests": len(results),
+        "errors": len(errors),
+        "error_rate": round(len(errors) / len(results), 4) if results else 0.0,
+        "throughput_rps": round(len(results) / elapsed, 2) if elapsed > 0 else 0.0,
+        "latency_ms": {
+            "p50": percentile(latencies, 50),
+            "p95": percentile(latencies, 95),
+            "p99": percentile(latencies, 99),
+            "max": latencies[-1] if latencies else None,
+            "mean": round(sum(latencies) / len(latencies), 2) if latencies else None,
+        },
+        "bytes_received": sum(r["bytes"] for r in results),
+        "status_counts": status_counts,
+        "sample_errors": sorted({r["error"] for r in errors if r["error"]})[:5],
+    }
+
+
+def group_by(results: List[dict], key: str) -> Dict[str, List[dict]]:
+    groups: Dict[str, List[dict]] = {}
+    for r in results:
+        groups.setdefault(r[key], []).append(r)
+    return groups
+
+
+def run_load(args) -> dict:
+    """Run the load test and return the report."""
+    formats = parse_mix(args.formats)
+    loan_types = parse_mix(args.loan_types)
+    customer_counts = parse_mix(args.customers)
+    rng = random.Random(args.seed)
+    rng_lock = threading.Lock()
+    recorder = Recorder()
+
+    def next_payload() -> Tuple[str, str, dict]:
+        with rng_lock:
+            statement_format = pick(rng, formats)
+            endpoint, payload = build_payload(
+                rng, statement_format, pick(rng, loan_types), int(pick(rng, customer_counts))
+            )
+        return statement_format, endpoint, payload
+
+    # Warm up the server so imports and font tables are not measured
+    for _ in range(args.warmup):
+        _, endpoint, payload = next_payload()
+        send(args.url, endpoint, payload, args.timeout)
+
+    deadline = time.perf_counter() + args.duration if args.duration else None
+    remaining = [args.requests]
+    counter_lock = threading.Lock()
+
+    def take_slot() -> bool:
+        if deadline is not None:
+            return time.perf_counter() < deadline
+        with counter_lock:
+            if remaining[0] <= 0:
+                return False
+            remaining[0] -= 1
+            return True
+
+    def worker() -> None:
+        while take_slot():
+            statement_format, endpoint, payload = next_payload()
+            start = time.perf_counter()
+            status, size, error = send(args.url, endpoint, payload, args.timeout)
+            recorder.add({
+                "endpoint": endpoint,
+                "format": statement_format,
+                "status": status,
+                "bytes": size,
+                "error": error,
+                "latency_ms": round((time.perf_counter() - start) * 1000, 3),
+            })
+
+    started_at = datetime.now(timezone.utc).isoformat()
+    start = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=args.concurrency) as pool:
+        for future in [pool.submit(worker) for _ in range(args.concurrency)]:
+            future.result()
+    elapsed = time.perf_counter() - start
+
+    results = recorder.results
+    return {
+        "started_at": started_at,
+        "config": {
+            "url": args.url,
+            "concurrency": args.concurrency,
+            "requests": None if args.duration else args.requests,
+            "duration_s": args.duration or None,
+            "formats": args.formats,
+            "loan_types": args.loan_types,
+            "customers": args.customers,
+            "seed": args.seed,
+        },
+        "elapsed_s": round(elapsed, 3),
+        "overall": summarize(results, elapsed),
+        "by_endpoint": {name: summarize(group, elapsed) for name, group in sorted(group_by(results, "endpoint").items())},
+        "by_format": {name: summarize(group, elapsed) for name, group in sorted(group_by(results, "format").items())},
+    }
+
+
+def spawn_server(port: int, log_path: Optional[str] = None) -> subprocess.Popen:
+    """Start uvicorn for app.main:app from the backend directory and wait until it answers."""
+    log = open(log_path, "w") if log_path else subprocess.DEVNULL
+    process = subprocess.Popen(
+        [sys.executable, "-m", "uvicorn", "app.main:app", "--port", str(port), "--log-level", "warning"],
+        cwd=BACKEND_DIR,
+        stdout=log,
+        stderr=subprocess.STDOUT,
+    )
+    url = f"http://127.0.0.1:{port}/"
+    for _ in range(100):
+        if process.poll() is not None:
+            raise RuntimeError("uvicorn exited before it became ready")
+        try:
+            with urllib.request.urlopen(url, timeout=1):
+                return process
+        except (urllib.error.URLError, OSError):
+            time.sleep(0.1)
+    process.terminate()
+    raise RuntimeError("uvicorn did not become ready in time")
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description="Replay frontend-shaped traffic against the statement API.")
+    parser.add_argument("--url", default="http://127.0.0.1:8000", help="Base URL of the API")
+    parser.add_argument("--spawn", action="store_true", help="Start a local uvicorn instance for the run")
+    parser.add_argument("--port", type=int, default=8765, help="Port used with --spawn")
+    parser.add_argument("--server-log", help="With --spawn, write the server's output to this file")
+    parser.add_argument("--requests", type=int, default=200, help="Total requests (ignored with --duration)")
+    parser.add_argument("--duration", type=float, default=0, help="Run for this many seconds instead of a fixed count")
+    parser.add_argument("--concurrency", type=int, default=8, help="Concurrent client threads")
+    parser.add_argument("--warmup", type=int, default=5, help="Unmeasured requests sent before the run")
+    parser.add_argument("--formats", default=DEFAULT_FORMATS, help="Weighted format mix")
+    parser.add_argument("--loan-types", default=DEFAULT_LOAN_TYPES, help="Weighted loan type mix")
+    parser.add_argument("--customers", default=DEFAULT_CUSTOMERS, help="Weighted customers-per-statement mix")
+    parser.add_argument("--timeout", type=float, default=30.0, help="Per-request timeout in seconds")
+    parser.add_argument("--seed", type=int, default=1234, help="Random seed for payload generation")
+    parser.add_argument("--output", help="Write the JSON report to this file instead of stdout")
+    args = parser.parse_args(argv)
+
+    server = None
+    if args.spawn:
+        server = spawn_server(args.port, args.server_log)
+        args.url = f"http://127.0.0.1:{args.port}"
+
+    try:
+        report = run_load(args)
+    finally:
+        if server is not None:
+            server.terminate()
+            server.wait(timeout=10)
+
+    output = json.dumps(report, indent=2)
+    if args.output:
+        with open(args.output, "w") as f:
+            f.write(output + "\n")
+    else:
+        print(output)
+    return 0 if report["overall"]["errors"] == 0 else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
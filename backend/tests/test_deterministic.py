@@ -0,0 +1,110 @@
+# tests/test_deterministic.py
+"""
+Deterministic mode: the same request renders to the same bytes, whenever it
+is rendered. Each format is rendered twice, more than a second apart (the
+resolution of PDF and XLSX timestamps).
+"""
+import os
+import sys
+import time
+from datetime import datetime
+
+import pytest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from app.models.statement_models import StatementRequest  # noqa: E402
+from app.services.excel_generator import generate_excel  # noqa: E402
+from app.services.pdf_generator import generate_pdf, generate_pdf_conservative  # noqa: E402
+from app.services import utils  # noqa: E402
+from app.services.text_generator import generate_text  # noqa: E402
+
+RENDERERS = {
+    "pdf": generate_pdf,
+    "pdf_conservative": generate_pdf_conservative,
+    "xlsx": generate_excel,
+    "txt": lambda statement: generate_text(statement).encode("utf-8"),
+}
+
+
+def make_statement(deterministic: bool, **overrides) -> StatementRequest:
+    fields = dict(
+        customer={
+            "customer_id": "CUST001",
+            "name": "Jordan Example",
+            "address": "1 Main Street, Springfield, IL 62701",
+            "phone": "555-0100",
+            "email": "jordan@example.com",
+        },
+        loans=[{
+            "loan_id": "LN001",
+            "loan_type": "auto",
+            "principal": 20000,
+            "interest_rate": 5.5,
+            "term_months": 60,
+            "current_balance": 15000,
+            "payment_due_date": "2024-02-15",
+            "monthly_payment": 380.0,
+        }],
+        billing_period_start="2024-01-01",
+        billing_period_end="2024-01-31",
+        statement_format="pdf",
+        deterministic=deterministic,
+    )
+    return StatementRequest(**{**fields, **overrides})
+
+
+@pytest.fixture(scope="module")
+def renders():
+    """Every format rendered twice, with and without the flag, 1.1s apart."""
+    def render_all():
+        return {
+            (name, deterministic): render(make_statement(deterministic))
+            for name, render in RENDERERS.items()
+            for deterministic in (True, False)
+        }
+
+    first = render_all()
+    time.sleep(1.1)
+    return first, render_all()
+
+
+@pytest.mark.parametrize("name", sorted(RENDERERS))
+def test_deterministic_output_is_identical(renders, name):
+    first, second = renders
+    assert first[(name, True)] == second[(name, True)]
+
+
+@pytest.mark.parametrize("name", ["pdf", "pdf_conservative", "xlsx"])
+def test_output_differs_without_flag(renders, name):
+    first, second = renders
+    assert first[(name, False)] != second[(name, False)]
+
+
+class _PinnedDatetime(datetime):
+    """datetime whose now() is fixed, so date assertions cannot straddle midnight."""
+
+    @classmethod
+    def now(cls, tz=None):
+        return cls(2030, 5, 17, 23, 59, 59)
+
+
+def test_text_uses_cycle_date_only_when_deterministic(monkeypatch):
+    # Text carries no time of day, so without the flag it only differs by date
+    monkeypatch.setattr(utils, "datetime", _PinnedDatetime)
+    assert "Statement Date: 01/31/2024" in generate_text(make_statement(True))
+    assert "Statement Date: 05/17/2030" in generate_text(make_statement(False))
+
+
+def test_unparseable_statement_date_is_rejected():
+    # A bad fixed date must not silently become today's date
+    with pytest.raises(ValueError, match="statement_date"):
+        make_statement(True, statement_date="2024-31-12")
+
+
+def test_deterministic_without_usable_date_is_rejected():
+    # No statement_date and an unparseable cycle date: nothing to date the output with
+    with pytest.raises(ValueError, match="billing_period_end"):
+        make_statement(True, billing_period_end="end of January")
+    make_statement(True, billing_period_end="end of January", statement_date="2024-02-01")
+    make_statement(False, billing_period_end="end of January")
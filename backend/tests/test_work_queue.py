@@ -0,0 +1,106 @@
+# tests/test_work_queue.py
+"""
+Distributed cycle runs: several worker processes share one queue directory.
+Every shard must be rendered exactly once, leases of dead workers must be
+reclaimed, and nothing transient (leases, partial files) may be left behind.
+"""
+import json
+import os
+import subprocess
+import sys
+import time
+
+BACKEND_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, BACKEND_DIR)
+
+from app.services import work_queue  # noqa: E402
+from app.services.work_queue import WorkQueue, collect_results  # noqa: E402
+
+CYCLE_RUN = os.path.join(BACKEND_DIR, "scripts", "cycle_run.py")
+
+STATEMENTS = 24
+SHARD_SIZE = 4
+LEASE_TTL = 3.0
+
+
+def cycle_run(*args: str) -> subprocess.Popen:
+    return subprocess.Popen([sys.executable, CYCLE_RUN, *args], cwd=BACKEND_DIR,
+                            stdout=subprocess.PIPE, text=True)
+
+
+def leftover_files(root: str, suffix: str) -> list:
+    return [os.path.join(directory, name)
+            for directory, _, names in os.walk(root)
+            for name in names if suffix in name]
+
+
+def test_workers_render_every_shard_exactly_once(tmp_path):
+    queue_dir = str(tmp_path / "queue")
+    publish = cycle_run("publish", "--queue", queue_dir, "--synthetic", str(STATEMENTS),
+                        "--shard-size", str(SHARD_SIZE), "--format", "txt")
+    assert publish.wait(timeout=60) == 0
+
+    # A worker that died holding a shard: its lease stopped heartbeating long ago
+    queue = WorkQueue(queue_dir, LEASE_TTL)
+    abandoned = queue.shard_ids()[0]
+    with open(queue.lease_path(abandoned), "w") as f:
+        json.dump({"worker_id": "dead-worker", "claimed_at": time.time() - 3600}, f)
+    os.utime(queue.lease_path(abandoned), (time.time() - 3600, time.time() - 3600))
+
+    workers = [
+        cycle_run("work", "--queue", queue_dir, "--worker-id", f"worker-{n}",
+                  "--lease-ttl", str(LEASE_TTL), "--poll-interval", "0.2")
+        for n in range(3)
+    ]
+    outputs = [worker.communicate(timeout=120)[0] for worker in workers]
+    assert [worker.returncode for worker in workers] == [0, 0, 0]
+    counts = [json.loads(output.strip().splitlines()[-1]) for output in outputs]
+
+    shard_ids = queue.shard_ids()
+    assert len(shard_ids) == STATEMENTS // SHARD_SIZE
+    assert queue.is_complete()
+    assert sum(count["completed"] for count in counts) == len(shard_ids)
+    assert sum(count["duplicate"] + count["lost"] for count in counts) == 0
+
+    manifests = list(collect_results(queue))
+    assert [manifest["shard_id"] for manifest in manifests] == shard_ids
+    indexes = [entry["index"] for manifest in manifests for entry in manifest["files"]]
+    assert sorted(indexes) == list(range(STATEMENTS))
+    for manifest in manifests:
+        assert manifest["failed"] == 0
+        assert sorted(os.listdir(queue.result_path(manifest["shard_id"]))) == sorted(
+            ["manifest.json"] + [entry["file"] for entry in manifest["files"]])
+
+    assert leftover_files(queue_dir, ".lease") == []
+    assert leftover_files(queue_dir, ".partial") == []
+    assert leftover_files(queue_dir, ".detached") == []
+
+
+def test_failed_statement_leaves_no_partial_file(tmp_path, monkeypatch):
+    def failing_render(statement, sink):
+        sink.write(b"%PDF-1.4 half a document")
+        raise RuntimeError("renderer crashed")
+
+    monkeypatch.setattr(work_queue, "render_statement", failing_render)
+    shard = {
+        "shard_id": "shard-000001",
+        "first_index": 0,
+        "statements": [{
+            "customer": {
+                "customer_id": "CUST001",
+                "name": "Jordan Example",
+                "address": "1 Main Street, Springfield, IL 62701",
+                "phone": "555-0100",
+                "email": "jordan@example.com",
+            },
+            "loans": [],
+            "billing_period_start": "2024-01-01",
+            "billing_period_end": "2024-01-31",
+            "statement_format": "pdf",
+        }],
+    }
+
+    manifest = work_queue.render_shard(shard, str(tmp_path))
+    assert manifest["failed"] == 1
+    assert manifest["errors"][0]["error"] == "RuntimeError: renderer crashed"
+    assert sorted(os.listdir(tmp_path)) == ["manifest.json"]
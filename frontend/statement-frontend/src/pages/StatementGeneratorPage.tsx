@@ -1,10 +1,13 @@
-import { useState } from "react";
+import { useEffect, useState } from "react";
 import CustomerList from "../components/CustomerList";
 import BillingPeriodForm from "../components/BillingPeriodForm";
 import LoanList from "../components/LoanList";
 import FormatSelector from "../components/FormatSelector";
 import type { Customer, Loan } from "../types/statement";
-import { generateStatement } from "../services/api"; // This is now the smart function
+import { generateStatement, previewStatement } from "../services/api"; // This is now the smart function
+
+// Wait this long after the last keystroke before refreshing the preview
+const PREVIEW_DEBOUNCE_MS = 400;
 
 export default function StatementGeneratorPage() {
   const [billingStart, setBillingStart] = useState("");
@@ -30,6 +33,30 @@ export default function StatementGeneratorPage() {
     monthly_payment: "" 
   }]);
 
+  const [previewHtml, setPreviewHtml] = useState("");
+  const [previewError, setPreviewError] = useState("");
+
+  // Debounced live preview - avoids generating throwaway PDFs while editing
+  useEffect(() => {
+    const controller = new AbortController();
+    const timer = setTimeout(async () => {
+      try {
+        const html = await previewStatement(customers, loans, billingStart, billingEnd, controller.signal);
+        setPreviewHtml(html);
+        setPreviewError("");
+      } catch (error) {
+        if (controller.signal.aborted) return;
+        // Incomplete forms fail validation; keep the last good preview
+        setPreviewError(error instanceof Error ? error.message : "Preview unavailable");
+      }
+    }, PREVIEW_DEBOUNCE_MS);
+
+    return () => {
+      clearTimeout(timer);
+      controller.abort();
+    };
+  }, [customers, loans, billingStart, billingEnd]);
+
   const handleSubmit = async (e: React.FormEvent) => {
     e.preventDefault();
 
@@ -188,6 +215,33 @@ export default function StatementGeneratorPage() {
           </div>
         </div>
       </form>
+
+      <div style={{
+        backgroundColor: "white",
+        padding: "1.5rem",
+        borderRadius: "8px",
+        marginTop: "1.5rem",
+        boxShadow: "0 2px 4px rgba(0,0,0,0.05)"
+      }}>
+        <h2 style={{ color: "#2c3e50", marginTop: 0 }}>Preview</h2>
+        {previewHtml ? (
+          <iframe
+            title="Statement preview"
+            srcDoc={previewHtml}
+            sandbox=""
+            style={{ width: "100%", height: "900px", border: "1px solid #dee2e6", borderRadius: "4px" }}
+          />
+        ) : (
+          <div style={{ color: "#7f8c8d", fontSize: "0.9rem" }}>
+            Fill in the form to see a preview of the statement.
+          </div>
+        )}
+        {previewError && previewHtml && (
+          <div style={{ marginTop: "0.5rem", color: "#7f8c8d", fontSize: "0.8rem" }}>
+            Preview not updated: complete the required fields.
+          </div>
+        )}
+      </div>
     </div>
   );
 }
\ No newline at end of file
@@ -5,6 +5,7 @@ import type {
   Customer,
   Loan
 } from "../types/statement";
+import { createStatementRequest } from "../types/statement";
 
 // Single customer endpoint
 export async function generateSingleStatement(
@@ -69,4 +70,28 @@ export async function generateStatement(
     };
     return generateMultiCustomerStatement(payload);
   }
-}
\ No newline at end of file
+}
+
+// Preview endpoint - cheap HTML/SVG rendering of the PDF layout
+export async function previewStatement(
+  customers: Customer[],
+  loans: Loan[],
+  billingStart: string,
+  billingEnd: string,
+  signal?: AbortSignal
+): Promise<string> {
+  const payload = createStatementRequest(customers, loans, billingStart, billingEnd, "pdf");
+  const response = await fetch("http://localhost:8000/api/statements/preview", {
+    method: "POST",
+    headers: { "Content-Type": "application/json" },
+    body: JSON.stringify(payload),
+    signal
+  });
+
+  if (!response.ok) {
+    const errorText = await response.text();
+    throw new Error(`Preview error: ${response.status} ${errorText}`);
+  }
+
+  return await response.text();
+}
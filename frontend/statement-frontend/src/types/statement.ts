@@ -26,6 +26,8 @@ export interface SingleCustomerStatementRequest {
   billing_period_start: string;
   billing_period_end: string;
   statement_format: "pdf" | "xlsx" | "txt";
+  statement_date?: string;     // Optional fixed statement date (defaults to today)
+  deterministic?: boolean;     // Byte-reproducible output
 }
 
 // ✅ MULTI-CUSTOMER REQUEST (for /generate-statement endpoint)  
@@ -35,6 +37,8 @@ export interface MultiCustomerStatementRequest {
   billing_period_start: string;
   billing_period_end: string;
   statement_format: "pdf" | "xlsx" | "txt";
+  statement_date?: string;     // Optional fixed statement date (defaults to today)
+  deterministic?: boolean;     // Byte-reproducible output
 }
 
 // Type guard to check if request is single customer